@@ -0,0 +1,120 @@
+"""Benchmark plan-run archive write/read throughput (records per second)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+SAMPLE_LOG = PROJECT_ROOT / "samples" / "plan_run_record.jsonl"
+OUTPUT_FILENAME = "bench_archive_output.json"
+
+
+def _legacy_write(path: Path, records: List[Any]) -> None:
+    # Mirrors the original `_store_plan`: dict dump + json.dumps, one open per record.
+    for record in records:
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(record.model_dump(mode="json"), ensure_ascii=False) + "\n")
+
+
+def _legacy_read(path: Path) -> int:
+    from src.models.persistence import PlanRunRecord
+
+    count = 0
+    with path.open("r", encoding="utf-8") as handle:
+        for raw_line in handle:
+            payload = raw_line.strip()
+            if payload:
+                PlanRunRecord.model_validate_json(payload)
+                count += 1
+    return count
+
+
+def _timed(func: Callable[[], Any]) -> float:
+    started_at = time.perf_counter()
+    func()
+    return time.perf_counter() - started_at
+
+
+def run_benchmark(*, count: int, output_dir: Path) -> Dict[str, Any]:
+    from src.models.archive import ArchiveWriter, iter_records
+    from src.models.persistence import PlanRunRecord
+
+    record = PlanRunRecord.model_validate_json(SAMPLE_LOG.read_text(encoding="utf-8").strip())
+    # Vary a field per record so compression ratios are not flattered by exact repeats.
+    records = [
+        record.model_copy(update={"question": f"{record.question} #{idx}", "context": f"run {idx * 7919}"})
+        for idx in range(count)
+    ]
+    variants: Dict[str, Dict[str, Any]] = {}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        legacy_path = Path(tmpdir) / "legacy.jsonl"
+        write_seconds = _timed(lambda: _legacy_write(legacy_path, records))
+        read_seconds = _timed(lambda: _legacy_read(legacy_path))
+        variants["legacy"] = _stats(count, write_seconds, read_seconds, legacy_path)
+
+        for label, name in (("buffered_jsonl", "plans.jsonl"), ("buffered_zstd", "plans.jsonl.zst")):
+            path = Path(tmpdir) / name
+
+            def write() -> None:
+                with ArchiveWriter(path, buffer_records=256, max_bytes=None) as writer:
+                    for item in records:
+                        writer.write(item)
+
+            try:
+                write_seconds = _timed(write)
+            except RuntimeError as exc:  # zstandard not installed
+                variants[label] = {"skipped": str(exc)}
+                continue
+            read_seconds = _timed(lambda: sum(1 for _ in iter_records(path)))
+            variants[label] = _stats(count, write_seconds, read_seconds, path)
+
+    payload = {"python": sys.version.split()[0], "records": count, "variants": variants}
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = output_dir / OUTPUT_FILENAME
+    output_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return {"results": payload, "output_path": output_path}
+
+
+def _stats(count: int, write_seconds: float, read_seconds: float, path: Path) -> Dict[str, Any]:
+    return {
+        "write_records_per_second": int(count / write_seconds),
+        "read_records_per_second": int(count / read_seconds),
+        "bytes_per_record": round(path.stat().st_size / count, 1),
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20_000, help="Records to write and read back")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=PROJECT_ROOT / "output",
+        help="Directory to store the benchmark JSON.",
+    )
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(count=max(1, args.records), output_dir=args.output_dir)
+    for label, stats in result["results"]["variants"].items():
+        if "skipped" in stats:
+            print(f"{label:<16} skipped: {stats['skipped']}")
+            continue
+        print(
+            f"{label:<16} write {stats['write_records_per_second']:>9,}/s   "
+            f"read {stats['read_records_per_second']:>9,}/s   {stats['bytes_per_record']:8.1f} B/record"
+        )
+    print(f"Saved details to {result['output_path']}")
+
+
+if __name__ == "__main__":
+    main()
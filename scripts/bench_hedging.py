@@ -0,0 +1,133 @@
+"""Benchmark p50/p99 latency of a simulated upstream with and without hedging."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+OUTPUT_FILENAME = "bench_hedging_output.json"
+
+
+class SimulatedUpstream:
+    """Mostly fast endpoint with an independent slow tail per attempt."""
+
+    def __init__(self, *, seed: int, tail_ratio: float, fast_ms: tuple, slow_ms: tuple) -> None:
+        self._random = random.Random(seed)
+        self.tail_ratio = tail_ratio
+        self.fast_ms = fast_ms
+        self.slow_ms = slow_ms
+        self.attempts = 0
+
+    async def __call__(self) -> str:
+        self.attempts += 1
+        bounds = self.slow_ms if self._random.random() < self.tail_ratio else self.fast_ms
+        await asyncio.sleep(self._random.uniform(*bounds) / 1000)
+        return "ok"
+
+
+async def _measure(
+    count: int, concurrency: int, call: Callable[[], Awaitable[Any]]
+) -> List[float]:
+    latencies: List[float] = []
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with gate:
+            started_at = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started_at)
+
+    await asyncio.gather(*(one() for _ in range(count)))
+    return latencies
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _summary(latencies: List[float], attempts: int) -> Dict[str, Any]:
+    return {
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 1),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 1),
+        "max_ms": round(max(latencies) * 1000, 1),
+        "extra_call_ratio": round(attempts / len(latencies) - 1, 3),
+    }
+
+
+async def _run(count: int, concurrency: int, seed: int, tail_ratio: float) -> Dict[str, Any]:
+    from src.tools.hedging import Hedger
+
+    profile = {"tail_ratio": tail_ratio, "fast_ms": (10, 30), "slow_ms": (200, 400)}
+
+    baseline = SimulatedUpstream(seed=seed, **profile)
+    baseline_latencies = await _measure(count, concurrency, baseline)
+
+    hedged_upstream = SimulatedUpstream(seed=seed, **profile)
+    hedger = Hedger("bench", percentile=0.95, max_extra_ratio=0.1, initial_delay=0.05)
+    hedged_latencies = await _measure(count, concurrency, lambda: hedger.run(hedged_upstream))
+
+    return {
+        "baseline": _summary(baseline_latencies, baseline.attempts),
+        "hedged": {**_summary(hedged_latencies, hedged_upstream.attempts), **hedger.stats()},
+    }
+
+
+def run_benchmark(
+    *, count: int, concurrency: int, seed: int, tail_ratio: float, output_dir: Path
+) -> Dict[str, Any]:
+    variants = asyncio.run(_run(count, concurrency, seed, tail_ratio))
+    payload = {
+        "python": sys.version.split()[0],
+        "requests": count,
+        "concurrency": concurrency,
+        "tail_ratio": tail_ratio,
+        "variants": variants,
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = output_dir / OUTPUT_FILENAME
+    output_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return {"results": payload, "output_path": output_path}
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000, help="Simulated upstream calls per variant")
+    parser.add_argument("--concurrency", type=int, default=50, help="Calls in flight at once")
+    parser.add_argument("--tail-ratio", type=float, default=0.03, help="Share of slow attempts")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the latency model")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=PROJECT_ROOT / "output",
+        help="Directory to store the benchmark JSON.",
+    )
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(
+        count=max(1, args.requests),
+        concurrency=max(1, args.concurrency),
+        seed=args.seed,
+        tail_ratio=args.tail_ratio,
+        output_dir=args.output_dir,
+    )
+    for label, stats in result["results"]["variants"].items():
+        print(
+            f"{label:<9} p50 {stats['p50_ms']:>7.1f} ms   p99 {stats['p99_ms']:>7.1f} ms   "
+            f"extra calls {stats['extra_call_ratio']:.1%}"
+        )
+    print(f"Saved details to {result['output_path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Benchmark reporter note validation on large synthetic note archives."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+OUTPUT_FILENAME = "bench_note_validation_output.json"
+
+
+def build_payloads(count: int, *, invalid_every: int = 1000) -> List[Dict[str, Any]]:
+    """Synthetic note dicts; every `invalid_every`-th entry has an empty source."""
+
+    return [
+        {
+            "source": "" if invalid_every and idx % invalid_every == 0 else f"https://example.com/doc/{idx % 500}",
+            "claim": f"Claim number {idx}",
+            "evidence": "Supporting excerpt " * 4,
+            "confidence": (idx % 100) / 100,
+            "todo": None,
+        }
+        for idx in range(count)
+    ]
+
+
+def per_item_validate(payloads: List[Dict[str, Any]], threshold: float) -> int:
+    """Reference implementation: construct, then re-scan, one note at a time."""
+
+    from pydantic import ValidationError
+
+    from src.models.plan import ResearchNote
+
+    notes = []
+    for payload in payloads:
+        try:
+            notes.append(ResearchNote(**payload))
+        except ValidationError:
+            notes.append(ResearchNote.model_construct(**payload))
+    flagged = 0
+    for note in notes:
+        if not (note.source.strip() if note.source else ""):
+            flagged += 1
+        if not (note.claim.strip() if note.claim else ""):
+            flagged += 1
+        if note.confidence is not None and note.confidence < threshold:
+            flagged += 1
+    return flagged
+
+
+def batch_validate(payloads: List[Dict[str, Any]], threshold: float) -> int:
+    from src.report.validation import validate_note_batch
+
+    report = validate_note_batch(payloads, low_confidence_threshold=threshold)
+    return len(report.missing_source) + len(report.missing_claim) + len(report.low_confidence)
+
+
+def run_benchmark(*, count: int, runs: int, output_dir: Path) -> Dict[str, Any]:
+    payloads = build_payloads(count)
+    results: Dict[str, Any] = {}
+    for label, func in (("per_item", per_item_validate), ("batch", batch_validate)):
+        timings: List[float] = []
+        flagged = 0
+        for _ in range(runs):
+            started_at = time.perf_counter()
+            flagged = func(payloads, 0.6)
+            timings.append(time.perf_counter() - started_at)
+        results[label] = {
+            "seconds_median": round(statistics.median(timings), 4),
+            "notes_per_second": int(count / statistics.median(timings)),
+            "flagged": flagged,
+        }
+
+    payload = {
+        "python": sys.version.split()[0],
+        "notes": count,
+        "runs": runs,
+        "results": results,
+        "speedup": round(results["per_item"]["seconds_median"] / results["batch"]["seconds_median"], 2),
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = output_dir / OUTPUT_FILENAME
+    output_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return {"results": payload, "output_path": output_path}
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=100_000, help="Synthetic notes per run")
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions per strategy (median reported)")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=PROJECT_ROOT / "output",
+        help="Directory to store the benchmark JSON.",
+    )
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(count=max(1, args.notes), runs=max(1, args.runs), output_dir=args.output_dir)
+    summary = result["results"]
+    for label, stats in summary["results"].items():
+        print(
+            f"{label:<10} {stats['seconds_median'] * 1000:9.1f} ms   "
+            f"{stats['notes_per_second']:>10,} notes/s   flagged {stats['flagged']}"
+        )
+    print(f"Speedup: {summary['speedup']}x. Saved details to {result['output_path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Measure cold-start cost of the CLI entry points with `python -X importtime`."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+OUTPUT_FILENAME = "bench_startup_output.json"
+
+# Trivial subcommands that should never pay for the full agent stack.
+DEFAULT_COMMANDS: Dict[str, List[str]] = {
+    "run_cli --show-review-help": ["scripts/run_cli.py", "--show-review-help"],
+    "run_cli --help": ["scripts/run_cli.py", "--help"],
+    "replay_review_log --help": ["scripts/replay_review_log.py", "--help"],
+    "validate_review_log --help": ["scripts/validate_review_log.py", "--help"],
+}
+
+
+def measure_command(argv: Sequence[str], *, runs: int) -> Dict[str, Any]:
+    """Run `argv` under `-X importtime` and report wall time plus import cost."""
+
+    wall_times: List[float] = []
+    import_totals: List[int] = []
+    top_imports: List[tuple[str, int]] = []
+    returncode = 0
+
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", *argv],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        wall_times.append(time.perf_counter() - started_at)
+        returncode = returncode or completed.returncode
+        entries = _parse_importtime(completed.stderr)
+        # Top-level imports (no indentation) sum to the total import cost.
+        import_totals.append(sum(cumulative for name, cumulative, depth in entries if depth == 0))
+        top_imports = sorted(
+            ((name, cumulative) for name, cumulative, depth in entries if depth == 0),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:5]
+
+    return {
+        "argv": list(argv),
+        "runs": runs,
+        "returncode": returncode,
+        "wall_seconds_median": round(statistics.median(wall_times), 4),
+        "import_us_median": int(statistics.median(import_totals)),
+        "slowest_top_level_imports_us": dict(top_imports),
+    }
+
+
+def run_benchmark(*, runs: int, output_dir: Path) -> Dict[str, Any]:
+    results = {label: measure_command(argv, runs=runs) for label, argv in DEFAULT_COMMANDS.items()}
+    payload = {"python": sys.version.split()[0], "commands": results}
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = output_dir / OUTPUT_FILENAME
+    output_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return {"results": payload, "output_path": output_path}
+
+
+def _parse_importtime(stderr: str) -> List[tuple[str, int, int]]:
+    # Line format: "import time: <self us> | <cumulative us> | <two-space indent per level><module>"
+    entries: List[tuple[str, int, int]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:") :].split("|", 2)
+        if len(fields) != 3:
+            continue
+        _, cumulative_us, raw_name = fields
+        name = raw_name[1:]
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        entries.append((name.strip(), int(cumulative_us), depth))
+    return entries
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="Repetitions per command (median reported)")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=PROJECT_ROOT / "output",
+        help="Directory to store the benchmark JSON.",
+    )
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(runs=max(1, args.runs), output_dir=args.output_dir)
+    for label, stats in result["results"]["commands"].items():
+        status = "" if stats["returncode"] == 0 else f"   (exit {stats['returncode']})"
+        print(
+            f"{label:<32} wall {stats['wall_seconds_median'] * 1000:8.1f} ms   "
+            f"imports {stats['import_us_median'] / 1000:8.1f} ms{status}"
+        )
+    print(f"Saved details to {result['output_path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Build or refresh the local BM25 index from persisted planner runs."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.tools.local_index import LocalIndex
+
+DEFAULT_LOG_PATH = PROJECT_ROOT / "output" / "plans" / "plans.jsonl"
+DEFAULT_INDEX_PATH = PROJECT_ROOT / "output" / "index" / "notes.sqlite"
+
+
+def build_index(log_paths: List[Path], *, index_path: Path) -> dict:
+    """Ingest every note from `log_paths` into the index at `index_path`."""
+
+    with LocalIndex(index_path) as index:
+        added = sum(index.add_plan_records(path) for path in log_paths)
+        total = len(index)
+    return {"index_path": index_path, "added": added, "total": total}
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--log-path",
+        type=Path,
+        action="append",
+        help="Planner run JSONL archive to ingest (repeatable; default: output/plans/plans.jsonl)",
+    )
+    parser.add_argument(
+        "--index-path",
+        type=Path,
+        default=DEFAULT_INDEX_PATH,
+        help="SQLite file holding the index (default: output/index/notes.sqlite)",
+    )
+    return parser
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    result = build_index(args.log_path or [DEFAULT_LOG_PATH], index_path=args.index_path)
+    print(
+        f"Indexed {result['added']} new notes; "
+        f"{result['total']} documents in {result['index_path']}."
+    )
+
+
+if __name__ == "__main__":
+    main()
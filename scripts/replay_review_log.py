@@ -4,14 +4,17 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List
 
-from pydantic import ValidationError
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.models.persistence import PlanRunRecord
+if TYPE_CHECKING:
+    from src.models.persistence import PlanRunRecord
 
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_LOG_PATH = PROJECT_ROOT / "output" / "plans" / "plans.jsonl"
 OUTPUT_FILENAME = "replay_review_log_output.json"
 
@@ -24,6 +27,10 @@ def replay_log(
 ) -> Dict[str, Any]:
     """Load planner run records and emit a concise summary for inspection."""
 
+    from pydantic import ValidationError
+
+    from src.models.archive import archive_segments, iter_archive, loads_record
+
     records: List[PlanRunRecord] = []
     summary: Dict[str, Any] = {
         "log_path": str(log_path),
@@ -33,23 +40,20 @@ def replay_log(
         "validation_errors": [],
     }
 
-    if not log_path.exists():
+    if not archive_segments(log_path):
         summary["missing_file"] = True
     else:
-        with log_path.open("r", encoding="utf-8") as handle:
-            for line_number, raw_line in enumerate(handle, start=1):
-                payload = raw_line.strip()
-                if not payload:
-                    continue
-                try:
-                    records.append(PlanRunRecord.model_validate_json(payload))
-                except (ValidationError, ValueError) as exc:
-                    summary["validation_errors"].append(
-                        {
-                            "line": line_number,
-                            "error": str(exc).splitlines()[0],
-                        }
-                    )
+        for segment, line_number, payload in iter_archive(log_path):
+            try:
+                records.append(loads_record(payload))
+            except (ValidationError, ValueError) as exc:
+                summary["validation_errors"].append(
+                    {
+                        "segment": segment.name,
+                        "line": line_number,
+                        "error": str(exc).splitlines()[0],
+                    }
+                )
 
     summary["records_available"] = len(records)
 
@@ -97,9 +101,11 @@ def replay_log(
                     {
                         "step_id": call.step_id,
                         "query": call.query,
+                        "query_count": call.query_count,
                         "note_count": call.note_count,
                         "duration_seconds": call.duration_seconds,
                         "result_count": call.result_count,
+                        "local_hits": call.local_hits,
                         "applied_max_results": call.applied_max_results,
                         "applied_max_notes": call.applied_max_notes,
                         "degradation_mode": call.degradation_mode,
@@ -3,35 +3,47 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from pydantic import ValidationError
-
-from src.agents.planner import PlannerAgent
-from src.agents.researcher import ResearcherAgent
-from src.config.configuration import load_config
-from src.graph.builder import build_graph, initial_state
-from src.models.plan import Plan
-from src.models.persistence import (
-    PlanRunRecord,
-    ResearcherCallLog,
-    ResearcherMetrics,
-    ReviewAction,
-    ReviewLogEntry,
-    RunTelemetry,
-)
+# Heavy modules (langgraph, pydantic models, httpx, agents) are imported lazily
+# so trivial subcommands such as --show-review-help start instantly; see
+# scripts/bench_startup.py for the measured cold-start cost.
+if TYPE_CHECKING:
+    from src.config.configuration import AppConfig, ConfigProvider
+    from src.models.plan import Plan
+    from src.models.persistence import (
+        ResearcherMetrics,
+        ReviewAction,
+        ReviewLogEntry,
+        RunTelemetry,
+    )
 
 PLANS_DIR = PROJECT_ROOT / "output" / "plans"
 
 
+def load_config_provider(**kwargs: Any) -> ConfigProvider:
+    """Build a hot-reloading config provider (imports the config module on first use)."""
+
+    from src.config.configuration import ConfigProvider as _ConfigProvider
+
+    return _ConfigProvider(**kwargs)
+
+
+def build_graph(configuration: AppConfig, **kwargs: Any) -> Any:
+    """Compile the research graph (imports langgraph and the agents on first use)."""
+
+    from src.graph.builder import build_graph as _build_graph
+
+    return _build_graph(configuration, **kwargs)
+
+
 def main(argv: List[str] | None = None) -> None:
     parser = _build_parser()
     args = parser.parse_args(argv)
@@ -46,7 +58,19 @@ def main(argv: List[str] | None = None) -> None:
     if not question:
         raise SystemExit("Question is required")
 
-    config = load_config()
+    from src.agents.planner import PlannerAgent
+    from src.agents.researcher import ResearcherAgent
+    from src.config.configuration import parse_overrides
+    from src.graph.builder import initial_state
+    from src.models.plan import Plan
+    from src.models.persistence import ReviewAction, ReviewLogEntry
+
+    try:
+        overrides = parse_overrides(args.set or [])
+        provider = load_config_provider(overrides=overrides)
+    except ValueError as exc:
+        parser.error(str(exc))
+    config = provider.current
     locale = args.locale or config.runtime.locale
     context = args.context or ""
 
@@ -86,19 +110,28 @@ def main(argv: List[str] | None = None) -> None:
 
         return action_enum.value, feedback
 
-    graph = build_graph(
-        config,
-        planner_agent=planner_agent,
-        review_handler=review_handler,  # type: ignore[arg-type]
-        researcher_agent=researcher_agent,
-    )
+    try:
+        graph = build_graph(
+            config,
+            planner_agent=planner_agent,
+            review_handler=review_handler,  # type: ignore[arg-type]
+            researcher_agent=researcher_agent,
+            config_provider=provider,
+        )
+    except ValueError as exc:  # e.g. an unknown runtime.report_formats entry
+        parser.error(str(exc))
 
     initial = initial_state(
         question,
         locale=locale,
         metadata={"context": current_context["value"]},
     )
-    result = graph.invoke(initial.model_dump())
+    # Interactive reviews can take a while; settings edits apply to the next node.
+    provider.start_watching()
+    try:
+        result = graph.invoke(initial.model_dump())
+    finally:
+        provider.stop_watching()
     final_state = Plan.model_validate(result["plan"]) if result.get("plan") else None
     metadata = result.get("metadata", {})
     last_action = metadata.get("last_review_action", "ACCEPT_PLAN")
@@ -108,6 +141,11 @@ def main(argv: List[str] | None = None) -> None:
         return
 
     _emit_summary(final_state, locale)
+    report_paths = metadata.get("report_paths") or (
+        {"markdown": metadata["report_path"]} if metadata.get("report_path") else {}
+    )
+    for fmt, path in report_paths.items():
+        print(f"Report ({fmt}) written to {path}")
     if not args.no_store:
         _store_plan(
             question=question,
@@ -132,6 +170,12 @@ def _build_parser() -> argparse.ArgumentParser:
         default=3,
         help="Maximum planner retries when requesting changes",
     )
+    parser.add_argument(
+        "--set",
+        action="append",
+        metavar="SECTION.FIELD=VALUE",
+        help="Override a config field for this run, e.g. --set search.max_queries=5 (repeatable)",
+    )
     parser.add_argument(
         "--show-review-help",
         action="store_true",
@@ -157,6 +201,8 @@ def _display_plan(plan: Plan) -> None:
 
 
 def _prompt_review_action() -> Tuple[ReviewAction, str]:
+    from src.models.persistence import ReviewAction
+
     prompt = "Select action [ACCEPT_PLAN | REQUEST_CHANGES | ABORT]: "
     lookup = {choice.value: choice for choice in ReviewAction}
     action_text = input(prompt).strip().upper()
@@ -201,7 +247,9 @@ def _store_plan(
     review_log: List[ReviewLogEntry],
     telemetry: RunTelemetry | None = None,
 ) -> None:
-    PLANS_DIR.mkdir(parents=True, exist_ok=True)
+    from src.models.archive import append_record
+    from src.models.persistence import PlanRunRecord
+
     record = PlanRunRecord(
         timestamp=datetime.utcnow(),
         question=question,
@@ -211,25 +259,32 @@ def _store_plan(
         review_log=review_log,
         telemetry=telemetry,
     )
-    path = PLANS_DIR / "plans.jsonl"
-    with path.open("a", encoding="utf-8") as handle:
-        payload = json.dumps(record.model_dump(mode="json"), ensure_ascii=False)
-        handle.write(payload + "\n")
+    append_record(PLANS_DIR / "plans.jsonl", record)
 
 
-def _extract_telemetry(metadata: Dict[str, Any]) -> RunTelemetry | None:
-    metrics_payload = metadata.get("researcher_metrics")
-    if not metrics_payload:
-        return None
+def _extract_telemetry(metadata: Dict[str, Any]) -> RunTelemetry:
+    from pydantic import ValidationError
 
-    try:
-        researcher_metrics = ResearcherMetrics.model_validate(metrics_payload)
-    except ValidationError:
-        researcher_metrics = _coerce_metrics(metrics_payload)
-    return RunTelemetry(researcher=researcher_metrics)
+    from src.models.persistence import ResearcherMetrics, RunTelemetry
+
+    # Planner telemetry is kept even when the run never reached the researcher.
+    metrics_payload = metadata.get("researcher_metrics")
+    researcher_metrics = None
+    if metrics_payload:
+        try:
+            researcher_metrics = ResearcherMetrics.model_validate(metrics_payload)
+        except ValidationError:
+            researcher_metrics = _coerce_metrics(metrics_payload)
+    return RunTelemetry(
+        researcher=researcher_metrics,
+        planner_coalesced_calls=_safe_int(metadata.get("planner_coalesced_calls")),
+        planner_prompt_ids=[str(item) for item in metadata.get("planner_prompts") or []],
+    )
 
 
 def _coerce_metrics(payload: Dict[str, Any]) -> ResearcherMetrics:
+    from src.models.persistence import ResearcherCallLog, ResearcherMetrics
+
     calls_payload = payload.get("calls", []) or []
     coerced_calls: List[ResearcherCallLog] = []
     for call in calls_payload:
@@ -259,9 +314,12 @@ def _coerce_metrics(payload: Dict[str, Any]) -> ResearcherMetrics:
             ResearcherCallLog(
                 step_id=step_id,
                 query=query,
+                query_count=_safe_int(call.get("query_count")),
                 note_count=note_count,
                 duration_seconds=duration,
                 result_count=result_count,
+                local_hits=_safe_int(call.get("local_hits")),
+                coalesced_queries=_safe_int(call.get("coalesced_queries")),
                 applied_max_results=_safe_int(applied_max_results),
                 applied_max_notes=_safe_int(applied_max_notes),
                 degradation_mode=str(degradation_mode).strip() if degradation_mode else None,
@@ -292,6 +350,7 @@ def _coerce_metrics(payload: Dict[str, Any]) -> ResearcherMetrics:
         total_notes=total_notes,
         total_duration_seconds=total_duration,
         total_results=total_results,
+        total_coalesced=_safe_int(payload.get("total_coalesced")),
         degradation_modes=normalized_modes,
         calls=coerced_calls,
     )
@@ -0,0 +1,180 @@
+"""Queue research questions and drain them with a multi-process worker pool."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+DEFAULT_QUEUE_PATH = PROJECT_ROOT / "output" / "jobs" / "queue.sqlite"
+RESEARCH_JOB = "research"
+ARCHIVE_BATCH_RECORDS = 16
+
+
+def research_handler_factory() -> Callable[[Any], Dict[str, Any]]:
+    """Build one auto-accepting research graph per worker process."""
+
+    from datetime import datetime
+
+    from scripts.run_cli import _extract_telemetry
+    from src.agents.planner import PlannerAgent
+    from src.agents.researcher import ResearcherAgent
+    from src.config.configuration import get_config_provider
+    from src.graph.builder import build_graph, initial_state
+    from src.models.archive import ArchiveWriter
+    from src.models.persistence import PlanRunRecord, ReviewAction, ReviewLogEntry
+    from src.models.plan import Plan
+
+    # One provider per worker process: nodes read its cached snapshot, and the
+    # watcher applies settings/secret edits to the next job without a restart.
+    provider = get_config_provider()
+    provider.start_watching()
+    config = provider.current
+    graph = build_graph(
+        config,
+        planner_agent=PlannerAgent(config),
+        researcher_agent=ResearcherAgent(config),
+        review_handler=lambda state: ("ACCEPT_PLAN", ""),
+        config_provider=provider,
+    )
+    # One locked append + fsync per batch instead of per job; the supervisor
+    # calls flush() when the queue runs dry and close() when the worker exits.
+    archive = ArchiveWriter(
+        PROJECT_ROOT / "output" / "plans" / "plans.jsonl", buffer_records=ARCHIVE_BATCH_RECORDS
+    )
+
+    def handle(job: Any) -> Dict[str, Any]:
+        payload = job.payload
+        locale = payload.get("locale") or provider.current.runtime.locale
+        context = payload.get("context") or ""
+        state = initial_state(payload["question"], locale=locale, metadata={"context": context})
+        result = graph.invoke(state.model_dump())
+        metadata = result.get("metadata", {})
+        if not result.get("plan"):
+            return {"status": "no_plan"}
+
+        plan = Plan.model_validate(result["plan"])
+        archive.write(
+            PlanRunRecord(
+                timestamp=datetime.utcnow(),
+                question=payload["question"],
+                locale=locale,
+                context=context,
+                plan=plan,
+                review_log=[ReviewLogEntry(attempt=1, action=ReviewAction.ACCEPT_PLAN)],
+                telemetry=_extract_telemetry(metadata),
+            ),
+        )
+        return {
+            "status": "completed",
+            "steps": len(plan.steps),
+            "report_paths": metadata.get("report_paths"),
+        }
+
+    handle.flush = archive.flush  # type: ignore[attr-defined]
+    handle.close = archive.close  # type: ignore[attr-defined]
+    return handle
+
+
+def _project_path(value: str) -> Path:
+    # Same resolution as relative sqlite:// broker URLs, independent of the cwd.
+    path = Path(value)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--queue-path",
+        type=_project_path,
+        default=DEFAULT_QUEUE_PATH,
+        help="SQLite job queue (default: output/jobs/queue.sqlite)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="Add research questions to the queue")
+    enqueue.add_argument("--question", "-q", action="append", default=[], help="Question (repeatable)")
+    enqueue.add_argument("--questions-file", type=Path, help="File with one question per line")
+    enqueue.add_argument("--locale", help="Locale for every queued question")
+    enqueue.add_argument("--max-attempts", type=int, default=3, help="Retries before a job is failed")
+
+    run = commands.add_parser("run", help="Start worker processes and drain the queue")
+    run.add_argument("--processes", type=int, default=None, help="Worker processes (default: CPU count)")
+    run.add_argument("--lease-seconds", type=float, default=300.0, help="Lease duration before recovery")
+    run.add_argument("--forever", action="store_true", help="Keep polling after the queue drains")
+    run.add_argument(
+        "--max-restarts",
+        type=int,
+        default=5,
+        help="Consecutive crash restarts per worker before giving up",
+    )
+    run.add_argument(
+        "--role",
+        choices=("research", "steps"),
+        default="research",
+        help="research: whole questions; steps: researcher steps shipped by a sqlite:// broker",
+    )
+
+    commands.add_parser("status", help="Print job counts per status")
+    return parser
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = _build_parser().parse_args(argv)
+
+    from src.jobs.queue import JobQueue
+
+    if args.command == "enqueue":
+        questions = [item.strip() for item in args.question if item.strip()]
+        if args.questions_file:
+            lines = args.questions_file.read_text(encoding="utf-8").splitlines()
+            questions.extend(line.strip() for line in lines if line.strip())
+        with JobQueue(args.queue_path) as queue:
+            ids = [
+                queue.enqueue(
+                    RESEARCH_JOB,
+                    {"question": question, "locale": args.locale},
+                    max_attempts=args.max_attempts,
+                )
+                for question in questions
+            ]
+        print(f"Queued {len(ids)} jobs in {args.queue_path}.")
+        return
+
+    if args.command == "status":
+        with JobQueue(args.queue_path) as queue:
+            counts = queue.stats()
+        print(", ".join(f"{status}: {count}" for status, count in counts.items()))
+        return
+
+    from src.jobs.broker import RESEARCH_STEP_JOB, research_step_handler_factory
+    from src.jobs.supervisor import WorkerCrashLoopError, WorkerOptions, WorkerSupervisor
+
+    if args.role == "steps":
+        handler_factory, kinds = research_step_handler_factory, (RESEARCH_STEP_JOB,)
+    else:
+        handler_factory, kinds = research_handler_factory, (RESEARCH_JOB,)
+    supervisor = WorkerSupervisor(
+        args.queue_path,
+        handler_factory,
+        processes=args.processes,
+        options=WorkerOptions(lease_seconds=args.lease_seconds, kinds=kinds),
+        max_restarts=args.max_restarts,
+    )
+    try:
+        counts = supervisor.run(until_empty=not args.forever)
+    except WorkerCrashLoopError as exc:
+        raise SystemExit(f"{exc}. Check the worker logs, settings and API keys.") from exc
+    print(
+        ", ".join(f"{status}: {count}" for status, count in counts.items())
+        + f" (worker restarts: {supervisor.restarts})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -12,65 +12,12 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.agents.plan_repair import parse_plan, repair_stats, reset_repair_stats
 from src.config.configuration import load_config
-from src.models.plan import Plan
 from src.tools.llm import LLMError, call_llm
+from src.tools.prompts import prompt_registry
 
 OUTPUT_FILENAME = "validate_planner_output.json"
-SYSTEM_PROMPT = """You are the Planner agent inside a systematic deep-research workflow. Produce a plan JSON payload that conforms exactly to the schema below.
-
-Output requirements:
-- Return raw JSON only (no markdown, commentary, or code fences).
-- Use double quotes for all keys/strings.
-- Preserve the property order shown in the schema.
-
-Schema:
-{
-  "topic": string,
-  "goal": string,
-  "assumptions": [string, ...],
-  "risks": [string, ...],
-  "steps": [
-    {
-      "id": "step-1" | "step-2" | ...,
-      "title": string,
-      "step_type": "RESEARCH" | "PROCESS" | "SYNTHESIZE" | "REVIEW",
-      "expected_outcome": string
-    }
-  ],
-  "metadata": {
-    "locale": string,
-    "budget_tokens": integer,
-    "budget_cost_usd": float,
-    "reviewer": string | null
-  }
-}
-
-Constraints:
-- Provide 3 to 6 steps; IDs must increment sequentially starting at "step-1".
-- `topic` and `goal` must restate the user's request in the specified locale.
-- `metadata.locale` must equal the user's locale input.
-- Choose reasonable budgets (tokens,cost) for the task difficulty.
-- Use null for reviewer when no reviewer is known.
-- Do not add any extra fields."""
-
-USER_PROMPT_TEMPLATE = """User Question: {topic}\nLocale: {locale}\nContext Hints: {context}"""
-
-
-def extract_json_block(text: str) -> str:
-    """Return the JSON segment from model output, handling fenced code blocks."""
-
-    text = text.strip()
-    if text.startswith("```"):
-        lines = text.splitlines()
-        # Drop the first fence line and optional language tag
-        if lines:
-            lines = lines[1:]
-        # Remove trailing fence if present
-        if lines and lines[-1].strip().startswith("```"):
-            lines = lines[:-1]
-        text = "\n".join(lines)
-    return text.strip()
 
 
 def load_questions(path: Path) -> List[Dict[str, Any]]:
@@ -90,19 +37,25 @@ def run_validation(questions_path: Path, *, output_dir: Path) -> Dict[str, Any]:
         )
 
     questions = load_questions(questions_path)
+    prompts = prompt_registry()
+    system_prompt = prompts.get("planner_system")
+    prompt_ids = [system_prompt.id, prompts.get("planner_user").id]
 
     results: Dict[str, Any] = {
         "total": len(questions),
         "success": 0,
         "failures": [],
         "plans": [],
+        "prompts": prompt_ids,
     }
+    reset_repair_stats()
 
     for entry in questions:
         topic = entry.get("topic", "").strip()
         locale = entry.get("locale", config.runtime.locale)
-        context = entry.get("context", "").strip() or "(none)"
-        prompt = USER_PROMPT_TEMPLATE.format(topic=topic, locale=locale, context=context)
+        context = entry.get("context", "").strip()
+        variables = {"topic": topic, "locale": locale} | ({"context": context} if context else {})
+        prompt = prompts.render("planner_user", **variables)
 
         try:
             llm_response = call_llm(
@@ -112,7 +65,8 @@ def run_validation(questions_path: Path, *, output_dir: Path) -> Dict[str, Any]:
                 temperature=config.models.temperature,
                 timeout=45.0,
                 extra={"topic": topic, "locale": locale},
-                system_prompt=SYSTEM_PROMPT,
+                system_prompt=system_prompt.source,
+                prompt_version=",".join(prompt_ids),
             )
         except LLMError as exc:
             results["failures"].append(
@@ -125,8 +79,7 @@ def run_validation(questions_path: Path, *, output_dir: Path) -> Dict[str, Any]:
             continue
 
         try:
-            json_payload = extract_json_block(llm_response)
-            plan = Plan.model_validate_json(json_payload)
+            parsed = parse_plan(llm_response, topic=topic, locale=locale)
         except Exception as exc:  # noqa: BLE001 - capture parsing/validation errors
             results["failures"].append(
                 {
@@ -143,15 +96,18 @@ def run_validation(questions_path: Path, *, output_dir: Path) -> Dict[str, Any]:
             {
                 "topic": topic,
                 "locale": locale,
-                "plan": plan.model_dump(),
+                "repairs": parsed.repairs,
+                "plan": parsed.plan.model_dump(),
             }
         )
+    results["repairs"] = repair_stats()
 
     output_dir.mkdir(parents=True, exist_ok=True)
     output_path = (output_dir / OUTPUT_FILENAME).resolve()
     output_path.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
 
-    return {"output_path": output_path, "summary": {k: results[k] for k in ("total", "success")}}
+    summary = {k: results[k] for k in ("total", "success", "repairs")}
+    return {"output_path": output_path, "summary": summary}
 
 
 def main(argv: List[str] | None = None) -> None:
@@ -179,7 +135,8 @@ def main(argv: List[str] | None = None) -> None:
         relative_path = output_path
 
     print(
-        f"Validation complete. {summary['success']} / {summary['total']} plans parsed successfully.\n"
+        f"Validation complete. {summary['success']} / {summary['total']} plans parsed successfully "
+        f"({summary['repairs'].get('repaired', 0)} after local repair).\n"
         f"Saved details to {relative_path}"
     )
 
@@ -4,20 +4,24 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
 from typing import Any, Dict, List
 
-from pydantic import ValidationError
-
-from src.models.persistence import PlanRunRecord
-
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
 DEFAULT_LOG_PATH = PROJECT_ROOT / "output" / "plans" / "plans.jsonl"
 OUTPUT_FILENAME = "validate_review_log_output.json"
 
 
 def run_validation(log_path: Path, *, output_dir: Path) -> Dict[str, Any]:
-    """Validate each JSONL entry and emit a summary report."""
+    """Validate each JSONL entry (across rotated segments) and emit a summary report."""
+
+    from pydantic import ValidationError
+
+    from src.models.archive import archive_segments, iter_archive, loads_record
 
     results: Dict[str, Any] = {
         "log_path": str(log_path),
@@ -27,26 +31,23 @@ def run_validation(log_path: Path, *, output_dir: Path) -> Dict[str, Any]:
         "missing_file": False,
     }
 
-    if not log_path.exists():
+    if not archive_segments(log_path):
         results["missing_file"] = True
     else:
-        with log_path.open("r", encoding="utf-8") as handle:
-            for line_number, raw_line in enumerate(handle, start=1):
-                payload = raw_line.strip()
-                if not payload:
-                    continue
-                results["total"] += 1
-                try:
-                    PlanRunRecord.model_validate_json(payload)
-                except (ValidationError, ValueError) as exc:  # ValueError for JSON decode
-                    results["invalid"].append(
-                        {
-                            "line": line_number,
-                            "error": _truncate_error_message(str(exc)),
-                        }
-                    )
-                else:
-                    results["valid"] += 1
+        for segment, line_number, payload in iter_archive(log_path):
+            results["total"] += 1
+            try:
+                loads_record(payload)
+            except (ValidationError, ValueError) as exc:  # ValueError for JSON decode
+                results["invalid"].append(
+                    {
+                        "segment": segment.name,
+                        "line": line_number,
+                        "error": _truncate_error_message(str(exc)),
+                    }
+                )
+            else:
+                results["valid"] += 1
 
     output_dir.mkdir(parents=True, exist_ok=True)
     output_path = output_dir / OUTPUT_FILENAME
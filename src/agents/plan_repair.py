@@ -0,0 +1,288 @@
+"""Local repair of malformed planner output before giving up on a response.
+
+Planner models regularly wrap the JSON in code fences, add prose around it,
+leave trailing commas, or omit optional fields. `parse_plan` first tries a
+strict `Plan.model_validate_json`; only when that fails does it run the
+repair pipeline:
+
+1. ``fence_stripped``: drop surrounding ```json fences;
+2. ``json_extracted``: cut the first balanced ``{...}`` object out of prose;
+3. ``lenient_json``: remove comments and trailing commas, map Python
+   literals (True/False/None) to JSON;
+4. ``defaults_filled``: fill missing topic/goal/lists/step fields/locale and
+   normalize step types;
+5. ``steps_renumbered``: rewrite step ids to ``step-1..n``.
+
+Every applied repair is counted in `repair_stats()` so the cost of sloppy
+model output stays visible.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from pydantic import ValidationError
+
+from src.models.plan import Plan, StepType
+
+REPAIR_KINDS = (
+    "fence_stripped",
+    "json_extracted",
+    "lenient_json",
+    "defaults_filled",
+    "steps_renumbered",
+)
+
+_FENCE_PATTERN = re.compile(r"^```[\w-]*\s*\n?(.*?)\n?```\s*$", re.DOTALL)
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+@dataclass
+class RepairResult:
+    """A validated plan plus the repairs needed to get there (empty if none)."""
+
+    plan: Plan
+    repairs: List[str] = field(default_factory=list)
+
+
+class _RepairStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Counter[str] = Counter()
+
+    def record(self, outcome: str, repairs: List[str]) -> None:
+        with self._lock:
+            self._counts[outcome] += 1
+            self._counts.update(repairs)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+_STATS = _RepairStats()
+
+
+def repair_stats() -> Dict[str, int]:
+    """Process-wide counts of clean/repaired/failed parses and each repair kind."""
+
+    return _STATS.snapshot()
+
+
+def reset_repair_stats() -> None:
+    _STATS.reset()
+
+
+def parse_plan(raw: str, *, topic: str | None = None, locale: str | None = None) -> RepairResult:
+    """Validate planner output, repairing it locally when the strict parse fails.
+
+    Raises the strict parse's `ValidationError` when the text cannot be turned
+    into JSON at all, or the post-repair `ValidationError` when the repaired
+    payload still violates the schema.
+    """
+
+    try:
+        plan = Plan.model_validate_json(raw)
+    except ValidationError as strict_error:
+        error = strict_error
+    else:
+        _STATS.record("clean", [])
+        return RepairResult(plan)
+
+    repairs: List[str] = []
+    data = _load_json(raw, repairs)
+    if not isinstance(data, dict):
+        _STATS.record("failed", repairs)
+        raise error
+
+    if _fill_defaults(data, topic=topic, locale=locale):
+        repairs.append("defaults_filled")
+    if _renumber_steps(data):
+        repairs.append("steps_renumbered")
+
+    try:
+        plan = Plan.model_validate(data)
+    except ValidationError:
+        _STATS.record("failed", repairs)
+        raise
+    _STATS.record("repaired", repairs)
+    return RepairResult(plan, repairs)
+
+
+def strip_fences(text: str) -> str:
+    """Return the body of a fenced code block, or the stripped text unchanged."""
+
+    stripped = text.strip()
+    match = _FENCE_PATTERN.match(stripped)
+    return match.group(1).strip() if match else stripped
+
+
+def _load_json(raw: str, repairs: List[str]) -> Any:
+    text = raw.strip()
+    unfenced = strip_fences(text)
+    if unfenced != text:
+        repairs.append("fence_stripped")
+        text = unfenced
+
+    if not text.startswith("{"):
+        extracted = _extract_object(text)
+        if extracted is None:
+            return None
+        repairs.append("json_extracted")
+        text = extracted
+
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    try:
+        data = json.loads(_lenient(text))
+    except json.JSONDecodeError:
+        return None
+    repairs.append("lenient_json")
+    return data
+
+
+def _extract_object(text: str) -> str | None:
+    """First balanced `{...}` in `text`, honouring braces inside strings."""
+
+    start = text.find("{")
+    if start < 0:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : index + 1]
+    return None
+
+
+def _lenient(text: str) -> str:
+    """Drop comments and trailing commas and map Python literals, outside strings."""
+
+    out: List[str] = []
+    index = 0
+    length = len(text)
+    while index < length:
+        char = text[index]
+        if char == '"':
+            end = index + 1
+            while end < length and text[end] != '"':
+                end += 2 if text[end] == "\\" else 1
+            out.append(text[index : end + 1])
+            index = end + 1
+            continue
+        if text.startswith("//", index):
+            newline = text.find("\n", index)
+            index = length if newline < 0 else newline
+            continue
+        if text.startswith("/*", index):
+            close = text.find("*/", index + 2)
+            index = length if close < 0 else close + 2
+            continue
+        if char == ",":
+            lookahead = index + 1
+            while lookahead < length and text[lookahead].isspace():
+                lookahead += 1
+            if lookahead < length and text[lookahead] in "}]":
+                index += 1
+                continue
+        if char.isalpha():
+            end = index
+            while end < length and (text[end].isalnum() or text[end] == "_"):
+                end += 1
+            word = text[index:end]
+            out.append(_PYTHON_LITERALS.get(word, word))
+            index = end
+            continue
+        out.append(char)
+        index += 1
+    return "".join(out)
+
+
+def _fill_defaults(data: Dict[str, Any], *, topic: str | None, locale: str | None) -> bool:
+    changed = False
+
+    def set_default(target: Dict[str, Any], key: str, value: Any) -> None:
+        nonlocal changed
+        if value is not None and not target.get(key):
+            target[key] = value
+            changed = True
+
+    set_default(data, "topic", topic)
+    set_default(data, "goal", data.get("topic"))
+
+    for key in ("assumptions", "risks"):
+        value = data.get(key)
+        if value is None and key in data or isinstance(value, str):
+            data[key] = [value] if value else []
+            changed = True
+
+    steps = data.get("steps")
+    if isinstance(steps, list):
+        for position, step in enumerate(steps, start=1):
+            if not isinstance(step, dict):
+                continue
+            set_default(step, "title", step.get("expected_outcome") or f"Step {position}")
+            set_default(step, "expected_outcome", step.get("title"))
+            step_type = step.get("step_type")
+            normalized = str(step_type).strip().upper() if step_type else ""
+            if normalized not in StepType.__members__:
+                normalized = StepType.RESEARCH.value
+            if step_type != normalized:
+                step["step_type"] = normalized
+                changed = True
+
+    metadata = data.get("metadata")
+    if metadata is None and ("metadata" in data or locale):
+        data["metadata"] = metadata = {}
+        changed = True
+    if isinstance(metadata, dict):
+        set_default(metadata, "locale", locale)
+    return changed
+
+
+def _renumber_steps(data: Dict[str, Any]) -> bool:
+    steps = data.get("steps")
+    if not isinstance(steps, list):
+        return False
+    changed = False
+    for position, step in enumerate(steps, start=1):
+        if isinstance(step, dict) and step.get("id") != f"step-{position}":
+            step["id"] = f"step-{position}"
+            changed = True
+    return changed
+
+
+__all__ = [
+    "REPAIR_KINDS",
+    "RepairResult",
+    "parse_plan",
+    "repair_stats",
+    "reset_repair_stats",
+    "strip_fences",
+]
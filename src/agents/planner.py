@@ -2,21 +2,25 @@
 
 from __future__ import annotations
 
-import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
+from src.agents.plan_repair import parse_plan
+from src.agents.scoring import PlanScore, score_plan
 from src.config.configuration import AppConfig
 from src.models.plan import Plan
+from src.tools.cache import cache_from_config
+from src.tools.circuit import breaker_from_config
+from src.tools.hedging import hedger_from_config
 from src.tools.llm import LLMError, call_llm
+from src.tools.prompts import prompt_registry
 
 logger = logging.getLogger(__name__)
 
-PROMPTS_DIR = Path(__file__).resolve().parents[1] / "prompts"
-_SYSTEM_PROMPT_PATH = PROMPTS_DIR / "planner_system.txt"
-_USER_TEMPLATE_PATH = PROMPTS_DIR / "planner_user.jinja"
+_SYSTEM_PROMPT = "planner_system"
+_USER_PROMPT = "planner_user"
 
 
 @dataclass
@@ -26,12 +30,21 @@ class PlannerAgent:
     config: AppConfig
 
     def __post_init__(self) -> None:
-        if not _SYSTEM_PROMPT_PATH.exists():
-            raise FileNotFoundError(f"Missing system prompt at {_SYSTEM_PROMPT_PATH}")
-        if not _USER_TEMPLATE_PATH.exists():
-            raise FileNotFoundError(f"Missing user template at {_USER_TEMPLATE_PATH}")
-        self._system_prompt = _SYSTEM_PROMPT_PATH.read_text(encoding="utf-8")
-        self._user_template = _USER_TEMPLATE_PATH.read_text(encoding="utf-8")
+        self._prompts = prompt_registry()
+        # Fail at construction, not mid-run, when a prompt file is missing.
+        self._system_prompt = self._prompts.get(_SYSTEM_PROMPT)
+        self._user_prompt = self._prompts.get(_USER_PROMPT)
+
+    @property
+    def prompt_ids(self) -> List[str]:
+        """Versioned ids of the prompts this agent sends, for telemetry."""
+
+        return [self._system_prompt.id, self._user_prompt.id]
+
+    def update_config(self, config: AppConfig) -> None:
+        """Swap in a reloaded config; subsequent plans use its models and keys."""
+
+        self.config = config
 
     def generate_plan(
         self,
@@ -41,7 +54,12 @@ class PlannerAgent:
         context: str | None = None,
         extra_meta: Dict[str, Any] | None = None,
     ) -> Plan:
-        """Call OpenRouter with planner prompts and return a validated Plan."""
+        """Call OpenRouter with planner prompts and return a validated Plan.
+
+        With `models.planner_candidates > 1`, that many candidates are
+        requested concurrently and the best valid one by `score_plan` wins;
+        invalid candidates are dropped without another round-trip.
+        """
 
         cfg = self.config
         api_cfg = cfg.api
@@ -49,29 +67,13 @@ class PlannerAgent:
             raise ValueError("OpenRouter key is required for planner agent")
 
         user_prompt = self._render_user_prompt(topic=topic, locale=locale, context=context)
+        meta = {"topic": topic, "locale": locale} | (extra_meta or {})
 
-        try:
-            raw_response = call_llm(
-                user_prompt,
-                model=cfg.models.planner,
-                openrouter_key=api_cfg.openrouter_key,
-                temperature=cfg.models.temperature,
-                timeout=60.0,
-                extra={"topic": topic, "locale": locale} | (extra_meta or {}),
-                system_prompt=self._system_prompt,
-            )
-        except LLMError:
-            logger.exception("Planner LLM call failed", extra={"topic": topic, "locale": locale})
-            raise
-
-        try:
-            plan = Plan.model_validate_json(raw_response)
-        except json.JSONDecodeError:
-            logger.error("Planner returned invalid JSON", extra={"response": raw_response})
-            raise
-        except Exception:
-            logger.exception("Planner response failed schema validation")
-            raise
+        if cfg.models.planner_candidates > 1:
+            plan = self._generate_candidates(topic, user_prompt, meta)
+        else:
+            raw_response = self._request_plan(user_prompt, cfg.models.planner, None, meta)
+            plan = self._parse_plan(raw_response, meta)
 
         if not plan.metadata.locale:
             plan.metadata.locale = locale
@@ -82,9 +84,100 @@ class PlannerAgent:
                 "topic": topic,
                 "steps": len(plan.steps),
                 "locale": plan.metadata.locale,
+                "prompts": self.prompt_ids,
             },
         )
         return plan
 
+    def _generate_candidates(self, topic: str, user_prompt: str, meta: Dict[str, Any]) -> Plan:
+        specs = _candidate_specs(self.config)
+        with ThreadPoolExecutor(max_workers=len(specs)) as executor:
+            futures = [
+                executor.submit(self._request_plan, user_prompt, model, seed, meta | {"candidate": index})
+                for index, (model, seed) in enumerate(specs)
+            ]
+
+        scored: List[Tuple[PlanScore, int, Plan]] = []
+        errors: List[Exception] = []
+        for index, ((model, seed), future) in enumerate(zip(specs, futures)):
+            try:
+                plan = self._parse_plan(future.result(), meta)
+            except (LLMError, ValueError) as exc:
+                # pydantic's ValidationError is a ValueError.
+                logger.warning(
+                    "Discarding planner candidate",
+                    extra={"candidate": index, "model": model, "seed": seed, "error": str(exc)[:200]},
+                )
+                errors.append(exc)
+                continue
+            scored.append((score_plan(plan, topic), index, plan))
+
+        if not scored:
+            raise errors[0]
+        # Highest score wins; ties go to the earlier candidate.
+        best_score, best_index, best_plan = max(scored, key=lambda item: (item[0].total, -item[1]))
+        logger.info(
+            "Planner candidate selected",
+            extra={
+                "candidate": best_index,
+                "model": specs[best_index][0],
+                "score": best_score.total,
+                "valid": len(scored),
+                "requested": len(specs),
+            },
+        )
+        return best_plan
+
+    def _request_plan(self, user_prompt: str, model: str, seed: int | None, meta: Dict[str, Any]) -> str:
+        cfg = self.config
+        try:
+            return call_llm(
+                user_prompt,
+                model=model,
+                openrouter_key=cfg.api.openrouter_key,
+                temperature=cfg.models.temperature,
+                timeout=60.0,
+                extra=meta,
+                system_prompt=self._system_prompt.source,
+                seed=seed,
+                prompt_version=",".join(self.prompt_ids),
+                cache=cache_from_config(cfg.cache),
+                cache_ttl=cfg.cache.llm_ttl_seconds,
+                breaker=breaker_from_config("openrouter", cfg.resilience),
+                hedger=hedger_from_config("openrouter", cfg.resilience),
+            )
+        except LLMError:
+            logger.exception("Planner LLM call failed", extra={"topic": meta.get("topic"), "model": model})
+            raise
+
+    def _parse_plan(self, raw_response: str, meta: Dict[str, Any]) -> Plan:
+        """Validate the response, repairing sloppy JSON locally instead of re-asking the model."""
+
+        try:
+            result = parse_plan(raw_response, topic=meta.get("topic"), locale=meta.get("locale"))
+        except ValueError:
+            logger.exception(
+                "Planner response failed schema validation", extra={"response": raw_response[:500]}
+            )
+            raise
+        if result.repairs:
+            logger.info(
+                "Planner response repaired",
+                extra={"topic": meta.get("topic"), "repairs": result.repairs},
+            )
+        return result.plan
+
     def _render_user_prompt(self, *, topic: str, locale: str, context: str | None) -> str:
-        return self._user_template.format(topic=topic, locale=locale, context=context or "")
+        variables = {"topic": topic, "locale": locale}
+        if context:
+            # Left out when empty so the template's default applies.
+            variables["context"] = context
+        return self._prompts.render(_USER_PROMPT, **variables)
+
+
+def _candidate_specs(config: AppConfig) -> List[Tuple[str, int]]:
+    """(model, seed) per candidate: models rotate, seeds keep same-model candidates distinct."""
+
+    extra_models = [item.strip() for item in config.models.planner_candidate_models.split(",")]
+    models = [config.models.planner, *(model for model in extra_models if model)]
+    return [(models[index % len(models)], index) for index in range(config.models.planner_candidates)]
@@ -2,13 +2,28 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 from time import perf_counter
 from typing import Callable, Iterable, List, Sequence
 
+from src.agents.scoring import ConfidenceScorer
 from src.config.configuration import AppConfig
 from src.models.plan import PlanStep, ResearchNote
-from src.tools.search import SearchError, search_web
+from src.tools.cache import ResponseCache, cache_from_config
+from src.tools.circuit import HALF_OPEN, OPEN, CircuitBreaker, breaker_from_config
+from src.tools.dedup import NearDuplicateIndex
+from src.tools.hedging import Hedger, hedger_from_config
+from src.tools.local_index import LocalIndex
+from src.tools.search import SearchError, fuse_results, search_web
+from src.tools.singleflight import coalescing_scope
+
+SearchCallable = Callable[[str, str, int, float], List[dict]]
+
+# Upper bound on keywords appended to the keyword-only expansion query.
+_MAX_QUERY_KEYWORDS = 6
 
 
 class ResearcherError(RuntimeError):
@@ -27,6 +42,10 @@ class ResearcherResult:
     applied_max_results: int | None = None
     applied_max_notes: int | None = None
     degradation_mode: str | None = None
+    queries: List[str] = field(default_factory=list)
+    local_hits: int = 0
+    # Searches that joined an identical in-flight request instead of calling Tavily.
+    coalesced_queries: int = 0
 
 
 @dataclass
@@ -39,11 +58,13 @@ class ResearchContext:
     max_results: int
     timeout_seconds: float
     max_notes: int | None = None
+    query_expansions: int = 1
     scratchpad: Sequence[ResearchNote] = ()
     prior_notes: Sequence[ResearchNote] = ()
     budget_tokens_remaining: int | None = None
     budget_cost_limit: float | None = None
     degradation_hint: str | None = None
+    dedup_index: NearDuplicateIndex | None = None
 
 
 class ResearcherAgent:
@@ -53,69 +74,231 @@ class ResearcherAgent:
         self,
         config: AppConfig,
         *,
-        search_callable: Callable[[str, str, int, float], List[dict]] | None = None,
+        search_callable: SearchCallable | None = None,
+        scorer: ConfidenceScorer | None = None,
+        local_index: LocalIndex | None = None,
+        cache: ResponseCache | None = None,
+        breaker: CircuitBreaker | None = None,
     ) -> None:
         self._config = config
         self._search_callable = search_callable
+        self._shared_cache = cache is None
+        self._cache = cache if cache is not None else cache_from_config(config.cache)
+        self._shared_breaker = breaker is None
+        self._breaker = breaker if breaker is not None else breaker_from_config("tavily", config.resilience)
+        self._hedger = hedger_from_config("tavily", config.resilience)
+        self._scorer = scorer or ConfidenceScorer()
+        if local_index is None and config.search.local_index_path:
+            local_index = LocalIndex(config.search.local_index_path)
+        self._local_index = local_index
+
+    def update_config(self, config: AppConfig) -> None:
+        """Swap in a reloaded config; subsequent steps use its keys and limits."""
+
+        self._config = config
+        if self._shared_cache:
+            self._cache = cache_from_config(config.cache)
+        if self._shared_breaker:
+            self._breaker = breaker_from_config("tavily", config.resilience)
+        self._hedger = hedger_from_config("tavily", config.resilience)
 
     def run_step(self, context: ResearchContext) -> ResearcherResult:
-        """Execute a single plan step and return captured notes and references."""
+        """Execute a single plan step and return captured notes and references.
 
-        api_key = self._config.api.tavily_key
-        if not api_key:
-            raise ResearcherError("Missing Tavily API key; cannot execute research step")
+        When a local index is configured it is consulted first; Tavily is only
+        called when local recall cannot fill the step's note quota. While the
+        Tavily circuit breaker is open the step fails immediately (or keeps
+        only local notes); while it is half-open the step runs conservatively.
+        """
 
         max_results = max(1, context.max_results)
         timeout = max(1.0, float(context.timeout_seconds))
 
         effective_max_results = max_results
         effective_max_notes = context.max_notes or min(3, max_results)
-        degradation_mode = _resolve_degradation_mode(context)
+        effective_expansions = max(1, context.query_expansions)
+        breaker_state = self._breaker.state if self._breaker is not None else None
+        degradation_mode = _resolve_degradation_mode(context, breaker_state=breaker_state)
 
         if degradation_mode:
             if "budget" in degradation_mode:
                 effective_max_results = min(effective_max_results, 2)
                 effective_max_notes = min(effective_max_notes, 1)
+                effective_expansions = 1
             if "conservative" in degradation_mode:
                 effective_max_results = min(effective_max_results, 2)
                 effective_max_notes = min(effective_max_notes, 1)
+                effective_expansions = 1
             if "aggressive" in degradation_mode:
                 effective_max_results = max(1, effective_max_results // 2)
                 effective_max_notes = max(1, effective_max_notes // 2)
+                effective_expansions = max(1, effective_expansions // 2)
 
-        query = self._build_query(
+        queries = self._build_queries(
             topic=context.topic,
             step=context.step,
             locale=context.locale,
+            limit=effective_expansions,
         )
-        search_fn = self._search_callable or _default_search_callable
+        dedup_index = context.dedup_index
+        if dedup_index is None:
+            dedup_index = NearDuplicateIndex.from_notes(context.prior_notes)
 
         started_at = perf_counter()
-        try:
-            results = search_fn(query, api_key, max_results, timeout)
-        except SearchError as exc:
-            raise ResearcherError(str(exc)) from exc
-        duration = perf_counter() - started_at
-
+        local_results = self._search_local(queries, limit=max_results)
         notes, references = self._extract_notes(
             context.step,
-            results,
+            local_results,
             max_notes=effective_max_notes,
+            dedup_index=dedup_index,
         )
+        results: List[dict] = []
+        coalesced_queries = 0
+
+        if len(notes) < effective_max_notes and breaker_state == OPEN:
+            # Keep whatever local recall found instead of waiting on a dead upstream.
+            if not notes:
+                raise ResearcherError(
+                    f"Tavily circuit open; skipping step (retry in {self._breaker.retry_after:.0f}s)"
+                )
+        elif len(notes) < effective_max_notes:
+            api_key = self._config.api.tavily_key
+            if not api_key:
+                raise ResearcherError("Missing Tavily API key; cannot execute research step")
+
+            search_fn = self._search_callable or partial(
+                _default_search_callable,
+                cache=self._cache,
+                cache_ttl=self._config.cache.search_ttl_seconds,
+                breaker=self._breaker,
+                hedger=self._hedger,
+            )
+            with coalescing_scope() as coalesced:
+                results = self._dispatch_queries(search_fn, queries, api_key, max_results, timeout)
+            coalesced_queries = coalesced.total
+            web_notes, web_references = self._extract_notes(
+                context.step,
+                results,
+                max_notes=effective_max_notes - len(notes),
+                dedup_index=dedup_index,
+            )
+            if self._local_index is not None and web_notes:
+                self._local_index.add_notes(web_notes)
+            notes.extend(web_notes)
+            references.extend(web_references)
+
+        duration = perf_counter() - started_at
         if not notes:
             raise ResearcherError("Tavily returned no usable results for this step")
 
         return ResearcherResult(
-            query=query,
+            query=queries[0],
             notes=notes,
             references=references,
             duration_seconds=duration,
-            total_results=len(results),
+            total_results=len(results) + len(local_results),
             applied_max_results=effective_max_results,
             applied_max_notes=effective_max_notes,
             degradation_mode=degradation_mode,
+            queries=queries,
+            local_hits=len(local_results),
+            coalesced_queries=coalesced_queries,
         )
 
+    def _build_queries(
+        self,
+        *,
+        topic: str,
+        step: PlanStep,
+        locale: str,
+        limit: int,
+    ) -> List[str]:
+        """Derive up to `limit` distinct queries for a step, primary query first."""
+
+        candidates = [self._build_query(topic=topic, step=step, locale=locale)]
+        if limit > 1:
+            outcome = step.expected_outcome.strip()
+            if outcome:
+                components = [topic.strip(), outcome]
+                if locale:
+                    components.append(locale.strip())
+                candidates.append(" | ".join(filter(None, components)))
+
+            topic_words = {word.lower() for word in topic.split()}
+            keywords: List[str] = []
+            for token in self._keywords_for_step(step):
+                if token in topic_words or token in keywords:
+                    continue
+                keywords.append(token)
+                if len(keywords) >= _MAX_QUERY_KEYWORDS:
+                    break
+            if keywords:
+                candidates.append(" ".join([topic.strip(), *keywords]).strip())
+
+        queries: List[str] = []
+        seen: set[str] = set()
+        for candidate in candidates:
+            normalized = candidate.casefold()
+            if not candidate or normalized in seen:
+                continue
+            seen.add(normalized)
+            queries.append(candidate)
+            if len(queries) >= limit:
+                break
+        return queries
+
+    def _dispatch_queries(
+        self,
+        search_fn: SearchCallable,
+        queries: Sequence[str],
+        api_key: str,
+        max_results: int,
+        timeout: float,
+    ) -> List[dict]:
+        """Run all queries concurrently and fuse their rankings.
+
+        A failing expansion query is tolerated as long as at least one query
+        succeeds; the step only fails when every query errors out.
+        """
+
+        if len(queries) == 1:
+            try:
+                return search_fn(queries[0], api_key, max_results, timeout)
+            except SearchError as exc:
+                raise ResearcherError(str(exc)) from exc
+
+        max_workers = max(1, min(len(queries), self._config.search.max_concurrency))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Copy the caller's context so coalesced searches are counted on its scope.
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run, search_fn, query, api_key, max_results, timeout
+                )
+                for query in queries
+            ]
+
+        result_lists: List[List[dict]] = []
+        errors: List[SearchError] = []
+        for future in futures:
+            try:
+                result_lists.append(future.result())
+            except SearchError as exc:
+                errors.append(exc)
+
+        if not result_lists:
+            raise ResearcherError(str(errors[0])) from errors[0]
+        return fuse_results(result_lists)
+
+    def _search_local(self, queries: Sequence[str], *, limit: int) -> List[dict]:
+        if self._local_index is None:
+            return []
+        min_score = self._config.search.local_min_score
+        hit_lists = [
+            [hit.as_result() for hit in self._local_index.search(query, limit=limit) if hit.score >= min_score]
+            for query in queries
+        ]
+        return fuse_results(hit_lists)[:limit]
+
     def _build_query(self, *, topic: str, step: PlanStep, locale: str) -> str:
         components = [topic.strip(), step.title.strip()]
         if locale:
@@ -131,12 +314,15 @@ class ResearcherAgent:
         results: Sequence[dict],
         *,
         max_notes: int,
+        dedup_index: NearDuplicateIndex | None = None,
     ) -> tuple[List[ResearchNote], List[str]]:
         notes: List[ResearchNote] = []
         references: List[str] = []
-        seen_urls: set[str] = set()
+        index = dedup_index if dedup_index is not None else NearDuplicateIndex()
+        candidates = list(self._iter_candidates(results))
+        confidences = self._scorer.score(step, candidates)
 
-        for item in self._iter_candidates(results):
+        for item, confidence in zip(candidates, confidences):
             if len(notes) >= max_notes:
                 break
 
@@ -144,35 +330,21 @@ class ResearcherAgent:
             title = str(item.get("title", "")).strip()
             snippet = str(item.get("snippet", "")).strip()
 
-            if not url or url in seen_urls:
+            if not url or not index.check_and_add(url, snippet):
                 continue
 
-            seen_urls.add(url)
-            confidence = self._estimate_confidence(step, title=title, snippet=snippet)
-            note = ResearchNote(
-                source=url,
-                claim=title or step.expected_outcome,
-                evidence=snippet or None,
-                confidence=confidence,
+            notes.append(
+                ResearchNote(
+                    source=url,
+                    claim=title or step.expected_outcome,
+                    evidence=snippet or None,
+                    confidence=confidence,
+                )
             )
-            notes.append(note)
             references.append(url)
 
         return notes, references
 
-    def _estimate_confidence(self, step: PlanStep, *, title: str, snippet: str) -> float:
-        base = 0.6
-        if snippet:
-            base += 0.15
-            if len(snippet) > 120:
-                base += 0.05
-        if title:
-            title_lower = title.lower()
-            keywords = self._keywords_for_step(step)
-            if any(token in title_lower for token in keywords):
-                base += 0.05
-        return max(0.5, min(base, 0.95))
-
     def _keywords_for_step(self, step: PlanStep) -> List[str]:
         tokens = []
         for text in (step.title, step.expected_outcome):
@@ -187,19 +359,35 @@ def _default_search_callable(
     api_key: str,
     max_results: int,
     timeout: float,
+    *,
+    cache: ResponseCache | None = None,
+    cache_ttl: float | None = None,
+    breaker: CircuitBreaker | None = None,
+    hedger: Hedger | None = None,
 ) -> List[dict]:
     return search_web(
         query,
         tavily_key=api_key,
         max_results=max_results,
         timeout=timeout,
+        cache=cache,
+        cache_ttl=cache_ttl,
+        breaker=breaker,
+        hedger=hedger,
     )
 
 
-def _resolve_degradation_mode(context: ResearchContext) -> str | None:
+def _resolve_degradation_mode(
+    context: ResearchContext, *, breaker_state: str | None = None
+) -> str | None:
     modes: list[str] = []
     if context.degradation_hint:
         modes.append(context.degradation_hint)
+    if breaker_state == OPEN:
+        modes.append("circuit_open")
+    elif breaker_state == HALF_OPEN:
+        # Probe a recovering upstream with a single small query.
+        modes.append("conservative")
     if context.budget_tokens_remaining is not None and context.budget_tokens_remaining < 500:
         modes.append("budget")
     if context.budget_cost_limit is not None and context.budget_cost_limit < 1.0:
@@ -0,0 +1,227 @@
+"""Batch confidence scoring for Researcher search results and planner candidates."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable, Iterable, List, Mapping, Sequence, Tuple
+
+from src.models.plan import Plan, PlanStep, StepType
+from src.tools.dedup import canonicalize_url
+
+# A feature maps a batch of results to one additive confidence delta per result.
+ScoringFeature = Callable[[Sequence[Mapping[str, Any]]], Sequence[float]]
+
+_BASE_SCORE = 0.6
+_SNIPPET_BONUS = 0.15
+_LONG_SNIPPET_BONUS = 0.05
+_LONG_SNIPPET_CHARS = 120
+_KEYWORD_BONUS = 0.05
+
+# Plan candidates with a step count inside this band get the full step score.
+_PLAN_STEP_BAND = (3, 8)
+_PLAN_WEIGHTS = {"coverage": 0.4, "completeness": 0.3, "step_count": 0.3}
+# CJK character pairs (topics without spaces), otherwise words of 4+ letters.
+_TOPIC_TERM_PATTERN = re.compile(r"[\u4e00-\u9fff]{2}|[^\W\d_\u4e00-\u9fff]{4,}")
+
+
+class ConfidenceScorer:
+    """Scores all results of a step in one pass.
+
+    The step keyword set is compiled into a single alternation pattern once
+    per (title, expected_outcome) pair, and scores are accumulated column by
+    column so optional features only walk the batch once each.
+    """
+
+    def __init__(
+        self,
+        features: Sequence[ScoringFeature] = (),
+        *,
+        floor: float = 0.5,
+        ceiling: float = 0.95,
+    ) -> None:
+        self._features = tuple(features)
+        self._floor = floor
+        self._ceiling = ceiling
+
+    def score(self, step: PlanStep, results: Sequence[Mapping[str, Any]]) -> List[float]:
+        """Return a confidence score for every result, in input order."""
+
+        if not results:
+            return []
+
+        titles = [str(item.get("title", "")).strip() for item in results]
+        snippet_lengths = [len(str(item.get("snippet", "")).strip()) for item in results]
+
+        scores = [_BASE_SCORE] * len(results)
+        for idx, length in enumerate(snippet_lengths):
+            if length:
+                scores[idx] += _SNIPPET_BONUS
+                if length > _LONG_SNIPPET_CHARS:
+                    scores[idx] += _LONG_SNIPPET_BONUS
+
+        pattern = keyword_pattern(step.title, step.expected_outcome)
+        if pattern is not None:
+            for idx, title in enumerate(titles):
+                if title and pattern.search(title.lower()):
+                    scores[idx] += _KEYWORD_BONUS
+
+        for feature in self._features:
+            deltas = feature(results)
+            if len(deltas) != len(scores):
+                raise ValueError("Scoring feature returned a mismatched number of values")
+            scores = [score + delta for score, delta in zip(scores, deltas)]
+
+        return [max(self._floor, min(score, self._ceiling)) for score in scores]
+
+    def score_many(
+        self, batches: Iterable[Tuple[PlanStep, Sequence[Mapping[str, Any]]]]
+    ) -> List[List[float]]:
+        """Score several (step, results) batches, e.g. for all steps of a plan."""
+
+        return [self.score(step, results) for step, results in batches]
+
+
+@dataclass(frozen=True)
+class PlanScore:
+    """Local quality estimate of a planner candidate; every component is in [0, 1]."""
+
+    total: float
+    coverage: float
+    completeness: float
+    step_count: float
+
+
+def score_plan(plan: Plan, topic: str) -> PlanScore:
+    """Score a validated plan without another model call.
+
+    - coverage: share of topic terms mentioned in the goal or the steps;
+    - completeness: steps with a title, an expected outcome and a unique id,
+      with a penalty when no RESEARCH step exists;
+    - step_count: 1.0 inside the preferred band, decaying outside it.
+    """
+
+    terms = set(_TOPIC_TERM_PATTERN.findall(topic.lower()))
+    text = " ".join(
+        [plan.goal, *(f"{step.title} {step.expected_outcome}" for step in plan.steps)]
+    ).lower()
+    coverage = sum(1 for term in terms if term in text) / len(terms) if terms else 1.0
+
+    steps = plan.steps
+    if steps:
+        ids = [step.id.strip() for step in steps]
+        complete = sum(
+            1
+            for step, step_id in zip(steps, ids)
+            if step_id and ids.count(step_id) == 1 and step.title.strip() and step.expected_outcome.strip()
+        )
+        completeness = complete / len(steps)
+        if not any(step.step_type == StepType.RESEARCH for step in steps):
+            completeness *= 0.5
+    else:
+        completeness = 0.0
+
+    low, high = _PLAN_STEP_BAND
+    count = len(steps)
+    if low <= count <= high:
+        step_count = 1.0
+    elif count < low:
+        step_count = count / low
+    else:
+        step_count = max(0.0, 1.0 - (count - high) / high)
+
+    total = (
+        _PLAN_WEIGHTS["coverage"] * coverage
+        + _PLAN_WEIGHTS["completeness"] * completeness
+        + _PLAN_WEIGHTS["step_count"] * step_count
+    )
+    return PlanScore(
+        total=round(total, 4),
+        coverage=round(coverage, 4),
+        completeness=round(completeness, 4),
+        step_count=round(step_count, 4),
+    )
+
+
+@lru_cache(maxsize=256)
+def keyword_pattern(title: str, expected_outcome: str) -> re.Pattern[str] | None:
+    """Compile the step keywords (words longer than 3 chars) into one pattern."""
+
+    tokens: set[str] = set()
+    for text in (title, expected_outcome):
+        if not text:
+            continue
+        tokens.update(word.lower() for word in text.split() if len(word) > 3)
+    if not tokens:
+        return None
+    # Longest first so the alternation prefers the most specific keyword.
+    ordered = sorted(tokens, key=lambda token: (-len(token), token))
+    return re.compile("|".join(re.escape(token) for token in ordered))
+
+
+def domain_authority_feature(
+    weights: Mapping[str, float], *, default: float = 0.0
+) -> ScoringFeature:
+    """Build a feature that adds a per-domain delta (subdomains inherit weights)."""
+
+    normalized = {domain.lower().lstrip("."): value for domain, value in weights.items()}
+
+    def _feature(results: Sequence[Mapping[str, Any]]) -> List[float]:
+        deltas: List[float] = []
+        for item in results:
+            canonical = canonicalize_url(str(item.get("url", "")))
+            host = canonical.split("://", 1)[-1].split("/", 1)[0].split(":", 1)[0]
+            delta = default
+            while host:
+                if host in normalized:
+                    delta = normalized[host]
+                    break
+                _, _, host = host.partition(".")
+            deltas.append(delta)
+        return deltas
+
+    return _feature
+
+
+def recency_feature(
+    *,
+    weight: float = 0.05,
+    half_life_days: float = 365.0,
+    field: str = "published_date",
+    now: datetime | None = None,
+) -> ScoringFeature:
+    """Build a feature rewarding recent results with an exponentially decaying bonus."""
+
+    if half_life_days <= 0:
+        raise ValueError("half_life_days must be positive")
+
+    def _feature(results: Sequence[Mapping[str, Any]]) -> List[float]:
+        reference = now or datetime.now(timezone.utc)
+        deltas: List[float] = []
+        for item in results:
+            published = _parse_datetime(item.get(field))
+            if published is None:
+                deltas.append(0.0)
+                continue
+            age_days = max(0.0, (reference - published).total_seconds() / 86400.0)
+            deltas.append(weight * 0.5 ** (age_days / half_life_days))
+        return deltas
+
+    return _feature
+
+
+def _parse_datetime(value: Any) -> datetime | None:
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, str) and value.strip():
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    else:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
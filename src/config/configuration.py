@@ -3,14 +3,30 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import asdict, dataclass, field
+import os
+import threading
+import types
+import typing
+from dataclasses import asdict, dataclass, field, fields, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Tuple
 
 import yaml
 
 logger = logging.getLogger(__name__)
 
+ConfigListener = Callable[["AppConfig"], None]
+# (mtime_ns, inode, size) per file; None when the file does not exist.
+_FileSignature = Tuple[int, int, int] | None
+
+# Environment overrides use SECTION and FIELD joined by double underscores,
+# e.g. DEEP_RESEARCH__SEARCH__MAX_QUERIES=5.
+ENV_PREFIX = "DEEP_RESEARCH__"
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+_FALSE_VALUES = frozenset({"0", "false", "no", "off"})
+_NULL_VALUES = frozenset({"", "null", "none"})
+
 
 @dataclass
 class RuntimeConfig:
@@ -19,6 +35,13 @@ class RuntimeConfig:
     locale: str = "zh-CN"
     max_iterations: int = 6
     human_review: bool = True
+    report_dir: str | None = None
+    report_formats: str = "markdown"
+    scratchpad_limit: int = 200
+    # Dispatch researcher steps through a broker, e.g. sqlite://output/jobs/queue.sqlite
+    # (relative to the project root, the queue `run_workers.py run --role steps` drains).
+    broker_url: str | None = None
+    broker_timeout_seconds: float = 600.0
 
 
 @dataclass
@@ -29,6 +52,10 @@ class ModelConfig:
     researcher: str = "gpt-4o-mini"
     reporter: str = "gpt-4o-mini"
     temperature: float = 0.0
+    # >1 requests that many plans concurrently and keeps the best-scoring valid one.
+    planner_candidates: int = 1
+    # Comma-separated extra planner models rotated across candidates.
+    planner_candidate_models: str = ""
 
 
 @dataclass
@@ -37,6 +64,42 @@ class SearchConfig:
 
     max_queries: int = 3
     timeout_seconds: float = 8.0
+    query_expansions: int = 3
+    max_concurrency: int = 4
+    local_index_path: str | None = None
+    local_min_score: float = 2.0
+
+
+@dataclass
+class CacheConfig:
+    """Response cache for search and LLM calls."""
+
+    enabled: bool = False
+    # SQLite file shared by every worker process (null = in-process LRU only).
+    path: str | None = None
+    max_entries: int = 1024
+    search_ttl_seconds: float | None = 86400.0
+    # LLM responses are only cached at temperature 0.
+    llm_ttl_seconds: float | None = None
+
+
+@dataclass
+class ResilienceConfig:
+    """Fast-fail behaviour for the Tavily and OpenRouter endpoints."""
+
+    breaker_enabled: bool = True
+    # Open once this share of calls in the window failed (after min_calls calls).
+    breaker_failure_ratio: float = 0.5
+    breaker_min_calls: int = 5
+    breaker_window_seconds: float = 60.0
+    # How long an open breaker rejects calls before letting a trial through.
+    breaker_reset_seconds: float = 30.0
+    # Tavily/OpenRouter calls: race a duplicate request once the first is slower than
+    # the hedge_percentile latency, for at most hedge_max_extra_ratio of calls.
+    hedge_enabled: bool = False
+    hedge_percentile: float = 0.95
+    hedge_max_extra_ratio: float = 0.1
+    hedge_min_delay_seconds: float = 0.05
 
 
 @dataclass
@@ -62,6 +125,8 @@ class AppConfig:
     runtime: RuntimeConfig = field(default_factory=RuntimeConfig)
     models: ModelConfig = field(default_factory=ModelConfig)
     search: SearchConfig = field(default_factory=SearchConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    resilience: ResilienceConfig = field(default_factory=ResilienceConfig)
     api: ApiConfig = field(default_factory=ApiConfig)
     observability: ObservabilityConfig = field(default_factory=ObservabilityConfig)
 
@@ -69,19 +134,103 @@ class AppConfig:
 def load_config(
     settings_path: str | Path = "config/settings.yaml",
     secret_path: str | Path = "secret",
+    *,
+    environ: Mapping[str, str] | None = None,
+    overrides: Mapping[str, Any] | None = None,
 ) -> AppConfig:
     """Load configuration from settings YAML and the optional secret file.
 
     `settings.yaml` carries defaults, while the plain-text `secret` file
     (KEY=VALUE per line) overrides sensitive values without touching VCS.
+    Layers are applied as defaults → YAML → secret → environment
+    (`DEEP_RESEARCH__SECTION__FIELD`, read from `os.environ` unless `environ`
+    is given) → explicit `overrides` such as CLI `--set section.field=value`.
     """
 
+    file_config = _load_file_config(Path(settings_path), Path(secret_path))
+    return resolve_config(file_config, environ=environ, overrides=overrides)
+
+
+def resolve_config(
+    base: AppConfig,
+    *,
+    environ: Mapping[str, str] | None = None,
+    overrides: Mapping[str, Any] | None = None,
+) -> AppConfig:
+    """Apply the environment and explicit override layers on top of `base`."""
+
+    layered = env_overrides(os.environ if environ is None else environ)
+    layered.update(overrides or {})
+    return apply_overrides(base, layered)
+
+
+def env_overrides(environ: Mapping[str, str], *, prefix: str = ENV_PREFIX) -> Dict[str, str]:
+    """Collect `PREFIX + SECTION__FIELD` variables as dotted override keys."""
+
+    collected: Dict[str, str] = {}
+    for name, value in environ.items():
+        if not name.upper().startswith(prefix):
+            continue
+        section, sep, field_name = name[len(prefix) :].partition("__")
+        if not sep or not section or not field_name:
+            logger.warning("Ignoring malformed config env var", extra={"name": name})
+            continue
+        collected[f"{section.lower()}.{field_name.lower()}"] = value
+    return collected
+
+
+def parse_overrides(items: Iterable[str]) -> Dict[str, str]:
+    """Parse CLI style `section.field=value` strings into an override mapping."""
+
+    parsed: Dict[str, str] = {}
+    for item in items:
+        key, sep, value = item.partition("=")
+        if not sep or "." not in key:
+            raise ValueError(f"Override must look like section.field=value, got {item!r}")
+        parsed[key.strip().lower()] = value.strip()
+    return parsed
+
+
+def apply_overrides(config: AppConfig, overrides: Mapping[str, Any]) -> AppConfig:
+    """Return a copy of `config` with dotted-key overrides coerced to field types.
+
+    Unknown sections or fields raise `ValueError` so typos fail loudly.
+    """
+
+    if not overrides:
+        return config
+
+    per_section: Dict[str, Dict[str, Any]] = {}
+    for key, raw_value in overrides.items():
+        section_name, _, field_name = key.partition(".")
+        section = getattr(config, section_name, None) if section_name in _SECTION_NAMES else None
+        if section is None:
+            raise ValueError(f"Unknown config section in override {key!r}")
+        field_types = _field_types(type(section))
+        if field_name not in field_types:
+            raise ValueError(f"Unknown config field in override {key!r}")
+        per_section.setdefault(section_name, {})[field_name] = _coerce_value(
+            raw_value, field_types[field_name], key
+        )
+
+    return replace(
+        config,
+        **{
+            name: replace(getattr(config, name), **values)
+            for name, values in per_section.items()
+        },
+    )
+
+
+def _load_file_config(settings_path: Path, secret_path: Path) -> AppConfig:
     settings_data = _load_settings_yaml(Path(settings_path))
     secrets_data = _load_secret_file(Path(secret_path))
 
     runtime_cfg = RuntimeConfig(**_get_section(settings_data, "runtime"))
     model_cfg = ModelConfig(**_get_section(settings_data, "models"))
     search_cfg = SearchConfig(**_get_section(settings_data, "search"))
+    cache_cfg = CacheConfig(**_get_section(settings_data, "cache"))
+    resilience_cfg = ResilienceConfig(**_get_section(settings_data, "resilience"))
     api_cfg = ApiConfig(**_get_section(settings_data, "api"))
 
     observability_raw = _get_section(settings_data, "observability")
@@ -92,11 +241,237 @@ def load_config(
         runtime=runtime_cfg,
         models=model_cfg,
         search=search_cfg,
+        cache=cache_cfg,
+        resilience=resilience_cfg,
         api=api_cfg,
         observability=observability_cfg,
     )
 
 
+class ConfigProvider:
+    """Memoized `AppConfig` source with optional hot reload.
+
+    The parsed config is cached together with the (mtime, inode, size)
+    signature of the settings and secret files. `current` is a plain
+    attribute read for hot paths; `refresh()` re-parses only when a signature
+    changed and atomically swaps the new snapshot in, then notifies
+    subscribers (researcher limits, pool sizes, ...). A failed reload keeps
+    the previous snapshot. Environment and explicit overrides are layered on
+    the cached file config, so changing them never re-parses YAML.
+    """
+
+    def __init__(
+        self,
+        settings_path: str | Path = "config/settings.yaml",
+        secret_path: str | Path = "secret",
+        *,
+        environ: Mapping[str, str] | None = None,
+        overrides: Mapping[str, Any] | None = None,
+    ) -> None:
+        self._settings_path = Path(settings_path)
+        self._secret_path = Path(secret_path)
+        self._environ = environ
+        self._overrides = dict(overrides or {})
+        self._lock = threading.Lock()
+        self._listeners: List[ConfigListener] = []
+        self._watcher: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._signature = self._file_signatures()
+        self._file_config = _load_file_config(self._settings_path, self._secret_path)
+        self._config = self._resolve(self._file_config)
+
+    @property
+    def current(self) -> AppConfig:
+        """Return the cached snapshot without touching the filesystem."""
+
+        return self._config
+
+    def get(self) -> AppConfig:
+        """Return the snapshot, reloading first if either file changed on disk."""
+
+        self.refresh()
+        return self._config
+
+    def refresh(self) -> bool:
+        """Reload when the files changed; returns True if a new snapshot was swapped in."""
+
+        signature = self._file_signatures()
+        if signature == self._signature:
+            return False
+
+        with self._lock:
+            if signature == self._signature:
+                return False
+            try:
+                file_config = _load_file_config(self._settings_path, self._secret_path)
+                config = self._resolve(file_config)
+            except (OSError, ValueError, TypeError, yaml.YAMLError):
+                logger.exception(
+                    "Config reload failed; keeping previous snapshot",
+                    extra={"path": str(self._settings_path)},
+                )
+                # Remember the broken signature so we do not re-parse it every poll.
+                self._signature = signature
+                return False
+            self._signature = signature
+            self._file_config = file_config
+            self._config = config
+            listeners = list(self._listeners)
+
+        logger.info("Config reloaded", extra={"path": str(self._settings_path)})
+        _notify(listeners, config)
+        return True
+
+    def set_overrides(self, overrides: Mapping[str, Any]) -> AppConfig:
+        """Replace the explicit override layer and swap in the re-resolved snapshot."""
+
+        with self._lock:
+            previous = self._overrides
+            self._overrides = dict(overrides)
+            try:
+                config = self._resolve(self._file_config)
+            except ValueError:
+                self._overrides = previous
+                raise
+            self._config = config
+            listeners = list(self._listeners)
+
+        _notify(listeners, config)
+        return config
+
+    def subscribe(self, listener: ConfigListener) -> Callable[[], None]:
+        """Register a callback for new snapshots; returns an unsubscribe function."""
+
+        with self._lock:
+            self._listeners.append(listener)
+
+        def _unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return _unsubscribe
+
+    def start_watching(self, interval_seconds: float = 2.0) -> None:
+        """Poll the config files from a daemon thread until `stop_watching()`."""
+
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_event.clear()
+
+        def _watch() -> None:
+            while not self._stop_event.wait(interval_seconds):
+                self.refresh()
+
+        self._watcher = threading.Thread(target=_watch, name="config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _file_signatures(self) -> tuple[_FileSignature, _FileSignature]:
+        return _file_signature(self._settings_path), _file_signature(self._secret_path)
+
+    def _resolve(self, file_config: AppConfig) -> AppConfig:
+        return resolve_config(file_config, environ=self._environ, overrides=self._overrides)
+
+
+def _notify(listeners: Iterable[ConfigListener], config: AppConfig) -> None:
+    for listener in listeners:
+        try:
+            listener(config)
+        except Exception:  # noqa: BLE001 - one bad listener must not block the others
+            logger.exception("Config listener failed")
+
+
+_PROVIDERS: Dict[tuple[str, str], ConfigProvider] = {}
+_PROVIDERS_LOCK = threading.Lock()
+
+
+def get_config(
+    settings_path: str | Path = "config/settings.yaml",
+    secret_path: str | Path = "secret",
+) -> AppConfig:
+    """Memoized variant of `load_config` shared by every caller in the process.
+
+    Files are only re-parsed when their mtime/inode/size signature changes.
+    """
+
+    return get_config_provider(settings_path, secret_path).get()
+
+
+def get_config_provider(
+    settings_path: str | Path = "config/settings.yaml",
+    secret_path: str | Path = "secret",
+) -> ConfigProvider:
+    """Return the process-wide provider for the given file pair."""
+
+    key = (str(Path(settings_path).resolve()), str(Path(secret_path).resolve()))
+    with _PROVIDERS_LOCK:
+        provider = _PROVIDERS.get(key)
+        if provider is None:
+            provider = ConfigProvider(settings_path, secret_path)
+            _PROVIDERS[key] = provider
+        return provider
+
+
+def _file_signature(path: Path) -> _FileSignature:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_ino, stat.st_size
+
+
+_SECTION_NAMES = frozenset(item.name for item in fields(AppConfig))
+
+
+@lru_cache(maxsize=None)
+def _field_types(section_cls: type) -> Dict[str, Any]:
+    return typing.get_type_hints(section_cls)
+
+
+def _coerce_value(raw: Any, annotation: Any, key: str) -> Any:
+    target_types = typing.get_args(annotation) if _is_union(annotation) else (annotation,)
+    optional = type(None) in target_types
+    concrete = [item for item in target_types if item is not type(None)]
+
+    if raw is None or (optional and isinstance(raw, str) and raw.strip().lower() in _NULL_VALUES):
+        if optional:
+            return None
+        raise ValueError(f"Override {key!r} does not accept null")
+
+    target = concrete[0] if concrete else str
+    if not isinstance(raw, str):
+        if isinstance(raw, target) and not (target is int and isinstance(raw, bool)):
+            return raw
+        raw = str(raw)
+
+    text = raw.strip()
+    try:
+        if target is bool:
+            lowered = text.lower()
+            if lowered in _TRUE_VALUES:
+                return True
+            if lowered in _FALSE_VALUES:
+                return False
+            raise ValueError(text)
+        if target is int:
+            return int(text)
+        if target is float:
+            return float(text)
+    except ValueError as exc:
+        raise ValueError(f"Override {key!r} expects {target.__name__}, got {raw!r}") from exc
+    return text
+
+
+def _is_union(annotation: Any) -> bool:
+    return typing.get_origin(annotation) in (typing.Union, types.UnionType)
+
+
 def _load_settings_yaml(path: Path) -> Dict[str, Any]:
     if not path.exists():
         logger.warning("Config file not found; using defaults", extra={"path": str(path)})
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import re
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, Tuple
-
-from langgraph.graph import END, START, StateGraph
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Tuple
+from uuid import uuid4
 
 from src.agents.planner import PlannerAgent
 from src.agents.researcher import (
@@ -14,11 +17,18 @@ from src.agents.researcher import (
     ResearcherError,
     ResearcherResult,
 )
-from src.config.configuration import AppConfig
+from src.config.configuration import AppConfig, ConfigProvider
 
 from .state import GraphState
-from src.models.plan import Plan, PlanStep, ResearchNote, StepStatus
-from src.report.markdown import render_report
+from src.models.plan import Plan, PlanStep, StepStatus
+from src.report.document import aggregate_plan, build_document
+from src.report.markdown import ReportRenderCache
+from src.report.renderers import get_renderer, parse_formats, render_document, write_document
+from src.tools.dedup import NearDuplicateIndex
+from src.tools.singleflight import coalescing_scope
+
+if TYPE_CHECKING:
+    from src.jobs.broker import ResearchBroker
 
 # Ordered tuple describing the canonical node pipeline of the research agent.
 STANDARD_NODES: Tuple[str, ...] = (
@@ -31,6 +41,10 @@ STANDARD_NODES: Tuple[str, ...] = (
 
 ReviewHandler = Callable[[GraphState], tuple[str, str]]
 
+# Near-duplicate indexes kept for in-flight runs; aborted runs never reach the
+# reporter that drops theirs, so the oldest are evicted past this bound.
+_MAX_RUN_DEDUP_INDEXES = 32
+
 
 def initial_state(topic: str, *, locale: str, metadata: Dict[str, Any] | None = None) -> GraphState:
     """Bootstrap the LangGraph runtime state prior to invoking the coordinator node."""
@@ -44,40 +58,103 @@ def build_graph(
     planner_agent: PlannerAgent | None = None,
     review_handler: ReviewHandler | None = None,
     researcher_agent: ResearcherAgent | None = None,
+    config_provider: ConfigProvider | None = None,
+    broker: ResearchBroker | None = None,
 ) -> Any:
-    """Construct the LangGraph state machine for coordinator→planner→human_review→reporter."""
+    """Construct the LangGraph state machine for coordinator→planner→human_review→reporter.
+
+    When `config_provider` is given, every node reads the provider's current
+    snapshot so hot-reloaded limits apply to the next node execution, and the
+    agents are subscribed to config swaps.
 
+    With a `broker` (or `runtime.broker_url`), researcher steps are shipped
+    to workers as serialized `ResearchContext` payloads instead of running
+    in this process; orchestration stays here.
+    """
+
+    # langgraph is by far the most expensive import; defer it until a graph is built.
+    from langgraph.graph import END, START, StateGraph
+
+    # Unknown formats raise ValueError here rather than after all research ran.
+    parse_formats(configuration.runtime.report_formats)
     agent = planner_agent or PlannerAgent(configuration)
     researcher = researcher_agent or ResearcherAgent(configuration)
     handler = review_handler or _default_review_handler
+    if broker is None and configuration.runtime.broker_url:
+        from src.jobs.broker import create_broker
+
+        broker = create_broker(configuration.runtime.broker_url, agent=researcher)
     graph = StateGraph(GraphState)
 
+    def settings() -> AppConfig:
+        return config_provider.current if config_provider is not None else configuration
+
+    # One index per run, grown by each step's kept notes (the researcher adds
+    # them as it deduplicates), instead of re-fingerprinting every prior note
+    # on every step. The graph is reused across worker jobs, hence the run id.
+    dedup_indexes: OrderedDict[str, NearDuplicateIndex] = OrderedDict()
+    dedup_lock = threading.Lock()
+
+    def run_dedup_index(current: GraphState) -> NearDuplicateIndex:
+        run_id = current.metadata.setdefault("run_id", uuid4().hex)
+        with dedup_lock:
+            index = dedup_indexes.get(run_id)
+            if index is not None:
+                dedup_indexes.move_to_end(run_id)
+                return index
+            # Seeded once per run and process, e.g. when resuming a saved state.
+            index = NearDuplicateIndex.from_notes(
+                note for candidate in current.plan.steps for note in candidate.notes
+            )
+            dedup_indexes[run_id] = index
+            while len(dedup_indexes) > _MAX_RUN_DEDUP_INDEXES:
+                dedup_indexes.popitem(last=False)
+            return index
+
+    if config_provider is not None:
+        for component in (agent, researcher):
+            update = getattr(component, "update_config", None)
+            if callable(update):
+                config_provider.subscribe(update)
+
     def _coordinator(state: GraphState | Dict[str, Any]) -> Dict[str, Any]:
         current = _ensure_state(state)
+        cfg = settings()
         if not current.locale:
-            current.locale = configuration.runtime.locale
+            current.locale = cfg.runtime.locale
         current.metadata.setdefault("context", current.metadata.get("context", ""))
         current.metadata.setdefault("review_log", [])
+        current.metadata.setdefault("run_id", uuid4().hex)
         return current.model_dump()
 
     def _planner(state: GraphState | Dict[str, Any]) -> Dict[str, Any]:
         current = _ensure_state(state)
+        cfg = settings()
         context = current.metadata.get("context")
-        plan = agent.generate_plan(
-            current.topic,
-            locale=current.locale or configuration.runtime.locale,
-            context=context,
-        )
+        with coalescing_scope() as coalesced:
+            plan = agent.generate_plan(
+                current.topic,
+                locale=current.locale or cfg.runtime.locale,
+                context=context,
+            )
+        if coalesced.total:
+            current.metadata["planner_coalesced_calls"] = (
+                current.metadata.get("planner_coalesced_calls", 0) + coalesced.total
+            )
         current.plan = plan
-        current.pending_human_review = configuration.runtime.human_review
-        current.metadata.setdefault("planner_model", configuration.models.planner)
+        current.pending_human_review = cfg.runtime.human_review
+        current.metadata.setdefault("planner_model", cfg.models.planner)
+        prompt_ids = getattr(agent, "prompt_ids", None)
+        if prompt_ids:
+            current.metadata["planner_prompts"] = list(prompt_ids)
         current.metadata.pop("last_review_action", None)
         return current.model_dump()
 
     def _human_review(state: GraphState | Dict[str, Any]) -> Dict[str, Any]:
         current = _ensure_state(state)
+        cfg = settings()
 
-        if not configuration.runtime.human_review:
+        if not cfg.runtime.human_review:
             current.metadata["last_review_action"] = "ACCEPT_PLAN"
             current.pending_human_review = False
             return current.model_dump()
@@ -105,6 +182,7 @@ def build_graph(
 
     def _researcher(state: GraphState | Dict[str, Any]) -> Dict[str, Any]:
         current = _ensure_state(state)
+        cfg = settings()
 
         if current.plan is None:
             current.metadata.setdefault("researcher_status", "missing_plan")
@@ -121,26 +199,37 @@ def build_graph(
         plan_metadata = current.plan.metadata if current.plan else None
         budget_tokens = getattr(plan_metadata, "budget_tokens", None) if plan_metadata else None
         budget_cost = getattr(plan_metadata, "budget_cost_usd", None) if plan_metadata else None
+        # The index cannot travel with a brokered step; workers rebuild it from the notes.
+        shipped = broker is not None
+        prior_notes = [note for candidate in current.plan.steps for note in candidate.notes] if shipped else []
         context = ResearchContext(
             topic=current.topic,
-            locale=current.locale or configuration.runtime.locale,
+            locale=current.locale or cfg.runtime.locale,
             step=step,
-            max_results=configuration.search.max_queries,
-            timeout_seconds=configuration.search.timeout_seconds,
+            max_results=cfg.search.max_queries,
+            timeout_seconds=cfg.search.timeout_seconds,
+            query_expansions=cfg.search.query_expansions,
+            prior_notes=prior_notes,
             budget_tokens_remaining=budget_tokens,
             budget_cost_limit=budget_cost,
             degradation_hint=current.metadata.get("researcher_degradation"),
+            dedup_index=None if shipped else run_dedup_index(current),
         )
 
         try:
-            result = researcher.run_step(context)
+            if broker is not None:
+                result = broker.run(context, timeout=cfg.runtime.broker_timeout_seconds)
+            else:
+                result = researcher.run_step(context)
         except ResearcherError as exc:
             current.plan.mark_step_status(step.id, StepStatus.BLOCKED)
             current.metadata.setdefault("researcher_errors", []).append(str(exc))
             current.metadata.setdefault("researcher_status", "blocked")
             return current.model_dump()
 
-        _apply_research_results(current, step, result)
+        _apply_research_results(
+            current, step, result, scratchpad_limit=cfg.runtime.scratchpad_limit
+        )
         _update_researcher_metrics(current, step, result)
         current.plan.mark_step_status(step.id, StepStatus.COMPLETED)
         current.metadata.setdefault("researcher_status", "completed_step")
@@ -159,15 +248,42 @@ def build_graph(
 
     def _reporter(state: GraphState | Dict[str, Any]) -> Dict[str, Any]:
         current = _ensure_state(state)
+        cfg = settings()
+        with dedup_lock:
+            dedup_indexes.pop(current.metadata.get("run_id", ""), None)
         current.metadata.setdefault("reporter_placeholder", True)
-        summary = _build_reporter_summary(current)
+        # One traversal feeds both the summary and every renderer.
+        aggregate = aggregate_plan(current.plan)
+        summary = aggregate.summary(current.metadata.get("researcher_metrics"))
         current.metadata["reporter_summary"] = summary
         if current.plan is not None:
-            current.metadata["report_markdown"] = render_report(
-                current.plan,
-                summary=summary,
-                locale=current.locale or configuration.runtime.locale,
+            locale = current.locale or cfg.runtime.locale
+            document = build_document(
+                current.plan, summary=summary, locale=locale, aggregate=aggregate
             )
+            if cfg.runtime.report_dir:
+                # Write to disk and keep only the paths in state so reports
+                # are not copied through every later model_dump. The bundle
+                # embeds report.md, so formats of this one report share the
+                # rendered Markdown sections; nothing is kept across runs.
+                report_cache = ReportRenderCache()
+                base_path = _report_path(Path(cfg.runtime.report_dir), current.topic)
+                report_paths = {
+                    fmt: str(
+                        write_document(
+                            document,
+                            base_path.with_name(base_path.name + get_renderer(fmt).extension),
+                            fmt,
+                            cache=report_cache,
+                        )
+                    )
+                    for fmt in parse_formats(cfg.runtime.report_formats) or ["markdown"]
+                }
+                current.metadata["report_paths"] = report_paths
+                current.metadata["report_path"] = next(iter(report_paths.values()))
+                current.metadata.pop("report_markdown", None)
+            else:
+                current.metadata["report_markdown"] = render_document(document, "markdown")
         return current.model_dump()
 
     graph.add_node("coordinator", _coordinator)
@@ -231,6 +347,12 @@ def _utc_timestamp() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _report_path(report_dir: Path, topic: str) -> Path:
+    slug = re.sub(r"[^\w-]+", "-", topic.strip().lower()).strip("-")[:48] or "report"
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    return report_dir / f"{stamp}-{slug}"
+
+
 def _select_next_step(plan: Plan, current_step_id: str | None) -> PlanStep | None:
     if current_step_id:
         try:
@@ -248,58 +370,19 @@ def _select_next_step(plan: Plan, current_step_id: str | None) -> PlanStep | Non
 
 
 def _apply_research_results(
-    state: GraphState, step: PlanStep, result: ResearcherResult
+    state: GraphState, step: PlanStep, result: ResearcherResult, *, scratchpad_limit: int
 ) -> None:
     if state.plan is None:
         return
 
     notes = result.notes
     references = result.references
+    owner = state.plan.get_step(step.id)
 
     for idx, note in enumerate(notes):
         reference = references[idx] if idx < len(references) else None
         state.plan.append_note(step.id, note, reference=reference)
-        state.add_scratchpad_note(note)
-
-
-def _build_reporter_summary(state: GraphState) -> Dict[str, Any]:
-    plan = state.plan
-    if plan is None:
-        return {
-            "total_notes": 0,
-            "average_confidence": None,
-            "low_confidence": [],
-            "researcher_metrics": state.metadata.get("researcher_metrics"),
-        }
-
-    note_entries: List[tuple[str, ResearchNote]] = []
-    for step in plan.steps:
-        for note in step.notes:
-            note_entries.append((step.id, note))
-
-    total_notes = len(note_entries)
-    confidences = [note.confidence for _, note in note_entries if note.confidence is not None]
-    average_confidence = (
-        sum(confidences) / len(confidences) if confidences else None
-    )
-
-    low_confidence = [
-        {
-            "step_id": step_id,
-            "claim": note.claim,
-            "confidence": note.confidence,
-        }
-        for step_id, note in note_entries
-        if note.confidence is not None and note.confidence < 0.6
-    ]
-
-    summary = {
-        "total_notes": total_notes,
-        "average_confidence": average_confidence,
-        "low_confidence": low_confidence,
-        "researcher_metrics": state.metadata.get("researcher_metrics"),
-    }
-    return summary
+        state.add_scratchpad_note(step.id, len(owner.notes) - 1, limit=scratchpad_limit)
 
 
 def _update_researcher_metrics(
@@ -330,15 +413,21 @@ def _update_researcher_metrics(
         {
             "step_id": step.id,
             "query": result.query,
+            "query_count": len(result.queries) or 1,
             "note_count": len(result.notes),
             "duration_seconds": duration,
             "result_count": result_count,
+            "local_hits": result.local_hits,
+            "coalesced_queries": result.coalesced_queries,
             "applied_max_results": result.applied_max_results,
             "applied_max_notes": result.applied_max_notes,
             "degradation_mode": result.degradation_mode,
         }
     )
 
+    if result.coalesced_queries:
+        metrics["total_coalesced"] = metrics.get("total_coalesced", 0) + result.coalesced_queries
+
     if result.degradation_mode:
         modes = metrics.setdefault("degradation_modes", [])
         if result.degradation_mode not in modes:
@@ -8,6 +8,15 @@ from pydantic import BaseModel, Field
 
 from src.models.plan import Plan, ResearchNote
 
+DEFAULT_SCRATCHPAD_LIMIT = 200
+
+
+class NoteRef(BaseModel):
+    """Pointer to a note held on a plan step: `plan.get_step(step_id).notes[index]`."""
+
+    step_id: str = Field(..., description="Identifier of the step owning the note")
+    index: int = Field(..., ge=0, description="Position of the note within the step's notes")
+
 
 class GraphState(BaseModel):
     """Normalized state object exchanged between LangGraph nodes."""
@@ -18,9 +27,13 @@ class GraphState(BaseModel):
     current_step_id: Optional[str] = Field(
         default=None, description="Identifier of the step currently being executed"
     )
-    scratchpad: List[ResearchNote] = Field(
+    scratchpad: List[NoteRef] = Field(
         default_factory=list,
-        description="Cross-step insights aggregated for reporter synthesis",
+        description="References to the most recent cross-step notes, oldest first",
+    )
+    scratchpad_evicted: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Per-step count of references dropped once the scratchpad hit its cap",
     )
     pending_human_review: bool = Field(
         default=False, description="Flag indicating the graph is awaiting human feedback"
@@ -29,14 +42,46 @@ class GraphState(BaseModel):
         default_factory=dict, description="Additional contextual payload shared across nodes"
     )
 
-    def add_scratchpad_note(self, note: ResearchNote | dict) -> None:
-        """Append a note to the cross-step scratchpad."""
+    def add_scratchpad_note(
+        self, step_id: str, index: int, *, limit: int = DEFAULT_SCRATCHPAD_LIMIT
+    ) -> None:
+        """Reference `plan.get_step(step_id).notes[index]` from the cross-step scratchpad.
+
+        The note itself stays on its step, so it is stored and serialized once.
+        When more than `limit` references accumulate the oldest are evicted and
+        tallied per step in `scratchpad_evicted`.
+        """
+
+        self.scratchpad.append(NoteRef(step_id=step_id, index=index))
+        overflow = len(self.scratchpad) - max(limit, 0)
+        if overflow > 0:
+            for ref in self.scratchpad[:overflow]:
+                self.scratchpad_evicted[ref.step_id] = self.scratchpad_evicted.get(ref.step_id, 0) + 1
+            del self.scratchpad[:overflow]
+
+    def resolve_note(self, ref: NoteRef) -> ResearchNote | None:
+        """Look up the note a reference points at, or None if it no longer exists."""
+
+        if self.plan is None:
+            return None
+        try:
+            notes = self.plan.get_step(ref.step_id).notes
+        except KeyError:
+            return None
+        return notes[ref.index] if ref.index < len(notes) else None
+
+    def scratchpad_notes(self) -> List[ResearchNote]:
+        """Resolve the scratchpad to notes in insertion order, skipping stale references."""
 
-        if isinstance(note, dict):
-            research_note = ResearchNote(**note)
-        else:
-            research_note = note
-        self.scratchpad.append(research_note)
+        if self.plan is None:
+            return []
+        steps = {step.id: step.notes for step in self.plan.steps}
+        resolved: List[ResearchNote] = []
+        for ref in self.scratchpad:
+            notes = steps.get(ref.step_id)
+            if notes is not None and ref.index < len(notes):
+                resolved.append(notes[ref.index])
+        return resolved
 
     def mark_for_review(self, reason: str | None = None) -> None:
         """Toggle human-review flag and capture optional reason in metadata."""
@@ -0,0 +1,294 @@
+"""Brokers that ship Researcher steps to workers and gather their results.
+
+The graph stays the single orchestrator; only `ResearchContext` payloads
+travel. A broker turns a context into a task (`submit`), and later returns
+the matching `ResearcherResult` (`wait`). Task ids are content hashes of the
+serialized context, so submitting the same step again—after a timeout or a
+retried graph node—reuses the existing task instead of running it twice.
+Failed tasks are not reused: resubmitting them runs the step again.
+
+Backends are chosen by URL scheme via `create_broker`:
+
+- ``inprocess://`` runs steps on a local thread pool (tests, single host).
+- ``sqlite://output/jobs/queue.sqlite`` enqueues on a `JobQueue` drained by
+  `scripts/run_workers.py run --role steps` processes on the same host
+  (SQLite WAL mode does not work over network filesystems). Relative paths
+  are resolved against the project root, like the workers' default queue;
+  ``sqlite:///abs/path/queue.sqlite`` names an absolute path.
+
+Network transports register additional schemes with `register_broker`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+from urllib.parse import urlsplit
+
+from src.agents.researcher import ResearchContext, ResearcherAgent, ResearcherError, ResearcherResult
+from src.models.plan import PlanStep, ResearchNote
+
+from .queue import DONE, FAILED, Job, JobQueue
+
+RESEARCH_STEP_JOB = "research_step"
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+class BrokerTimeout(ResearcherError):
+    """Raised when a dispatched step does not finish within the timeout."""
+
+
+def context_to_payload(context: ResearchContext) -> Dict[str, Any]:
+    """Serialize a context to JSON-compatible data.
+
+    `dedup_index` is not shipped; workers rebuild it from `prior_notes`.
+    """
+
+    return {
+        "topic": context.topic,
+        "locale": context.locale,
+        "step": context.step.model_dump(mode="json"),
+        "max_results": context.max_results,
+        "timeout_seconds": context.timeout_seconds,
+        "max_notes": context.max_notes,
+        "query_expansions": context.query_expansions,
+        "scratchpad": [note.model_dump(mode="json") for note in context.scratchpad],
+        "prior_notes": [note.model_dump(mode="json") for note in context.prior_notes],
+        "budget_tokens_remaining": context.budget_tokens_remaining,
+        "budget_cost_limit": context.budget_cost_limit,
+        "degradation_hint": context.degradation_hint,
+    }
+
+
+def context_from_payload(payload: Dict[str, Any]) -> ResearchContext:
+    data = dict(payload)
+    data["step"] = PlanStep.model_validate(data["step"])
+    data["scratchpad"] = [ResearchNote.model_validate(item) for item in data.get("scratchpad", [])]
+    data["prior_notes"] = [ResearchNote.model_validate(item) for item in data.get("prior_notes", [])]
+    return ResearchContext(**data)
+
+
+def result_to_payload(result: ResearcherResult) -> Dict[str, Any]:
+    return {
+        "query": result.query,
+        "notes": [note.model_dump(mode="json") for note in result.notes],
+        "references": list(result.references),
+        "duration_seconds": result.duration_seconds,
+        "total_results": result.total_results,
+        "applied_max_results": result.applied_max_results,
+        "applied_max_notes": result.applied_max_notes,
+        "degradation_mode": result.degradation_mode,
+        "queries": list(result.queries),
+        "local_hits": result.local_hits,
+        "coalesced_queries": result.coalesced_queries,
+    }
+
+
+def result_from_payload(payload: Dict[str, Any]) -> ResearcherResult:
+    data = dict(payload)
+    data["notes"] = [ResearchNote.model_validate(item) for item in data.get("notes", [])]
+    return ResearcherResult(**data)
+
+
+def task_key(payload: Dict[str, Any]) -> str:
+    """Stable id for a serialized context (same step + inputs → same task)."""
+
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return f"{RESEARCH_STEP_JOB}:{hashlib.sha256(encoded.encode('utf-8')).hexdigest()}"
+
+
+class ResearchBroker(ABC):
+    """Dispatches research steps and collects their results."""
+
+    @abstractmethod
+    def submit(self, context: ResearchContext) -> str:
+        """Start (or re-attach to) the task for `context`; returns its id."""
+
+    @abstractmethod
+    def wait(self, task_id: str, *, timeout: float | None = None) -> ResearcherResult:
+        """Block until the task finishes; raises `ResearcherError` on failure."""
+
+    def run(self, context: ResearchContext, *, timeout: float | None = None) -> ResearcherResult:
+        return self.wait(self.submit(context), timeout=timeout)
+
+    def run_many(
+        self, contexts: Sequence[ResearchContext], *, timeout: float | None = None
+    ) -> List[ResearcherResult]:
+        """Submit every context up front, then gather results in order."""
+
+        task_ids = [self.submit(context) for context in contexts]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        return [
+            self.wait(task_id, timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+            for task_id in task_ids
+        ]
+
+    def close(self) -> None:
+        """Release broker resources."""
+
+    def __enter__(self) -> "ResearchBroker":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class InProcessBroker(ResearchBroker):
+    """Runs steps on a local thread pool, round-tripping payloads like a remote broker."""
+
+    def __init__(self, agent: ResearcherAgent, *, max_workers: int = 4) -> None:
+        self._agent = agent
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="broker")
+        self._tasks: Dict[str, Future] = {}
+
+    def submit(self, context: ResearchContext) -> str:
+        payload = context_to_payload(context)
+        key = task_key(payload)
+        if key not in self._tasks:
+            self._tasks[key] = self._executor.submit(self._execute, payload)
+        return key
+
+    def wait(self, task_id: str, *, timeout: float | None = None) -> ResearcherResult:
+        future = self._tasks[task_id]
+        try:
+            payload = future.result(timeout=timeout)
+        except FutureTimeoutError as exc:
+            raise BrokerTimeout(f"Task {task_id} did not finish within {timeout}s") from exc
+        except ResearcherError:
+            # Let a later submit of the same context retry instead of replaying the failure.
+            self._tasks.pop(task_id, None)
+            raise
+        return result_from_payload(payload)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _execute(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return result_to_payload(self._agent.run_step(context_from_payload(payload)))
+
+
+class SQLiteBroker(ResearchBroker):
+    """Ships steps through a shared `JobQueue` file to out-of-process workers."""
+
+    def __init__(
+        self,
+        queue_path: str,
+        *,
+        max_attempts: int = 3,
+        poll_interval: float = 0.2,
+    ) -> None:
+        self._queue = JobQueue(queue_path)
+        self._max_attempts = max_attempts
+        self._poll_interval = poll_interval
+
+    def submit(self, context: ResearchContext) -> str:
+        payload = context_to_payload(context)
+        key = task_key(payload)
+        # A step that already failed is retried with a fresh job, as InProcessBroker does.
+        job_id = self._queue.enqueue(
+            RESEARCH_STEP_JOB,
+            payload,
+            max_attempts=self._max_attempts,
+            idempotency_key=key,
+            retry_failed=True,
+        )
+        return str(job_id)
+
+    def wait(self, task_id: str, *, timeout: float | None = None) -> ResearcherResult:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self._queue.get(int(task_id))
+            if job is None:
+                raise ResearcherError(f"Unknown broker task {task_id}")
+            if job.status == DONE:
+                return result_from_payload(job.result)
+            if job.status == FAILED:
+                reason = (job.error or "unknown error").splitlines()[0]
+                raise ResearcherError(f"Remote research step failed: {reason}")
+            if deadline is not None and time.monotonic() >= deadline:
+                raise BrokerTimeout(f"Task {task_id} did not finish within {timeout}s")
+            time.sleep(self._poll_interval)
+
+    def close(self) -> None:
+        self._queue.close()
+
+
+BrokerFactory = Callable[..., ResearchBroker]
+_BROKERS: Dict[str, BrokerFactory] = {}
+
+
+def register_broker(scheme: str, factory: BrokerFactory) -> None:
+    """Register `factory(url, **options)` for broker URLs with `scheme`."""
+
+    _BROKERS[scheme] = factory
+
+
+def create_broker(url: str, **options: Any) -> ResearchBroker:
+    """Build a broker from a URL such as ``inprocess://`` or ``sqlite://output/jobs/queue.sqlite``."""
+
+    scheme = urlsplit(url).scheme
+    factory = _BROKERS.get(scheme)
+    if factory is None:
+        raise ValueError(f"Unsupported broker URL {url!r}; known schemes: {', '.join(sorted(_BROKERS))}")
+    return factory(url, **options)
+
+
+def _inprocess_factory(url: str, *, agent: ResearcherAgent, **options: Any) -> ResearchBroker:
+    return InProcessBroker(agent, **options)
+
+
+def _sqlite_factory(url: str, **options: Any) -> ResearchBroker:
+    options.pop("agent", None)
+    return SQLiteBroker(sqlite_url_path(url), **options)
+
+
+def sqlite_url_path(url: str) -> Path:
+    """Queue path of a ``sqlite://`` URL; relative paths are under the project root."""
+
+    # sqlite:///abs/path keeps the leading slash; sqlite://rel/path is relative.
+    path = Path(url[len("sqlite://") :])
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+register_broker("inprocess", _inprocess_factory)
+register_broker("sqlite", _sqlite_factory)
+
+
+def research_step_handler_factory() -> Callable[[Job], Dict[str, Any]]:
+    """Worker-side handler: run shipped contexts with a process-local agent."""
+
+    from src.config.configuration import get_config_provider
+
+    provider = get_config_provider()
+    agent = ResearcherAgent(provider.current)
+    provider.subscribe(agent.update_config)
+    provider.start_watching()
+
+    def handle(job: Job) -> Dict[str, Any]:
+        return result_to_payload(agent.run_step(context_from_payload(job.payload)))
+
+    return handle
+
+
+__all__ = [
+    "BrokerTimeout",
+    "InProcessBroker",
+    "RESEARCH_STEP_JOB",
+    "ResearchBroker",
+    "SQLiteBroker",
+    "context_from_payload",
+    "context_to_payload",
+    "create_broker",
+    "register_broker",
+    "research_step_handler_factory",
+    "result_from_payload",
+    "result_to_payload",
+    "sqlite_url_path",
+    "task_key",
+]
@@ -0,0 +1,302 @@
+"""SQLite-backed job queue with lease/ack semantics.
+
+The queue lives in a single SQLite file (WAL mode) so any number of worker
+processes on one machine can share it without an external service. Workers
+`lease` a job for a bounded time, extend it with `heartbeat` while working,
+and finish with `ack` or `fail`. A lease that expires (for example because
+its worker crashed) makes the job available again until `max_attempts` is
+exhausted.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    idempotency_key TEXT UNIQUE,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_id ON jobs (status, id);
+"""
+
+
+@dataclass
+class Job:
+    """A leased (or inspected) unit of work."""
+
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    status: str
+    attempts: int
+    max_attempts: int
+    idempotency_key: str | None = None
+    lease_owner: str | None = None
+    lease_expires: float | None = None
+    result: Any = None
+    error: str | None = None
+
+
+class LeaseLostError(RuntimeError):
+    """Raised when a worker acts on a job whose lease it no longer holds."""
+
+
+class JobQueue:
+    """Durable FIFO queue shared by processes through one SQLite file."""
+
+    def __init__(self, path: str | Path, *, busy_timeout: float = 30.0) -> None:
+        self.path = Path(path)
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; write paths open explicit IMMEDIATE transactions so
+        # lease selection and update happen under one database write lock.
+        self._conn = sqlite3.connect(
+            str(path), timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> "JobQueue":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        *,
+        max_attempts: int = 3,
+        idempotency_key: str | None = None,
+        retry_failed: bool = False,
+    ) -> int:
+        """Add a job and return its id.
+
+        Re-enqueueing with an `idempotency_key` that already exists returns the
+        existing job id instead of creating a duplicate. With `retry_failed`, a
+        FAILED job gives up its key and a fresh job is enqueued in its place.
+        """
+
+        now = time.time()
+        with self._transaction() as conn:
+            if idempotency_key is not None:
+                row = conn.execute(
+                    "SELECT id, status FROM jobs WHERE idempotency_key = ?", (idempotency_key,)
+                ).fetchone()
+                if row is not None and not (retry_failed and row[1] == FAILED):
+                    return int(row[0])
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET idempotency_key = NULL, updated_at = ? WHERE id = ?",
+                        (now, row[0]),
+                    )
+            cursor = conn.execute(
+                "INSERT INTO jobs (kind, payload, status, max_attempts, idempotency_key, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, json.dumps(payload, ensure_ascii=False), QUEUED, max(1, max_attempts), idempotency_key, now, now),
+            )
+            return int(cursor.lastrowid)
+
+    def lease(
+        self,
+        owner: str,
+        *,
+        lease_seconds: float = 300.0,
+        kinds: Iterable[str] | None = None,
+    ) -> Optional[Job]:
+        """Claim the oldest available job for `owner`, or return None if idle."""
+
+        now = time.time()
+        kind_filter = list(kinds) if kinds is not None else None
+        with self._transaction() as conn:
+            self._recover_expired(conn, now)
+            query = "SELECT id FROM jobs WHERE status = ?"
+            params: List[Any] = [QUEUED]
+            if kind_filter:
+                query += f" AND kind IN ({','.join('?' for _ in kind_filter)})"
+                params.extend(kind_filter)
+            row = conn.execute(query + " ORDER BY id LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, updated_at = ? WHERE id = ?",
+                (LEASED, owner, now + lease_seconds, now, row[0]),
+            )
+            return self._fetch(conn, int(row[0]))
+
+    def heartbeat(self, job_id: int, owner: str, *, lease_seconds: float = 300.0) -> None:
+        """Extend a held lease; raises `LeaseLostError` if it expired or moved."""
+
+        now = time.time()
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (now + lease_seconds, now, job_id, LEASED, owner),
+            ).rowcount
+        if not updated:
+            raise LeaseLostError(f"Job {job_id} is no longer leased by {owner}")
+
+    def ack(self, job_id: int, owner: str, result: Any = None) -> None:
+        """Mark a leased job as done and store its JSON-serializable result."""
+
+        self._finish(job_id, owner, status=DONE, result=result, error=None)
+
+    def fail(self, job_id: int, owner: str, error: str, *, retry: bool = True) -> str:
+        """Release a leased job after an error; returns the job's new status."""
+
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = ? AND lease_owner = ?",
+                (job_id, LEASED, owner),
+            ).fetchone()
+            if row is None:
+                raise LeaseLostError(f"Job {job_id} is no longer leased by {owner}")
+            status = QUEUED if retry and row[0] < row[1] else FAILED
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, "
+                "updated_at = ? WHERE id = ?",
+                (status, error, time.time(), job_id),
+            )
+            return status
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self._lock:
+            return self._fetch(self._conn, job_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Return job counts per status (expired leases count as queued)."""
+
+        with self._transaction() as conn:
+            self._recover_expired(conn, time.time())
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {QUEUED: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update({status: int(count) for status, count in rows})
+        return counts
+
+    def pending(self, kinds: Iterable[str] | None = None) -> int:
+        """Jobs that are queued or still leased, optionally limited to `kinds`."""
+
+        if kinds is None:
+            counts = self.stats()
+            return counts[QUEUED] + counts[LEASED]
+        kind_list = list(kinds)
+        with self._transaction() as conn:
+            self._recover_expired(conn, time.time())
+            row = conn.execute(
+                f"SELECT COUNT(*) FROM jobs WHERE status IN (?, ?) "
+                f"AND kind IN ({','.join('?' for _ in kind_list)})",
+                [QUEUED, LEASED, *kind_list],
+            ).fetchone()
+        return int(row[0])
+
+    def _finish(self, job_id: int, owner: str, *, status: str, result: Any, error: str | None) -> None:
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (
+                    status,
+                    json.dumps(result, ensure_ascii=False, default=str),
+                    error,
+                    time.time(),
+                    job_id,
+                    LEASED,
+                    owner,
+                ),
+            ).rowcount
+        if not updated:
+            raise LeaseLostError(f"Job {job_id} is no longer leased by {owner}")
+
+    @staticmethod
+    def _recover_expired(conn: sqlite3.Connection, now: float) -> None:
+        conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END, "
+            "error = COALESCE(error, 'lease expired'), lease_owner = NULL, lease_expires = NULL, "
+            "updated_at = ? WHERE status = ? AND lease_expires < ?",
+            (FAILED, QUEUED, now, LEASED, now),
+        )
+
+    @staticmethod
+    def _fetch(conn: sqlite3.Connection, job_id: int) -> Optional[Job]:
+        row = conn.execute(
+            "SELECT id, kind, payload, status, attempts, max_attempts, idempotency_key, "
+            "lease_owner, lease_expires, result, error FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return Job(
+            id=row[0],
+            kind=row[1],
+            payload=json.loads(row[2]),
+            status=row[3],
+            attempts=row[4],
+            max_attempts=row[5],
+            idempotency_key=row[6],
+            lease_owner=row[7],
+            lease_expires=row[8],
+            result=json.loads(row[9]) if row[9] is not None else None,
+            error=row[10],
+        )
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self._conn, self._lock)
+
+
+class _Transaction:
+    """`BEGIN IMMEDIATE` … `COMMIT`/`ROLLBACK` guarded by the per-connection lock."""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock) -> None:
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+        return self._conn
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        try:
+            self._conn.execute("ROLLBACK" if exc_type is not None else "COMMIT")
+        finally:
+            self._lock.release()
+
+
+__all__ = ["DONE", "FAILED", "Job", "JobQueue", "LEASED", "LeaseLostError", "QUEUED"]
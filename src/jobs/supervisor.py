@@ -0,0 +1,285 @@
+"""Multi-process worker pool draining a `JobQueue`.
+
+Each worker process builds its own handler once (so every process owns its
+compiled graph, HTTP clients and caches) and then leases jobs in a loop.
+While a job runs, a heartbeat thread keeps its lease alive; if the process
+dies, the lease simply expires and another worker picks the job up.
+
+A handler may also define `flush()`, called whenever the queue runs dry, and
+`close()`, called once when the worker exits; handlers that batch output
+(such as archive appends) use them to commit what they buffered.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from .queue import Job, JobQueue, LeaseLostError
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Job], Any]
+# Must be a picklable top-level callable: it runs inside each spawned worker.
+HandlerFactory = Callable[[], JobHandler]
+
+
+@dataclass
+class WorkerOptions:
+    """Tuning shared by every worker process."""
+
+    lease_seconds: float = 300.0
+    poll_interval: float = 0.5
+    # Exit once the queue has had nothing to lease for this long (None = run forever).
+    idle_exit_seconds: float | None = None
+    max_jobs: int | None = None
+    # Only lease jobs of these kinds (None = any kind).
+    kinds: Tuple[str, ...] | None = None
+
+
+def worker_loop(
+    queue_path: str | Path,
+    handler_factory: HandlerFactory,
+    options: WorkerOptions,
+    stop_event: Any | None = None,
+    *,
+    worker_id: str | None = None,
+) -> int:
+    """Lease and run jobs until stopped, idle, or `max_jobs` is reached.
+
+    Returns the number of jobs this worker acknowledged.
+    """
+
+    owner = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    handler = handler_factory()
+    completed = 0
+    idle_since = time.monotonic()
+    dirty = False
+
+    try:
+        with JobQueue(queue_path) as queue:
+            while stop_event is None or not stop_event.is_set():
+                if options.max_jobs is not None and completed >= options.max_jobs:
+                    break
+                job = queue.lease(owner, lease_seconds=options.lease_seconds, kinds=options.kinds)
+                if job is None:
+                    if dirty:
+                        _call_hook(handler, "flush")
+                        dirty = False
+                    if (
+                        options.idle_exit_seconds is not None
+                        and time.monotonic() - idle_since >= options.idle_exit_seconds
+                    ):
+                        break
+                    time.sleep(options.poll_interval)
+                    continue
+
+                if _run_job(queue, job, owner, handler, options):
+                    completed += 1
+                dirty = True
+                idle_since = time.monotonic()
+    finally:
+        _call_hook(handler, "close")
+    return completed
+
+
+def _call_hook(handler: JobHandler, name: str) -> None:
+    hook = getattr(handler, name, None)
+    if callable(hook):
+        hook()
+
+
+def _run_job(queue: JobQueue, job: Job, owner: str, handler: JobHandler, options: WorkerOptions) -> bool:
+    done = threading.Event()
+
+    def heartbeat() -> None:
+        interval = max(options.lease_seconds / 3, 0.05)
+        while not done.wait(interval):
+            try:
+                queue.heartbeat(job.id, owner, lease_seconds=options.lease_seconds)
+            except LeaseLostError:
+                logger.warning("Lost lease while running job", extra={"job_id": job.id})
+                return
+
+    beat = threading.Thread(target=heartbeat, name=f"job-{job.id}-heartbeat", daemon=True)
+    beat.start()
+    try:
+        result = handler(job)
+    except Exception as exc:  # noqa: BLE001 - any handler failure is recorded on the job
+        done.set()
+        beat.join()
+        message = f"{type(exc).__name__}: {exc}"
+        logger.warning("Job failed", extra={"job_id": job.id, "error": message})
+        try:
+            queue.fail(job.id, owner, message + "\n" + traceback.format_exc(limit=5))
+        except LeaseLostError:
+            pass
+        return False
+
+    done.set()
+    beat.join()
+    try:
+        queue.ack(job.id, owner, result)
+    except LeaseLostError:
+        # Another worker re-leased the job after our lease expired; its result wins.
+        return False
+    return True
+
+
+def _process_entry(
+    queue_path: str,
+    handler_factory: HandlerFactory,
+    options: WorkerOptions,
+    stop_event: Any,
+) -> None:
+    worker_loop(queue_path, handler_factory, options, stop_event)
+
+
+class WorkerCrashLoopError(RuntimeError):
+    """Raised when a worker keeps crashing right after being restarted."""
+
+
+class WorkerSupervisor:
+    """Spawn and babysit `processes` workers that drain one queue.
+
+    Workers that exit unexpectedly are restarted (their in-flight jobs come
+    back through lease expiry) after an exponential backoff starting at
+    `restart_backoff` seconds. A worker slot that crashes more than
+    `max_restarts` times in a row, each time within `stable_seconds` of
+    starting, makes `run` raise `WorkerCrashLoopError`; a broken config or
+    handler factory would otherwise respawn processes forever. With
+    `until_empty=True`, `run` returns once no job is queued or leased.
+    """
+
+    def __init__(
+        self,
+        queue_path: str | Path,
+        handler_factory: HandlerFactory,
+        *,
+        processes: int | None = None,
+        options: WorkerOptions | None = None,
+        start_method: str = "spawn",
+        max_restarts: int = 5,
+        restart_backoff: float = 1.0,
+        max_restart_backoff: float = 60.0,
+        stable_seconds: float = 60.0,
+    ) -> None:
+        self.queue_path = str(queue_path)
+        self.handler_factory = handler_factory
+        self.processes = max(1, processes or os.cpu_count() or 1)
+        self.options = options or WorkerOptions()
+        self._context = multiprocessing.get_context(start_method)
+        self._stop_event = self._context.Event()
+        self.max_restarts = max_restarts
+        self.restart_backoff = restart_backoff
+        self.max_restart_backoff = max_restart_backoff
+        self.stable_seconds = stable_seconds
+        self._workers: List[Any] = []
+        self._started_at: List[float] = []
+        self._crashes: List[int] = []
+        # Slot index -> monotonic time its crashed worker may be respawned.
+        self._restart_at: Dict[int, float] = {}
+        self.restarts = 0
+
+    def start(self) -> None:
+        self._stop_event.clear()
+        self._workers = [self._spawn() for _ in range(self.processes)]
+        now = time.monotonic()
+        self._started_at = [now] * self.processes
+        self._crashes = [0] * self.processes
+        self._restart_at = {}
+
+    def run(self, *, until_empty: bool = True, check_interval: float = 0.5) -> Dict[str, int]:
+        """Start workers and supervise them; returns final queue stats."""
+
+        self.start()
+        try:
+            with JobQueue(self.queue_path) as queue:
+                while True:
+                    pending = queue.pending(self.options.kinds)
+                    if until_empty and pending == 0:
+                        break
+                    self._restart_dead(has_work=pending > 0)
+                    time.sleep(check_interval)
+                return queue.stats()
+        finally:
+            self.stop()
+
+    def stop(self, *, timeout: float = 10.0) -> None:
+        self._stop_event.set()
+        deadline = time.monotonic() + timeout
+        for process in self._workers:
+            process.join(max(0.0, deadline - time.monotonic()))
+        for process in self._workers:
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._workers = []
+
+    def _spawn(self) -> Any:
+        process = self._context.Process(
+            target=_process_entry,
+            args=(self.queue_path, self.handler_factory, self.options, self._stop_event),
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def _restart_dead(self, *, has_work: bool) -> None:
+        if self._stop_event.is_set():
+            return
+        now = time.monotonic()
+        for index, process in enumerate(self._workers):
+            if process.is_alive():
+                continue
+            if index in self._restart_at:
+                if now >= self._restart_at[index]:
+                    del self._restart_at[index]
+                    logger.warning("Restarting crashed worker", extra={"slot": index})
+                    self.restarts += 1
+                    self._respawn(index, now)
+            elif process.exitcode != 0:
+                self._schedule_restart(index, process.exitcode, now)
+            elif has_work and not any(worker.is_alive() for worker in self._workers):
+                # Every worker left cleanly (idle/max_jobs) but jobs remain, e.g.
+                # leases of a crashed worker that are about to expire.
+                self._crashes[index] = 0
+                self._respawn(index, now)
+
+    def _schedule_restart(self, index: int, exitcode: int | None, now: float) -> None:
+        if now - self._started_at[index] >= self.stable_seconds:
+            self._crashes[index] = 0
+        self._crashes[index] += 1
+        crashes = self._crashes[index]
+        if crashes > self.max_restarts:
+            raise WorkerCrashLoopError(
+                f"Worker crashed {crashes} times in a row (last exit code {exitcode}); giving up"
+            )
+        delay = min(self.max_restart_backoff, self.restart_backoff * 2 ** (crashes - 1))
+        logger.warning(
+            "Worker crashed; restarting after backoff",
+            extra={"exitcode": exitcode, "slot": index, "crashes": crashes, "delay_seconds": delay},
+        )
+        self._restart_at[index] = now + delay
+
+    def _respawn(self, index: int, now: float) -> None:
+        self._workers[index] = self._spawn()
+        self._started_at[index] = now
+
+
+__all__ = [
+    "HandlerFactory",
+    "JobHandler",
+    "WorkerCrashLoopError",
+    "WorkerOptions",
+    "WorkerSupervisor",
+    "worker_loop",
+]
@@ -1,14 +1,39 @@
-"""Pydantic data models shared across Deep Research components."""
-
-from .plan import Plan, PlanMetadata, PlanStep, ResearchNote, StepStatus, StepType
-from .persistence import (
-    PlanRunRecord,
-    ResearcherCallLog,
-    ResearcherMetrics,
-    ReviewAction,
-    ReviewLogEntry,
-    RunTelemetry,
-)
+"""Pydantic data models shared across Deep Research components.
+
+Names are resolved lazily (PEP 562) so importing the package does not pull in
+pydantic until a model is actually used.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .plan import Plan, PlanMetadata, PlanStep, ResearchNote, StepStatus, StepType
+    from .persistence import (
+        PlanRunRecord,
+        ResearcherCallLog,
+        ResearcherMetrics,
+        ReviewAction,
+        ReviewLogEntry,
+        RunTelemetry,
+    )
+
+_EXPORTS = {
+    "Plan": ".plan",
+    "PlanMetadata": ".plan",
+    "PlanStep": ".plan",
+    "ResearchNote": ".plan",
+    "StepStatus": ".plan",
+    "StepType": ".plan",
+    "PlanRunRecord": ".persistence",
+    "ResearcherCallLog": ".persistence",
+    "ResearcherMetrics": ".persistence",
+    "ReviewAction": ".persistence",
+    "ReviewLogEntry": ".persistence",
+    "RunTelemetry": ".persistence",
+}
 
 __all__ = [
     "Plan",
@@ -24,3 +49,16 @@ __all__ = [
     "StepStatus",
     "StepType",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
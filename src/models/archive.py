@@ -0,0 +1,361 @@
+"""Read and write `PlanRunRecord` archives.
+
+Records are stored one JSON document per line. Encoding goes straight
+through pydantic-core (`model_dump_json`) instead of building an
+intermediate dict for `json.dumps`. Files ending in `.zst` hold
+zstd-compressed segments: every flush appends one independent frame, so an
+archive stays appendable and a crash can lose at most the unflushed tail.
+`zstandard` is optional; without it only plain JSONL archives are available.
+
+`ArchiveWriter` is the multi-process entry point: every batch is committed
+with one `O_APPEND` write while holding an advisory lock, the active file is
+rotated into numbered segments by size or age, and a JSON manifest records
+per-segment counts. Readers walk every numbered segment on disk with
+`iter_archive`, so a lost manifest never hides records.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Tuple
+
+from .persistence import PlanRunRecord
+
+ZSTD_SUFFIX = ".zst"
+
+DEFAULT_SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+
+try:  # POSIX advisory locking; elsewhere only threads in one process are serialized.
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+def dumps_record(record: PlanRunRecord) -> bytes:
+    """Serialize a record to a single UTF-8 JSON line (without the newline)."""
+
+    return record.model_dump_json().encode("utf-8")
+
+
+def loads_record(line: bytes | str) -> PlanRunRecord:
+    """Parse and validate one archived line."""
+
+    return PlanRunRecord.model_validate_json(line)
+
+
+def is_compressed(path: str | Path) -> bool:
+    return str(path).endswith(ZSTD_SUFFIX)
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise RuntimeError(
+            "Reading or writing .zst archives requires the optional 'zstandard' package"
+        ) from exc
+    return zstandard
+
+
+def iter_lines(path: str | Path) -> Iterator[Tuple[int, bytes]]:
+    """Yield `(line_number, payload)` for every non-blank line in an archive."""
+
+    archive = Path(path)
+    with archive.open("rb") as raw:
+        stream: IO[bytes] = raw
+        if is_compressed(archive):
+            reader = _zstd().ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+            stream = io.BufferedReader(reader)
+        for line_number, line in enumerate(stream, start=1):
+            payload = line.strip()
+            if payload:
+                yield line_number, payload
+
+
+def iter_records(path: str | Path) -> Iterator[PlanRunRecord]:
+    """Yield validated records, raising on the first malformed line."""
+
+    for _, payload in iter_lines(path):
+        yield loads_record(payload)
+
+
+def append_record(path: str | Path, record: PlanRunRecord) -> None:
+    """Append and durably sync a single record, safe against concurrent writers."""
+
+    with ArchiveWriter(path, buffer_records=1) as writer:
+        writer.write(record)
+
+
+def manifest_path(path: str | Path) -> Path:
+    active = Path(path)
+    return active.with_name(f"{active.name}.manifest.json")
+
+
+def read_manifest(path: str | Path) -> Dict[str, Any]:
+    """Return the manifest for the archive whose active file is `path`."""
+
+    target = manifest_path(path)
+    if not target.exists():
+        return {"active_created_at": None, "segments": []}
+    return json.loads(target.read_text(encoding="utf-8"))
+
+
+def archive_segments(path: str | Path) -> List[Path]:
+    """Closed segments in rotation order followed by the active file, if present.
+
+    Segments are discovered on disk rather than trusted from the manifest, so
+    a segment whose rotation crashed before the manifest was rewritten (or an
+    archive whose manifest was lost) is still read.
+    """
+
+    active = Path(path)
+    existing = [segment for _, segment in _closed_segments(active)]
+    if active.exists():
+        existing.append(active)
+    return existing
+
+
+def iter_archive(path: str | Path) -> Iterator[Tuple[Path, int, bytes]]:
+    """Yield `(segment, line_number, payload)` across every segment of an archive."""
+
+    for segment in archive_segments(path):
+        for line_number, payload in iter_lines(segment):
+            yield segment, line_number, payload
+
+
+class ArchiveWriter:
+    """Append-only archive writer that is safe across threads and processes.
+
+    Encoded records are held in memory until `buffer_records` accumulate
+    (or `flush`/`close` is called). Each flush takes an exclusive `flock` on
+    a sidecar `.lock` file, rotates the active file when it exceeds
+    `max_bytes` or is older than `max_age_seconds`, and commits the whole
+    batch with a single `O_APPEND` write (one zstd frame for compressed
+    archives) followed by `fsync`, so lines from different workers never
+    interleave. Pass `max_bytes=None` for a plain buffered appender that
+    never rotates.
+    """
+
+    _thread_locks: Dict[Path, threading.Lock] = {}
+    _thread_locks_guard = threading.Lock()
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        buffer_records: int = 64,
+        max_bytes: int | None = DEFAULT_SEGMENT_MAX_BYTES,
+        max_age_seconds: float | None = None,
+        compression_level: int = 3,
+    ) -> None:
+        self.path = Path(path).resolve()
+        self.compress = is_compressed(self.path)
+        self._buffer_records = max(1, buffer_records)
+        self._max_bytes = max_bytes
+        self._max_age_seconds = max_age_seconds
+        self._compressor = (
+            _zstd().ZstdCompressor(level=compression_level) if self.compress else None
+        )
+        self._pending: List[bytes] = []
+        self._closed = False
+        self.records_written = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with ArchiveWriter._thread_locks_guard:
+            self._thread_lock = ArchiveWriter._thread_locks.setdefault(self.path, threading.Lock())
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def write(self, record: PlanRunRecord | bytes) -> None:
+        if self._closed:
+            raise ValueError("ArchiveWriter is closed")
+        self._pending.append(record if isinstance(record, bytes) else dumps_record(record))
+        if len(self._pending) >= self._buffer_records:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        data = b"\n".join(self._pending) + b"\n"
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        with self._locked():
+            manifest = self._read_manifest()
+            if self._should_rotate(manifest):
+                self._rotate(manifest)
+            if not self.path.exists():
+                manifest["active_records"] = 0
+            if manifest.get("active_created_at") is None or not self.path.exists():
+                manifest["active_created_at"] = _utc_now()
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                _write_all(fd, data)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            manifest["active_records"] = manifest.get("active_records", 0) + len(self._pending)
+            self._write_manifest(manifest)
+        self.records_written += len(self._pending)
+        self._pending = []
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._closed = True
+
+    def rotate(self) -> Path | None:
+        """Force the active file into a closed segment; returns the segment path."""
+
+        with self._locked():
+            return self._rotate(self._read_manifest())
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        manifest = read_manifest(self.path)
+        if manifest.get("active_records") is None:
+            # An active file written before the manifest existed (plain appends)
+            # already holds records; count them once so segment totals add up.
+            manifest["active_records"] = (
+                sum(1 for _ in iter_lines(self.path)) if self.path.exists() else 0
+            )
+        listed = {item["name"] for item in manifest["segments"]}
+        orphans = [segment for _, segment in _closed_segments(self.path) if segment.name not in listed]
+        if orphans:
+            # Rotated but never recorded: re-list them so totals stay complete.
+            for segment in orphans:
+                manifest["segments"].append(
+                    {
+                        "name": segment.name,
+                        "records": sum(1 for _ in iter_lines(segment)),
+                        "bytes": segment.stat().st_size,
+                        "created_at": None,
+                        "closed_at": None,
+                    }
+                )
+            manifest["segments"].sort(key=lambda item: _segment_sequence(self.path, item["name"]))
+        return manifest
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        lock_path = self.path.with_name(f"{self.path.name}.lock")
+        with self._thread_lock, lock_path.open("a+b") as lock_handle:
+            if fcntl is not None:
+                fcntl.flock(lock_handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_handle.fileno(), fcntl.LOCK_UN)
+
+    def _should_rotate(self, manifest: Dict[str, Any]) -> bool:
+        if not self.path.exists():
+            return False
+        if self._max_bytes is not None and self.path.stat().st_size >= self._max_bytes:
+            return True
+        created = manifest.get("active_created_at")
+        if self._max_age_seconds is not None and created:
+            age = datetime.now(timezone.utc) - datetime.fromisoformat(created)
+            return age.total_seconds() >= self._max_age_seconds
+        return False
+
+    def _rotate(self, manifest: Dict[str, Any]) -> Path | None:
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return None
+        # Number from the segments on disk, not the manifest: a lost or stale
+        # manifest must never make a rotation overwrite an existing segment.
+        closed = _closed_segments(self.path)
+        sequence = (closed[-1][0] if closed else 0) + 1
+        stem, suffix = _split_archive_name(self.path.name)
+        segment = self.path.with_name(f"{stem}.{sequence:05d}{suffix}")
+        if segment.exists():
+            raise FileExistsError(f"Refusing to overwrite archive segment {segment}")
+        os.replace(self.path, segment)
+        manifest["segments"].append(
+            {
+                "name": segment.name,
+                "records": manifest.get("active_records"),
+                "bytes": segment.stat().st_size,
+                "created_at": manifest.get("active_created_at"),
+                "closed_at": _utc_now(),
+            }
+        )
+        manifest["active_created_at"] = None
+        manifest["active_records"] = 0
+        self._write_manifest(manifest)
+        return segment
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        target = manifest_path(self.path)
+        tmp_path = target.with_name(f".{target.name}.tmp")
+        tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, target)
+
+
+def _split_archive_name(name: str) -> Tuple[str, str]:
+    for suffix in (".jsonl.zst", ".jsonl"):
+        if name.endswith(suffix):
+            return name[: -len(suffix)], suffix
+    stem, dot, ext = name.rpartition(".")
+    return (stem, dot + ext) if dot else (name, "")
+
+
+def _segment_pattern(active: Path) -> re.Pattern[str]:
+    stem, suffix = _split_archive_name(active.name)
+    return re.compile(rf"{re.escape(stem)}\.(\d{{5,}}){re.escape(suffix)}")
+
+
+def _segment_sequence(active: Path, name: str) -> int:
+    match = _segment_pattern(active).fullmatch(name)
+    return int(match.group(1)) if match else 0
+
+
+def _closed_segments(active: Path) -> List[Tuple[int, Path]]:
+    """`(sequence, path)` for every rotated segment of `active`, in order."""
+
+    if not active.parent.is_dir():
+        return []
+    pattern = _segment_pattern(active)
+    found = []
+    for entry in active.parent.iterdir():
+        match = pattern.fullmatch(entry.name)
+        if match:
+            found.append((int(match.group(1)), entry))
+    return sorted(found)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+__all__ = [
+    "ArchiveWriter",
+    "append_record",
+    "archive_segments",
+    "dumps_record",
+    "is_compressed",
+    "iter_archive",
+    "iter_lines",
+    "iter_records",
+    "loads_record",
+    "manifest_path",
+    "read_manifest",
+]
@@ -39,6 +39,9 @@ class ResearcherCallLog(BaseModel):
 
     step_id: str = Field(..., description="Step identifier associated with the query")
     query: str = Field(..., description="Concrete Tavily query text")
+    query_count: Optional[int] = Field(
+        default=None, ge=1, description="Number of expanded queries dispatched for the step"
+    )
     note_count: int = Field(..., ge=0, description="Number of research notes captured")
     duration_seconds: Optional[float] = Field(
         default=None, ge=0.0, description="Wall-clock duration for the research call"
@@ -46,6 +49,12 @@ class ResearcherCallLog(BaseModel):
     result_count: Optional[int] = Field(
         default=None, ge=0, description="Total Tavily results returned for the query"
     )
+    local_hits: Optional[int] = Field(
+        default=None, ge=0, description="Results served by the local BM25 index"
+    )
+    coalesced_queries: Optional[int] = Field(
+        default=None, ge=0, description="Searches that shared an identical in-flight request"
+    )
     applied_max_results: Optional[int] = Field(
         default=None, ge=1, description="Effective Tavily max_results after degradation"
     )
@@ -68,6 +77,9 @@ class ResearcherMetrics(BaseModel):
     total_results: Optional[int] = Field(
         default=None, ge=0, description="Total Tavily results retrieved across calls"
     )
+    total_coalesced: Optional[int] = Field(
+        default=None, ge=0, description="Searches coalesced onto in-flight requests across calls"
+    )
     degradation_modes: List[str] = Field(
         default_factory=list,
         description="Distinct degradation modes applied during the run",
@@ -83,6 +95,12 @@ class RunTelemetry(BaseModel):
     researcher: Optional[ResearcherMetrics] = Field(
         default=None, description="Researcher execution statistics"
     )
+    planner_coalesced_calls: Optional[int] = Field(
+        default=None, ge=0, description="Planner LLM calls that shared an identical in-flight request"
+    )
+    planner_prompt_ids: List[str] = Field(
+        default_factory=list, description="Versioned prompt ids (name@hash) the planner sent"
+    )
 
 
 class PlanRunRecord(BaseModel):
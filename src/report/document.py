@@ -0,0 +1,191 @@
+"""Format-neutral report representation shared by every renderer."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Tuple
+
+from src.models.plan import Plan, ResearchNote
+from src.tools.dedup import canonicalize_url
+
+
+@dataclass(frozen=True)
+class ReportNote:
+    """A research note paired with its citation number (None when unsourced)."""
+
+    note: ResearchNote
+    citation: int | None
+
+
+@dataclass(frozen=True)
+class ReportStep:
+    """One plan step as it appears in the report."""
+
+    index: int
+    id: str
+    title: str
+    expected_outcome: str
+    status: str
+    notes: Tuple[ReportNote, ...]
+
+
+@dataclass(frozen=True)
+class ReportDocument:
+    """Everything a renderer needs, computed once per run.
+
+    Citations are numbered here in first-seen order over canonical URLs, so
+    Markdown, JSON, HTML and bundle outputs all agree on numbering without
+    re-walking the plan.
+    """
+
+    plan: Plan
+    topic: str
+    goal: str
+    locale: str | None
+    steps: Tuple[ReportStep, ...]
+    citations: Tuple[Tuple[int, str], ...]
+    telemetry: Mapping[str, Any] | None = None
+    low_confidence: Tuple[Mapping[str, Any], ...] = ()
+    summary: Mapping[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable structure for machine consumers."""
+
+        return {
+            "topic": self.topic,
+            "goal": self.goal,
+            "locale": self.locale,
+            "steps": [
+                {
+                    "index": step.index,
+                    "id": step.id,
+                    "title": step.title,
+                    "expected_outcome": step.expected_outcome,
+                    "status": step.status,
+                    "notes": [
+                        {**item.note.model_dump(mode="json"), "citation": item.citation}
+                        for item in step.notes
+                    ],
+                }
+                for step in self.steps
+            ],
+            "citations": [{"index": index, "source": source} for index, source in self.citations],
+            "telemetry": dict(self.telemetry) if self.telemetry else None,
+            "low_confidence": [dict(item) for item in self.low_confidence],
+        }
+
+
+LOW_CONFIDENCE_THRESHOLD = 0.6
+
+
+@dataclass(frozen=True)
+class PlanAggregate:
+    """Totals, confidence stats and the citation index from one plan traversal."""
+
+    steps: Tuple[ReportStep, ...]
+    citations: Tuple[Tuple[int, str], ...]
+    total_notes: int
+    average_confidence: float | None
+    low_confidence: Tuple[Dict[str, Any], ...]
+    step_note_counts: Dict[str, int]
+
+    def summary(self, researcher_metrics: Mapping[str, Any] | None = None) -> Dict[str, Any]:
+        """Return the reporter summary payload stored in graph metadata."""
+
+        return {
+            "total_notes": self.total_notes,
+            "average_confidence": self.average_confidence,
+            "low_confidence": [dict(item) for item in self.low_confidence],
+            "step_note_counts": dict(self.step_note_counts),
+            "researcher_metrics": researcher_metrics,
+        }
+
+
+def aggregate_plan(
+    plan: Plan | None, *, low_confidence_threshold: float = LOW_CONFIDENCE_THRESHOLD
+) -> PlanAggregate:
+    """Walk every step and note exactly once, collecting all reporter inputs."""
+
+    seen: Dict[str, int] = {}
+    citations: List[Tuple[int, str]] = []
+    steps: List[ReportStep] = []
+    low_confidence: List[Dict[str, Any]] = []
+    step_note_counts: Dict[str, int] = {}
+    total_notes = 0
+    confidence_sum = 0.0
+    confidence_count = 0
+
+    for index, step in enumerate(plan.steps if plan is not None else (), start=1):
+        notes: List[ReportNote] = []
+        for note in step.notes:
+            confidence = note.confidence
+            if confidence is not None:
+                confidence_sum += confidence
+                confidence_count += 1
+                if confidence < low_confidence_threshold:
+                    low_confidence.append(
+                        {"step_id": step.id, "claim": note.claim, "confidence": confidence}
+                    )
+
+            source = note.source.strip() if note.source else ""
+            number: int | None = None
+            if source:
+                key = canonicalize_url(source)
+                number = seen.get(key)
+                if number is None:
+                    number = len(citations) + 1
+                    seen[key] = number
+                    citations.append((number, source))
+            notes.append(ReportNote(note=note, citation=number))
+
+        total_notes += len(notes)
+        step_note_counts[step.id] = len(notes)
+        steps.append(
+            ReportStep(
+                index=index,
+                id=step.id,
+                title=step.title,
+                expected_outcome=step.expected_outcome,
+                status=step.status.value,
+                notes=tuple(notes),
+            )
+        )
+
+    return PlanAggregate(
+        steps=tuple(steps),
+        citations=tuple(citations),
+        total_notes=total_notes,
+        average_confidence=confidence_sum / confidence_count if confidence_count else None,
+        low_confidence=tuple(low_confidence),
+        step_note_counts=step_note_counts,
+    )
+
+
+def build_document(
+    plan: Plan,
+    *,
+    summary: Mapping[str, Any] | None = None,
+    locale: str | None = None,
+    aggregate: PlanAggregate | None = None,
+) -> ReportDocument:
+    """Assemble the shared report representation from a plan and summary.
+
+    Pass the `aggregate` already computed for the summary to avoid walking
+    the plan a second time.
+    """
+
+    summary = summary or {}
+    if aggregate is None:
+        aggregate = aggregate_plan(plan)
+
+    return ReportDocument(
+        plan=plan,
+        topic=plan.topic,
+        goal=plan.goal,
+        locale=locale,
+        steps=aggregate.steps,
+        citations=aggregate.citations,
+        telemetry=summary.get("researcher_metrics"),
+        low_confidence=tuple(summary.get("low_confidence") or ()),
+        summary=summary,
+    )
@@ -2,9 +2,56 @@
 
 from __future__ import annotations
 
-from typing import Any, Iterable, Mapping, Sequence
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence, TextIO, Tuple, TypeVar
 
 from src.models.plan import Plan, PlanStep, ResearchNote
+from src.tools.dedup import canonicalize_url
+
+_T = TypeVar("_T")
+# (canonical key, displayed source) pairs in note order for one step.
+StepSources = Tuple[Tuple[str, str], ...]
+
+
+class ReportRenderCache:
+    """Bounded LRU cache of rendered report sections keyed by content hash.
+
+    Step sections are keyed by their position plus a hash of the step's
+    serialized content (title, outcome, status, notes), and the telemetry
+    block by a hash of its payload, so rendering the same document again
+    (the Markdown file and the bundle's `report.md`) reuses every section.
+    Sections that changed are rendered afresh.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_render(self, key: str, render: Callable[[], _T]) -> _T:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        value = render()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
 
 
 def render_report(
@@ -12,42 +59,155 @@ def render_report(
     *,
     summary: Mapping[str, Any] | None = None,
     locale: str | None = None,
+    cache: ReportRenderCache | None = None,
+    citations: Sequence[Tuple[int, str]] | None = None,
 ) -> str:
     """Render a lightweight Markdown report from the plan and telemetry summary."""
 
-    lines: list[str] = []
+    return "".join(
+        iter_report(plan, summary=summary, locale=locale, cache=cache, citations=citations)
+    )
+
+
+def write_report(
+    plan: Plan,
+    destination: str | Path | TextIO,
+    *,
+    summary: Mapping[str, Any] | None = None,
+    locale: str | None = None,
+    cache: ReportRenderCache | None = None,
+    citations: Sequence[Tuple[int, str]] | None = None,
+) -> int:
+    """Stream the report into a file path or writable text handle.
+
+    Sections are written as they are produced, so memory stays flat no
+    matter how many steps and notes the plan holds. Paths are written to a
+    sibling temp file and renamed into place so readers never observe a
+    partial report. Returns the number of characters written.
+    """
+
+    chunks = iter_report(plan, summary=summary, locale=locale, cache=cache, citations=citations)
+    if not isinstance(destination, (str, Path)):
+        return _write_chunks(chunks, destination)
+
+    path = Path(destination)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            written = _write_chunks(chunks, handle)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return written
+
+
+def iter_report(
+    plan: Plan,
+    *,
+    summary: Mapping[str, Any] | None = None,
+    locale: str | None = None,
+    cache: ReportRenderCache | None = None,
+    citations: Sequence[Tuple[int, str]] | None = None,
+) -> Iterator[str]:
+    """Yield the report as newline-terminated lines, one section at a time.
+
+    With a `cache`, unchanged step and telemetry sections are reused and
+    yielded as whole-section chunks instead of being re-rendered. Pass
+    precomputed `citations` (e.g. from a `ReportDocument`) to skip
+    re-deriving the citation index.
+    """
+
     title_locale = f" ({locale})" if locale else ""
-    lines.append(f"# Research Report: {plan.topic}{title_locale}")
-    lines.append("")
-    lines.append(f"**Goal:** {plan.goal}")
+    yield f"# Research Report: {plan.topic}{title_locale}\n"
+    yield "\n"
+    yield f"**Goal:** {plan.goal}\n"
 
     telemetry = (summary or {}).get("researcher_metrics") if summary else None
     low_confidence = (summary or {}).get("low_confidence", []) if summary else []
 
-    lines.extend(_render_telemetry_section(telemetry))
-    lines.extend(_render_plan_section(plan.steps))
+    if cache is None:
+        sections: list[Iterable[str]] = [
+            _render_telemetry_section(telemetry),
+            _render_plan_section(plan.steps),
+        ]
+        if low_confidence:
+            sections.append(_render_low_confidence_section(low_confidence))
+        sections.append(_render_citation_section(plan.steps, citations=citations))
+
+        for section in sections:
+            for line in section:
+                yield line + "\n"
+        return
+
+    yield cache.get_or_render(
+        f"telemetry:{_content_hash(json.dumps(telemetry, sort_keys=True, default=str))}",
+        lambda: _join_lines(_render_telemetry_section(telemetry)),
+    )
+
+    yield _join_lines(_render_plan_header(plan.steps))
+    step_sources: list[StepSources] = []
+    for index, step in enumerate(plan.steps, start=1):
+        text, sources = cache.get_or_render(
+            f"step:{index}:{_content_hash(step.model_dump_json())}",
+            lambda index=index, step=step: (
+                _join_lines(_render_step(index, step)),
+                _step_sources(step),
+            ),
+        )
+        step_sources.append(sources)
+        yield text
 
     if low_confidence:
-        lines.append("## Low Confidence Notes")
-        for item in low_confidence:
-            confidence = item.get("confidence")
-            formatted = (
-                f"- Step `{item.get('step_id')}`: {item.get('claim')} (confidence: {confidence:.2f})"
-                if isinstance(confidence, (int, float))
-                else f"- Step `{item.get('step_id')}`: {item.get('claim')}"
-            )
-            lines.append(formatted)
-
-    citations = _collect_citations(plan.steps)
-    if citations:
-        lines.append("")
-        lines.append("## Citations")
-        lines.append("| # | Source |")
-        lines.append("| --- | --- |")
-        for index, source in citations:
-            lines.append(f"| {index} | {source} |")
+        yield _join_lines(_render_low_confidence_section(low_confidence))
+    yield _join_lines(
+        _render_citation_section(plan.steps, step_sources=step_sources, citations=citations)
+    )
+
+
+def _join_lines(lines: Iterable[str]) -> str:
+    return "".join(line + "\n" for line in lines)
+
+
+def _content_hash(payload: str) -> str:
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
 
-    return "\n".join(lines).rstrip() + "\n"
+
+def _write_chunks(chunks: Iterable[str], handle: TextIO) -> int:
+    written = 0
+    for chunk in chunks:
+        handle.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def _render_low_confidence_section(low_confidence: Sequence[Mapping[str, Any]]) -> Iterator[str]:
+    yield "## Low Confidence Notes"
+    for item in low_confidence:
+        confidence = item.get("confidence")
+        yield (
+            f"- Step `{item.get('step_id')}`: {item.get('claim')} (confidence: {confidence:.2f})"
+            if isinstance(confidence, (int, float))
+            else f"- Step `{item.get('step_id')}`: {item.get('claim')}"
+        )
+
+
+def _render_citation_section(
+    steps: Sequence[PlanStep],
+    *,
+    step_sources: Sequence[StepSources] | None = None,
+    citations: Sequence[Tuple[int, str]] | None = None,
+) -> Iterator[str]:
+    if citations is None:
+        citations = _collect_citations(steps, step_sources=step_sources)
+    if not citations:
+        return
+    yield ""
+    yield "## Citations"
+    yield "| # | Source |"
+    yield "| --- | --- |"
+    for index, source in citations:
+        yield f"| {index} | {source} |"
 
 
 def _render_telemetry_section(telemetry: Mapping[str, Any] | None) -> list[str]:
@@ -94,24 +254,28 @@ def _render_telemetry_section(telemetry: Mapping[str, Any] | None) -> list[str]:
     return lines
 
 
-def _render_plan_section(steps: Sequence[PlanStep]) -> list[str]:
-    lines: list[str] = []
-    lines.append("")
-    lines.append("## Findings by Step")
+def _render_plan_section(steps: Sequence[PlanStep]) -> Iterator[str]:
+    yield from _render_plan_header(steps)
+    for index, step in enumerate(steps, start=1):
+        yield from _render_step(index, step)
+
+
+def _render_plan_header(steps: Sequence[PlanStep]) -> Iterator[str]:
+    yield ""
+    yield "## Findings by Step"
     if not steps:
-        lines.append("No plan steps available.")
-        return lines
+        yield "No plan steps available."
 
-    for index, step in enumerate(steps, start=1):
-        lines.append("")
-        lines.append(f"### Step {index}: {step.title}")
-        lines.append(f"_Expected outcome:_ {step.expected_outcome}")
-        if not step.notes:
-            lines.append("- No notes captured.")
-            continue
-        for note in step.notes:
-            lines.extend(_render_note(note))
-    return lines
+
+def _render_step(index: int, step: PlanStep) -> Iterator[str]:
+    yield ""
+    yield f"### Step {index}: {step.title}"
+    yield f"_Expected outcome:_ {step.expected_outcome}"
+    if not step.notes:
+        yield "- No notes captured."
+        return
+    for note in step.notes:
+        yield from _render_note(note)
 
 
 def _render_note(note: ResearchNote) -> list[str]:
@@ -127,16 +291,29 @@ def _render_note(note: ResearchNote) -> list[str]:
     return parts
 
 
-def _collect_citations(steps: Sequence[PlanStep]) -> list[tuple[int, str]]:
+def _collect_citations(
+    steps: Sequence[PlanStep], *, step_sources: Sequence[StepSources] | None = None
+) -> list[tuple[int, str]]:
+    """Number distinct sources in first-seen order across all steps."""
+
     seen: dict[str, int] = {}
     ordered: list[tuple[int, str]] = []
     counter = 1
-    for step in steps:
-        for note in step.notes:
-            source = note.source.strip() if note.source else ""
-            if not source or source in seen:
+    per_step = step_sources if step_sources is not None else [_step_sources(step) for step in steps]
+    for sources in per_step:
+        for key, source in sources:
+            if key in seen:
                 continue
-            seen[source] = counter
+            seen[key] = counter
             ordered.append((counter, source))
             counter += 1
     return ordered
+
+
+def _step_sources(step: PlanStep) -> StepSources:
+    sources: list[tuple[str, str]] = []
+    for note in step.notes:
+        source = note.source.strip() if note.source else ""
+        if source:
+            sources.append((canonicalize_url(source), source))
+    return tuple(sources)
@@ -0,0 +1,225 @@
+"""Pluggable report renderers built on the shared `ReportDocument`."""
+
+from __future__ import annotations
+
+import gzip
+import html
+import io
+import json
+import os
+import tarfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+from urllib.parse import urlsplit
+
+from .document import ReportDocument
+from .markdown import ReportRenderCache, render_report, write_report
+
+# Called as `render(document, cache=...)`; only Markdown uses the section cache.
+RenderFunction = Callable[..., "str | bytes"]
+_LINKABLE_SCHEMES = frozenset({"http", "https"})
+
+
+@dataclass(frozen=True)
+class Renderer:
+    """A named output format and the function that produces it."""
+
+    name: str
+    extension: str
+    render: RenderFunction
+    binary: bool = False
+
+
+_RENDERERS: Dict[str, Renderer] = {}
+
+
+def register_renderer(
+    name: str, *, extension: str, binary: bool = False
+) -> Callable[[RenderFunction], RenderFunction]:
+    """Decorator registering `func` as the renderer for format `name`."""
+
+    def decorator(func: RenderFunction) -> RenderFunction:
+        _RENDERERS[name] = Renderer(name=name, extension=extension, render=func, binary=binary)
+        return func
+
+    return decorator
+
+
+def get_renderer(name: str) -> Renderer:
+    try:
+        return _RENDERERS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown report format {name!r}; available: {', '.join(available_formats())}"
+        ) from None
+
+
+def available_formats() -> List[str]:
+    return sorted(_RENDERERS)
+
+
+def parse_formats(raw: str | Iterable[str]) -> List[str]:
+    """Split a comma-separated format list and validate every entry."""
+
+    items = raw.split(",") if isinstance(raw, str) else list(raw)
+    formats: List[str] = []
+    for item in items:
+        name = item.strip().lower()
+        if name and name not in formats:
+            get_renderer(name)
+            formats.append(name)
+    return formats
+
+
+def render_document(
+    document: ReportDocument, fmt: str, *, cache: ReportRenderCache | None = None
+) -> str | bytes:
+    """Render `document` as `fmt`; pass the graph's `cache` to reuse Markdown sections."""
+
+    return get_renderer(fmt).render(document, cache=cache)
+
+
+def write_document(
+    document: ReportDocument,
+    path: str | Path,
+    fmt: str,
+    *,
+    cache: ReportRenderCache | None = None,
+) -> Path:
+    """Render `document` as `fmt` and atomically write it to `path`."""
+
+    renderer = get_renderer(fmt)
+    target = Path(path)
+    if renderer.name == "markdown":
+        # Markdown streams section by section instead of materializing the report.
+        write_report(
+            document.plan,
+            target,
+            summary=document.summary,
+            locale=document.locale,
+            cache=cache,
+            citations=document.citations,
+        )
+        return target
+
+    payload = renderer.render(document, cache=cache)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f".{target.name}.tmp")
+    try:
+        if renderer.binary:
+            tmp_path.write_bytes(payload)  # type: ignore[arg-type]
+        else:
+            tmp_path.write_text(payload, encoding="utf-8")  # type: ignore[arg-type]
+        os.replace(tmp_path, target)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return target
+
+
+@register_renderer("markdown", extension=".md")
+def render_markdown(document: ReportDocument, *, cache: ReportRenderCache | None = None) -> str:
+    return render_report(
+        document.plan,
+        summary=document.summary,
+        locale=document.locale,
+        cache=cache,
+        citations=document.citations,
+    )
+
+
+@register_renderer("json", extension=".json")
+def render_json(document: ReportDocument, *, cache: ReportRenderCache | None = None) -> str:
+    return json.dumps(document.as_dict(), ensure_ascii=False, indent=2, default=str)
+
+
+@register_renderer("html", extension=".html")
+def render_html(document: ReportDocument, *, cache: ReportRenderCache | None = None) -> str:
+    esc = html.escape
+    title_locale = f" ({esc(document.locale)})" if document.locale else ""
+    parts = [
+        "<!DOCTYPE html>",
+        f'<html lang="{esc(document.locale or "en")}">',
+        "<head>",
+        '<meta charset="utf-8">',
+        f"<title>Research Report: {esc(document.topic)}</title>",
+        "</head>",
+        "<body>",
+        f"<h1>Research Report: {esc(document.topic)}{title_locale}</h1>",
+        f"<p><strong>Goal:</strong> {esc(document.goal)}</p>",
+        "<h2>Findings by Step</h2>",
+    ]
+    if not document.steps:
+        parts.append("<p>No plan steps available.</p>")
+    for step in document.steps:
+        parts.append(f'<section id="{esc(step.id)}">')
+        parts.append(f"<h3>Step {step.index}: {esc(step.title)}</h3>")
+        parts.append(f"<p><em>Expected outcome:</em> {esc(step.expected_outcome)}</p>")
+        if not step.notes:
+            parts.append("<p>No notes captured.</p>")
+        else:
+            parts.append("<ul>")
+            for item in step.notes:
+                note = item.note
+                entry = f"<li><strong>{esc(note.claim)}</strong>"
+                if item.citation is not None:
+                    entry += f' <a href="#cite-{item.citation}">[{item.citation}]</a>'
+                if note.evidence:
+                    entry += f"<br>{esc(note.evidence)}"
+                if note.confidence is not None:
+                    entry += f"<br><small>Confidence: {note.confidence:.2f}</small>"
+                parts.append(entry + "</li>")
+            parts.append("</ul>")
+        parts.append("</section>")
+    if document.citations:
+        parts.append("<h2>Citations</h2>")
+        parts.append("<ol>")
+        for index, source in document.citations:
+            if _is_linkable(source):
+                parts.append(f'<li id="cite-{index}"><a href="{esc(source)}">{esc(source)}</a></li>')
+            else:
+                # javascript:, data: and other schemes from search results stay inert text.
+                parts.append(f'<li id="cite-{index}">{esc(source)}</li>')
+        parts.append("</ol>")
+    parts.extend(["</body>", "</html>"])
+    return "\n".join(parts) + "\n"
+
+
+@register_renderer("bundle", extension=".tar.gz", binary=True)
+def render_bundle(document: ReportDocument, *, cache: ReportRenderCache | None = None) -> bytes:
+    """Self-contained archive: Markdown + JSON report, citations and raw notes."""
+
+    notes = "".join(
+        json.dumps({"step_id": step.id, **item.note.model_dump(mode="json")}, ensure_ascii=False) + "\n"
+        for step in document.steps
+        for item in step.notes
+    )
+    members = {
+        "report.md": render_markdown(document, cache=cache),
+        "report.json": render_json(document),
+        "citations.json": json.dumps(
+            [{"index": index, "source": source} for index, source in document.citations],
+            ensure_ascii=False,
+            indent=2,
+        ),
+        "notes.jsonl": notes,
+    }
+
+    buffer = io.BytesIO()
+    # Zero mtimes keep archives byte-identical for identical documents.
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=6, mtime=0) as compressed:
+        with tarfile.open(fileobj=compressed, mode="w") as archive:
+            for name, text in members.items():
+                data = text.encode("utf-8")
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mtime = 0
+                archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def _is_linkable(source: str) -> bool:
+    try:
+        return urlsplit(source.strip()).scheme.lower() in _LINKABLE_SCHEMES
+    except ValueError:
+        return False
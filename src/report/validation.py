@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, List, Sequence
+from array import array
+from dataclasses import dataclass, field
+from typing import Annotated, Any, Dict, Iterable, List, Sequence, Union
 
 from src.models.plan import ResearchNote
-from pydantic import ValidationError
+from pydantic import Field, TypeAdapter
+
+# Validating the whole list in one call stays inside pydantic-core instead of
+# paying Python-level construction overhead per note. Entries that fail the
+# schema fall through to the `dict` arm, so one bad note never forces the
+# batch to be re-validated.
+_NOTE_LIST_ADAPTER = TypeAdapter(
+    List[Annotated[Union[ResearchNote, Dict[str, Any]], Field(union_mode="left_to_right")]]
+)
 
 
 @dataclass
@@ -27,21 +36,89 @@ class LowConfidenceFlag:
     claim: str
 
 
+@dataclass
+class NoteBatchReport:
+    """Columnar validation results for a batch of notes.
+
+    Index arrays point into `notes`; `low_confidence_values` is parallel to
+    `low_confidence`. `invalid` lists notes that failed schema validation and
+    were kept via `model_construct`.
+    """
+
+    notes: List[ResearchNote]
+    invalid: array = field(default_factory=lambda: array("I"))
+    missing_source: array = field(default_factory=lambda: array("I"))
+    missing_claim: array = field(default_factory=lambda: array("I"))
+    low_confidence: array = field(default_factory=lambda: array("I"))
+    low_confidence_values: array = field(default_factory=lambda: array("d"))
+
+    @property
+    def has_blocking_issues(self) -> bool:
+        return bool(self.missing_source or self.missing_claim)
+
+    def issues(self) -> List[ValidationIssue]:
+        """Expand the blocking index arrays into `ValidationIssue` objects in note order."""
+
+        expanded = [
+            ValidationIssue(index=idx, kind="missing_source", message="note.source is empty")
+            for idx in self.missing_source
+        ] + [
+            ValidationIssue(index=idx, kind="missing_claim", message="note.claim is empty")
+            for idx in self.missing_claim
+        ]
+        expanded.sort(key=lambda issue: issue.index)
+        return expanded
+
+    def low_confidence_flags(self) -> List[LowConfidenceFlag]:
+        return [
+            LowConfidenceFlag(index=idx, confidence=value, claim=getattr(self.notes[idx], "claim", ""))
+            for idx, value in zip(self.low_confidence, self.low_confidence_values)
+        ]
+
+
 def normalize_notes(notes: Iterable[ResearchNote | dict]) -> List[ResearchNote]:
     """Convert incoming notes into `ResearchNote` instances."""
 
-    normalized: List[ResearchNote] = []
-    for item in notes:
-        if isinstance(item, ResearchNote):
-            normalized.append(item)
-            continue
+    return _normalize_batch(list(notes))[0]
+
+
+def _normalize_batch(items: List[ResearchNote | dict]) -> tuple[List[ResearchNote], array]:
+    invalid = array("I")
+    normalized: List[ResearchNote] = _NOTE_LIST_ADAPTER.validate_python(items)
+    for idx, note in enumerate(normalized):
+        if type(note) is dict:
+            invalid.append(idx)
+            normalized[idx] = ResearchNote.model_construct(**note)
+    return normalized, invalid
+
+
+def validate_note_batch(
+    notes: Sequence[ResearchNote | dict],
+    *,
+    low_confidence_threshold: float = 0.6,
+) -> NoteBatchReport:
+    """Validate notes in bulk and return compact per-kind index arrays."""
+
+    normalized, invalid = _normalize_batch(list(notes))
+    report = NoteBatchReport(notes=normalized, invalid=invalid)
+    missing_source = report.missing_source.append
+    missing_claim = report.missing_claim.append
+    low_index = report.low_confidence.append
+    low_value = report.low_confidence_values.append
+
+    for idx, note in enumerate(normalized):
+        source = getattr(note, "source", None)
+        if not source or source.isspace():
+            missing_source(idx)
+        claim = getattr(note, "claim", None)
+        if not claim or claim.isspace():
+            missing_claim(idx)
+        confidence = getattr(note, "confidence", None)
+        if confidence is not None and confidence < low_confidence_threshold:
+            low_index(idx)
+            low_value(confidence)
 
-        payload = dict(item)
-        try:
-            normalized.append(ResearchNote(**payload))
-        except ValidationError:
-            normalized.append(ResearchNote.model_construct(**payload))
-    return normalized
+    return report
 
 
 def validate_notes(
@@ -56,38 +133,15 @@ def validate_notes(
     and surface low-confidence flags in the risk section or footnotes.
     """
 
-    normalized = normalize_notes(notes)
-    issues: List[ValidationIssue] = []
-    low_confidence: List[LowConfidenceFlag] = []
-
-    for idx, note in enumerate(normalized):
-        source = note.source.strip() if note.source else ""
-        if not source:
-            issues.append(
-                ValidationIssue(index=idx, kind="missing_source", message="note.source is empty")
-            )
-
-        claim = note.claim.strip() if note.claim else ""
-        if not claim:
-            issues.append(
-                ValidationIssue(index=idx, kind="missing_claim", message="note.claim is empty")
-            )
-
-        if note.confidence is not None and note.confidence < low_confidence_threshold:
-            low_confidence.append(
-                LowConfidenceFlag(
-                    index=idx,
-                    confidence=note.confidence,
-                    claim=note.claim,
-                )
-            )
-
-    return normalized, issues, low_confidence
+    report = validate_note_batch(notes, low_confidence_threshold=low_confidence_threshold)
+    return report.notes, report.issues(), report.low_confidence_flags()
 
 
 __all__ = [
     "ValidationIssue",
     "LowConfidenceFlag",
+    "NoteBatchReport",
     "normalize_notes",
+    "validate_note_batch",
     "validate_notes",
 ]
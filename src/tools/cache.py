@@ -0,0 +1,398 @@
+"""Response cache shared by the search and LLM tools.
+
+`ResponseCache` layers a small in-process LRU over an optional SQLite file
+(WAL mode) that every worker process on the host opens. Values are stored
+as JSON text, so a hit in one process is a hit for all of them. Misses are
+single-flighted: within a process concurrent callers for one key wait on a
+per-key lock, and across processes a short-lived row in the `flights` table
+elects one caller to hit the upstream while the others poll for its result.
+`aget_or_compute` applies the same cross-process election to coroutines
+(in-process coalescing stays with the callers' `SingleFlight`). Expired rows
+are purged from the SQLite file on write, at most once per `purge_interval`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS flights (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+# (encoded value, absolute expiry or None)
+_Entry = Tuple[str, float | None]
+
+
+def cache_key(namespace: str, *parts: Any) -> str:
+    """Stable key for `parts` (JSON-serializable) within `namespace`."""
+
+    encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return f"{namespace}:{hashlib.sha256(encoded.encode('utf-8')).hexdigest()}"
+
+
+@dataclass
+class CacheStats:
+    """Per-process counters; `shared_hits` were served by another process's work."""
+
+    hits: int = 0
+    shared_hits: int = 0
+    misses: int = 0
+    waits: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.shared_hits + self.misses
+        return (self.hits + self.shared_hits) / total if total else 0.0
+
+
+class LRUCache:
+    """Thread-safe LRU of encoded values with optional per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max(0, max_entries)
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, now: float) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: str, expires_at: float | None) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCacheStore:
+    """Cache entries and in-flight claims in one SQLite file shared by processes."""
+
+    def __init__(self, path: str | Path, *, busy_timeout: float = 30.0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, key: str, now: float) -> _Entry | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, now),
+            ).fetchone()
+        return (row[0], row[1]) if row is not None else None
+
+    def set(self, key: str, value: str, expires_at: float | None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, created_at) VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, time.time()),
+            )
+
+    def claim(self, key: str, owner: str, *, ttl: float) -> bool:
+        """Try to become the single caller computing `key`; expired claims are taken over."""
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM flights WHERE key = ? AND expires_at <= ?", (key, now))
+                claimed = self._conn.execute(
+                    "INSERT OR IGNORE INTO flights (key, owner, expires_at) VALUES (?, ?, ?)",
+                    (key, owner, now + ttl),
+                ).rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return bool(claimed)
+
+    def release(self, key: str, owner: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM flights WHERE key = ? AND owner = ?", (key, owner))
+
+    def purge_expired(self) -> int:
+        """Delete expired entries; returns how many were removed."""
+
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            ).rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+
+
+class ResponseCache:
+    """LRU front plus optional shared SQLite tier with single-flight misses."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        store: SQLiteCacheStore | None = None,
+        flight_timeout: float = 120.0,
+        poll_interval: float = 0.05,
+        purge_interval: float = 300.0,
+    ) -> None:
+        self.memory = LRUCache(max_entries)
+        self.store = store
+        self.flight_timeout = flight_timeout
+        self.poll_interval = poll_interval
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0  # the first write also clears rows left by earlier runs
+        self.stats = CacheStats()
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{id(self)}"
+        # key -> [lock, holders + waiters]; dropped once nobody references it.
+        self._key_locks: Dict[str, List[Any]] = {}
+        self._key_locks_guard = threading.Lock()
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        *,
+        ttl: float | None = None,
+    ) -> Any:
+        """Return the cached value for `key`, computing (once) and storing it on a miss.
+
+        `compute` must return a JSON-serializable value. Exceptions propagate
+        and are not cached; the next caller retries.
+        """
+
+        cached = self._lookup(key)
+        if cached is not None:
+            self.stats.hits += 1
+            return json.loads(cached)
+
+        with self._key_lock(key):
+            # Another thread may have filled the key while we waited on the lock.
+            cached = self._lookup(key)
+            if cached is not None:
+                self.stats.hits += 1
+                return json.loads(cached)
+            if self.store is None:
+                return self._compute_and_store(key, compute, ttl)
+            return self._shared_get_or_compute(key, compute, ttl)
+
+    async def aget_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        *,
+        ttl: float | None = None,
+    ) -> Any:
+        """Async `get_or_compute`: one process computes a missing key, others poll for it.
+
+        Callers coalesce identical in-process requests themselves (see
+        `SingleFlight.ado`); waiting on another process never blocks the loop.
+        """
+
+        cached = self._lookup(key)
+        if cached is not None:
+            self.stats.hits += 1
+            return json.loads(cached)
+        if self.store is None:
+            return await self._acompute_and_store(key, compute, ttl)
+
+        deadline = time.monotonic() + self.flight_timeout
+        waited = False
+        while True:
+            if self.store.claim(key, self._owner, ttl=self.flight_timeout):
+                try:
+                    # The previous owner may have finished between our lookup and claim.
+                    hit, value = self._shared_lookup(key)
+                    if hit:
+                        return value
+                    return await self._acompute_and_store(key, compute, ttl)
+                finally:
+                    self.store.release(key, self._owner)
+
+            if not waited:
+                waited = True
+                self.stats.waits += 1
+            await asyncio.sleep(self.poll_interval)
+            hit, value = self._shared_lookup(key)
+            if hit:
+                return value
+            if time.monotonic() >= deadline:
+                logger.warning("Cache single-flight wait timed out", extra={"key": key})
+                return await self._acompute_and_store(key, compute, ttl)
+
+    def close(self) -> None:
+        if self.store is not None:
+            self.store.close()
+
+    def _shared_get_or_compute(self, key: str, compute: Callable[[], Any], ttl: float | None) -> Any:
+        assert self.store is not None
+        deadline = time.monotonic() + self.flight_timeout
+        waited = False
+        while True:
+            if self.store.claim(key, self._owner, ttl=self.flight_timeout):
+                try:
+                    # The previous owner may have finished between our lookup and claim.
+                    hit, value = self._shared_lookup(key)
+                    if hit:
+                        return value
+                    return self._compute_and_store(key, compute, ttl)
+                finally:
+                    self.store.release(key, self._owner)
+
+            if not waited:
+                waited = True
+                self.stats.waits += 1
+            time.sleep(self.poll_interval)
+            hit, value = self._shared_lookup(key)
+            if hit:
+                return value
+            if time.monotonic() >= deadline:
+                logger.warning("Cache single-flight wait timed out", extra={"key": key})
+                return self._compute_and_store(key, compute, ttl)
+
+    def _compute_and_store(self, key: str, compute: Callable[[], Any], ttl: float | None) -> Any:
+        self.stats.misses += 1
+        value = compute()
+        self._store_encoded(key, json.dumps(value, ensure_ascii=False), ttl)
+        return value
+
+    async def _acompute_and_store(
+        self, key: str, compute: Callable[[], Awaitable[Any]], ttl: float | None
+    ) -> Any:
+        self.stats.misses += 1
+        value = await compute()
+        self._store_encoded(key, json.dumps(value, ensure_ascii=False), ttl)
+        return value
+
+    def _shared_lookup(self, key: str) -> Tuple[bool, Any]:
+        assert self.store is not None
+        entry = self.store.get(key, time.time())
+        if entry is None:
+            return False, None
+        self.memory.set(key, *entry)
+        self.stats.shared_hits += 1
+        return True, json.loads(entry[0])
+
+    def _store_encoded(self, key: str, encoded: str, ttl: float | None) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+        self.memory.set(key, encoded, expires_at)
+        if self.store is None:
+            return
+        self.store.set(key, encoded, expires_at)
+        now = time.monotonic()
+        if now >= self._next_purge:
+            self._next_purge = now + self.purge_interval
+            self.store.purge_expired()
+
+    def _lookup(self, key: str) -> str | None:
+        now = time.time()
+        cached = self.memory.get(key, now)
+        if cached is not None or self.store is None:
+            return cached
+        entry = self.store.get(key, now)
+        if entry is None:
+            return None
+        self.memory.set(key, *entry)
+        return entry[0]
+
+    @contextmanager
+    def _key_lock(self, key: str) -> Iterator[None]:
+        with self._key_locks_guard:
+            slot = self._key_locks.get(key)
+            if slot is None:
+                slot = self._key_locks[key] = [threading.Lock(), 0]
+            slot[1] += 1
+        try:
+            with slot[0]:
+                yield
+        finally:
+            with self._key_locks_guard:
+                slot[1] -= 1
+                if not slot[1]:
+                    del self._key_locks[key]
+
+
+_SHARED: Dict[Tuple[str | None, int], ResponseCache] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_cache(path: str | Path | None, *, max_entries: int = 1024) -> ResponseCache:
+    """Process-wide cache for `path` (None = in-process LRU only)."""
+
+    key = (str(Path(path).resolve()) if path else None, max_entries)
+    with _SHARED_LOCK:
+        cache = _SHARED.get(key)
+        if cache is None:
+            store = SQLiteCacheStore(key[0]) if key[0] else None
+            cache = _SHARED[key] = ResponseCache(max_entries=max_entries, store=store)
+        return cache
+
+
+def cache_from_config(cache_config: Any) -> ResponseCache | None:
+    """Shared cache for a `CacheConfig`, or None when caching is disabled."""
+
+    if not cache_config.enabled:
+        return None
+    return shared_cache(cache_config.path, max_entries=cache_config.max_entries)
+
+
+__all__ = [
+    "CacheStats",
+    "LRUCache",
+    "ResponseCache",
+    "SQLiteCacheStore",
+    "cache_from_config",
+    "cache_key",
+    "shared_cache",
+]
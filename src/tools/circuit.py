@@ -0,0 +1,232 @@
+"""Per-endpoint circuit breakers for the Tavily and OpenRouter clients.
+
+A breaker watches a rolling window of call outcomes. Once enough calls
+failed it opens and rejects further calls immediately with
+`CircuitOpenError` instead of letting every caller wait out its timeout.
+After `reset_seconds` it turns half-open and lets a few trial calls through:
+one success closes it again, one failure re-opens it.
+
+Breakers are process-wide per endpoint name (`get_breaker`), so every
+researcher step and planner call in a worker shares what the others learned.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint whose breaker is open."""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f"Circuit for {name} is open; retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker over a rolling failure-ratio window."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_ratio: float = 0.5,
+        min_calls: int = 5,
+        window_seconds: float = 60.0,
+        reset_seconds: float = 30.0,
+        half_open_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_ratio = failure_ratio
+        self.min_calls = max(1, min_calls)
+        self.window_seconds = window_seconds
+        self.reset_seconds = reset_seconds
+        self.half_open_calls = max(1, half_open_calls)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (timestamp, succeeded) per finished call inside the window.
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._opened_at: float | None = None
+        self._trials = 0
+        self.trips = 0
+
+    def configure(self, **settings: Any) -> None:
+        """Update thresholds in place (e.g. after a config reload)."""
+
+        with self._lock:
+            for name, value in settings.items():
+                if not hasattr(self, name) or name.startswith("_"):
+                    raise ValueError(f"Unknown circuit breaker setting {name!r}")
+                setattr(self, name, value)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(self._clock())
+
+    @property
+    def retry_after(self) -> float:
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_seconds - self._clock())
+
+    def allow(self) -> bool:
+        """Reserve a call slot; False means the caller must fail fast."""
+
+        with self._lock:
+            state = self._state(self._clock())
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._trials < self.half_open_calls:
+                self._trials += 1
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            now = self._clock()
+            if self._opened_at is not None:
+                # A half-open trial succeeded: forget the failures that tripped us.
+                self._opened_at = None
+                self._trials = 0
+                self._outcomes.clear()
+            self._outcomes.append((now, True))
+            self._prune(now)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = self._clock()
+            if self._opened_at is not None:
+                self._trip(now)
+                return
+            self._outcomes.append((now, False))
+            self._prune(now)
+            failures = sum(1 for _, succeeded in self._outcomes if not succeeded)
+            total = len(self._outcomes)
+            if total >= self.min_calls and failures / total >= self.failure_ratio:
+                self._trip(now)
+
+    def call(self, fn: Callable[[], T], *, failures: Tuple[type, ...] = (Exception,)) -> T:
+        """Run `fn` through the breaker; exceptions in `failures` count against it."""
+
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_after)
+        try:
+            value = fn()
+        except failures:
+            self.record_failure()
+            raise
+        except BaseException:
+            self._release_trial()
+            raise
+        self.record_success()
+        return value
+
+    async def acall(
+        self, fn: Callable[[], Awaitable[T]], *, failures: Tuple[type, ...] = (Exception,)
+    ) -> T:
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_after)
+        try:
+            value = await fn()
+        except failures:
+            self.record_failure()
+            raise
+        except BaseException:
+            # Cancellation or caller bugs say nothing about the endpoint's health.
+            self._release_trial()
+            raise
+        self.record_success()
+        return value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._outcomes.clear()
+            self._opened_at = None
+            self._trials = 0
+
+    def _release_trial(self) -> None:
+        with self._lock:
+            if self._trials:
+                self._trials -= 1
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if now - self._opened_at >= self.reset_seconds:
+            return HALF_OPEN
+        return OPEN
+
+    def _trip(self, now: float) -> None:
+        self._opened_at = now
+        self._trials = 0
+        self._outcomes.clear()
+        self.trips += 1
+
+    def _prune(self, now: float) -> None:
+        horizon = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < horizon:
+            self._outcomes.popleft()
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_breaker(name: str, **settings: Any) -> CircuitBreaker:
+    """Process-wide breaker for `name`; `settings` update its thresholds."""
+
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(name)
+        if breaker is None:
+            breaker = _BREAKERS[name] = CircuitBreaker(name, **settings)
+            return breaker
+    if settings:
+        breaker.configure(**settings)
+    return breaker
+
+
+def breaker_from_config(name: str, resilience: Any) -> CircuitBreaker | None:
+    """Breaker for `name` tuned by a `ResilienceConfig`, or None when disabled."""
+
+    if not resilience.breaker_enabled:
+        return None
+    return get_breaker(
+        name,
+        failure_ratio=resilience.breaker_failure_ratio,
+        min_calls=resilience.breaker_min_calls,
+        window_seconds=resilience.breaker_window_seconds,
+        reset_seconds=resilience.breaker_reset_seconds,
+    )
+
+
+def breaker_states() -> Dict[str, str]:
+    """Current state of every breaker created in this process."""
+
+    with _BREAKERS_LOCK:
+        breakers = list(_BREAKERS.values())
+    return {breaker.name: breaker.state for breaker in breakers}
+
+
+__all__ = [
+    "CLOSED",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "HALF_OPEN",
+    "OPEN",
+    "breaker_from_config",
+    "breaker_states",
+    "get_breaker",
+]
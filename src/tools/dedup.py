@@ -0,0 +1,208 @@
+"""URL canonicalization and near-duplicate detection for research results."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+if TYPE_CHECKING:
+    from src.models.plan import ResearchNote
+
+# Query parameters that only carry campaign/session tracking and never change content.
+_TRACKING_PARAMS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "dclid",
+        "msclkid",
+        "yclid",
+        "mc_cid",
+        "mc_eid",
+        "igshid",
+        "ref",
+        "ref_src",
+        "spm",
+        "_ga",
+    }
+)
+_TRACKING_PREFIXES = ("utm_",)
+
+# Host prefixes used by mobile/AMP mirrors that serve the same document.
+_MIRROR_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+_HASH_BITS = 64
+
+
+def canonicalize_url(url: str, *, mirrors: Mapping[str, str] | None = None) -> str:
+    """Return a canonical form of `url` suitable for equality checks.
+
+    The scheme is folded to https, hosts are lower-cased with mirror prefixes
+    removed (optionally remapped through `mirrors`), default ports, fragments,
+    tracking parameters and trailing slashes are dropped, and the remaining
+    query parameters are sorted. Malformed ports are dropped rather than
+    raising. The result is a dedup key, not a fetchable URL.
+    """
+
+    raw = url.strip()
+    if not raw:
+        return ""
+
+    try:
+        parts = urlsplit(raw if "://" in raw else f"https://{raw}")
+    except ValueError:
+        # Unbalanced IPv6 brackets and similar: the raw string is still a usable key.
+        return raw
+    scheme = parts.scheme.lower()
+    if scheme == "http":
+        scheme = "https"
+
+    host = (parts.hostname or "").lower()
+    for prefix in _MIRROR_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix) :]
+            break
+    if mirrors:
+        host = mirrors.get(host, host)
+
+    try:
+        port = parts.port
+    except ValueError:
+        # Non-numeric or out-of-range port from a sloppy search result; drop it.
+        port = None
+    netloc = host
+    if port is not None and str(port) != _DEFAULT_PORTS.get(parts.scheme.lower()):
+        netloc = f"{host}:{port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/")
+
+    query_items = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(key)
+    ]
+    query = urlencode(sorted(query_items))
+
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def simhash(text: str) -> int:
+    """Compute a 64-bit SimHash fingerprint over word unigrams and bigrams."""
+
+    tokens = _tokenize(text)
+    features = tokens + [f"{left} {right}" for left, right in zip(tokens, tokens[1:])]
+    if not features:
+        return 0
+
+    weights = [0] * _HASH_BITS
+    for feature in features:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        for bit in range(_HASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class NearDuplicateIndex:
+    """Tracks canonical URLs and SimHash fingerprints seen during a run.
+
+    Fingerprints are split into bands so lookups only compare against
+    candidates sharing at least one band; with `max_distance + 1` bands the
+    pigeonhole principle guarantees every match within `max_distance` bits is
+    found.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_distance: int = 3,
+        min_tokens: int = 8,
+        mirrors: Mapping[str, str] | None = None,
+    ) -> None:
+        if not 0 <= max_distance < 16:
+            raise ValueError("max_distance must be between 0 and 15")
+        self._max_distance = max_distance
+        self._min_tokens = min_tokens
+        self._mirrors = dict(mirrors or {})
+        self._band_count = max_distance + 1
+        self._band_width = _HASH_BITS // self._band_count
+        self._urls: set[str] = set()
+        self._fingerprints: List[int] = []
+        self._bands: List[Dict[int, List[int]]] = [{} for _ in range(self._band_count)]
+
+    @classmethod
+    def from_notes(cls, notes: Iterable[ResearchNote], **kwargs) -> NearDuplicateIndex:
+        """Seed an index with notes captured earlier in the run (or prior runs)."""
+
+        index = cls(**kwargs)
+        for note in notes:
+            index.add(note.source, note.evidence or "")
+        return index
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def canonical(self, url: str) -> str:
+        return canonicalize_url(url, mirrors=self._mirrors)
+
+    def seen_url(self, url: str) -> bool:
+        """Return True when the canonical form of `url` was already recorded."""
+
+        return self.canonical(url) in self._urls
+
+    def find_near_duplicate(self, text: str) -> int | None:
+        """Return the fingerprint of a near-duplicate of `text`, if any."""
+
+        if len(_tokenize(text)) < self._min_tokens:
+            return None
+        fingerprint = simhash(text)
+        for band, value in enumerate(self._band_values(fingerprint)):
+            for candidate_id in self._bands[band].get(value, ()):
+                candidate = self._fingerprints[candidate_id]
+                if (candidate ^ fingerprint).bit_count() <= self._max_distance:
+                    return candidate
+        return None
+
+    def add(self, url: str, text: str = "") -> None:
+        """Record a URL and (when long enough) the fingerprint of its text."""
+
+        canonical = self.canonical(url)
+        if canonical:
+            self._urls.add(canonical)
+        if len(_tokenize(text)) < self._min_tokens:
+            return
+        fingerprint = simhash(text)
+        fingerprint_id = len(self._fingerprints)
+        self._fingerprints.append(fingerprint)
+        for band, value in enumerate(self._band_values(fingerprint)):
+            self._bands[band].setdefault(value, []).append(fingerprint_id)
+
+    def check_and_add(self, url: str, text: str = "") -> bool:
+        """Record the item and return True if it is novel, False if duplicate."""
+
+        if self.seen_url(url) or self.find_near_duplicate(text) is not None:
+            return False
+        self.add(url, text)
+        return True
+
+    def _band_values(self, fingerprint: int) -> Iterable[int]:
+        mask = (1 << self._band_width) - 1
+        for band in range(self._band_count):
+            yield fingerprint >> (band * self._band_width) & mask
+
+
+def _is_tracking_param(key: str) -> bool:
+    lowered = key.lower()
+    return lowered in _TRACKING_PARAMS or lowered.startswith(_TRACKING_PREFIXES)
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
@@ -0,0 +1,181 @@
+"""Hedged requests for the Tavily and OpenRouter clients.
+
+A `Hedger` tracks recent latencies of one endpoint. When a request has not
+answered after the configured latency percentile, it sends one duplicate,
+keeps whichever attempt succeeds first and cancels the other. `run` serves
+the async clients; `call` serves the blocking ones the agents use. Hedges are
+capped at `max_extra_ratio` of calls, so the extra upstream spend stays
+bounded even while the endpoint is uniformly slow.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+from concurrent import futures
+from typing import Any, Awaitable, Callable, Deque, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class Hedger:
+    """Issue a second attempt once the first exceeds the latency percentile."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        percentile: float = 0.95,
+        max_extra_ratio: float = 0.1,
+        min_delay: float = 0.05,
+        initial_delay: float = 1.0,
+        min_samples: int = 20,
+        window: int = 500,
+    ) -> None:
+        self.name = name
+        self.percentile = percentile
+        self.max_extra_ratio = max_extra_ratio
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    @property
+    def delay(self) -> float:
+        """Seconds to wait before hedging, from the observed latency percentile."""
+
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_delay
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, max(0, math.ceil(self.percentile * len(ordered)) - 1))
+        return max(self.min_delay, ordered[index])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "delay_seconds": round(self.delay, 4),
+        }
+
+    async def run(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await `fn()`, racing a second `fn()` if the first is slower than `delay`."""
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.calls += 1
+        started_at = loop.time()
+        primary = asyncio.ensure_future(fn())
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.delay)
+            if not done and self._reserve_hedge():
+                pending.add(asyncio.ensure_future(fn()))
+            error: BaseException | None = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        self._finish(loop.time() - started_at, hedge_won=task is not primary)
+                        return task.result()
+                    error = error or task.exception()
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Failures feed the estimator too, so a failing endpoint still shapes the delay.
+            self._finish(loop.time() - started_at, hedge_won=False)
+            assert error is not None
+            raise error
+        finally:
+            # Also reached when the caller is cancelled mid-wait: never leak attempts.
+            for task in pending:
+                task.cancel()
+
+    def call(self, fn: Callable[[], T]) -> T:
+        """Blocking counterpart of `run` for the thread-based clients.
+
+        Attempts run on a shared thread pool. A losing attempt cannot be
+        interrupted; it finishes in the background and its result is dropped.
+        """
+
+        with self._lock:
+            self.calls += 1
+        started_at = time.monotonic()
+        executor = _executor()
+        primary = executor.submit(contextvars.copy_context().run, fn)
+        pending = {primary}
+        try:
+            done, pending = futures.wait(pending, timeout=self.delay)
+            if not done and self._reserve_hedge():
+                pending.add(executor.submit(contextvars.copy_context().run, fn))
+            error: BaseException | None = None
+            while True:
+                for attempt in done:
+                    if attempt.exception() is None:
+                        self._finish(time.monotonic() - started_at, hedge_won=attempt is not primary)
+                        return attempt.result()
+                    error = error or attempt.exception()
+                if not pending:
+                    break
+                done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            self._finish(time.monotonic() - started_at, hedge_won=False)
+            assert error is not None
+            raise error
+        finally:
+            for attempt in pending:
+                attempt.cancel()
+
+    def _reserve_hedge(self) -> bool:
+        with self._lock:
+            if self.hedged + 1 > self.max_extra_ratio * self.calls:
+                return False
+            self.hedged += 1
+            return True
+
+    def _finish(self, latency: float, *, hedge_won: bool) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            if hedge_won:
+                self.hedge_wins += 1
+
+
+_EXECUTOR: futures.ThreadPoolExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _executor() -> futures.ThreadPoolExecutor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = futures.ThreadPoolExecutor(max_workers=32, thread_name_prefix="hedge")
+        return _EXECUTOR
+
+
+_HEDGERS: Dict[str, Hedger] = {}
+_HEDGERS_LOCK = threading.Lock()
+
+
+def hedger_from_config(name: str, resilience: Any) -> Hedger | None:
+    """Process-wide hedger for `name` tuned by a `ResilienceConfig`, or None when disabled."""
+
+    if not resilience.hedge_enabled:
+        return None
+    with _HEDGERS_LOCK:
+        hedger = _HEDGERS.get(name)
+        if hedger is None:
+            hedger = _HEDGERS[name] = Hedger(name)
+        hedger.percentile = resilience.hedge_percentile
+        hedger.max_extra_ratio = resilience.hedge_max_extra_ratio
+        hedger.min_delay = resilience.hedge_min_delay_seconds
+        return hedger
+
+
+__all__ = ["Hedger", "hedger_from_config"]
@@ -3,13 +3,21 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Mapping
+from typing import TYPE_CHECKING, Any, Awaitable, Dict, Mapping, Tuple
 
-import httpx
+from .cache import cache_key
+from .circuit import CircuitOpenError
+from .singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from .cache import ResponseCache
+    from .circuit import CircuitBreaker
+    from .hedging import Hedger
 
 logger = logging.getLogger(__name__)
 
 _OPENROUTER_ENDPOINT = "https://openrouter.ai/api/v1/chat/completions"
+_FLIGHTS = SingleFlight("llm")
 
 
 class LLMError(RuntimeError):
@@ -25,15 +33,169 @@ def call_llm(
     timeout: float = 30.0,
     extra: Mapping[str, Any] | None = None,
     system_prompt: str | None = None,
+    seed: int | None = None,
+    prompt_version: str | None = None,
+    cache: ResponseCache | None = None,
+    cache_ttl: float | None = None,
+    breaker: CircuitBreaker | None = None,
+    hedger: Hedger | None = None,
 ) -> str:
-    """Call OpenRouter with the provided prompt and return the text response."""
+    """Call OpenRouter with the provided prompt and return the text response.
+
+    Concurrent identical requests (model, prompts, temperature) share one
+    in-flight call. A `cache` is only consulted at temperature 0, where
+    identical requests are expected to produce interchangeable answers.
+    While `breaker` is open the call fails immediately with `LLMError`.
+    `seed` is forwarded to OpenRouter for providers that support it.
+    `prompt_version` (registry prompt ids) is folded into the cache key.
+    With a `hedger`, a slow request is raced against one duplicate request.
+    """
 
     if not openrouter_key:
         raise ValueError("OpenRouter API key is required")
 
     system_content = system_prompt or "You are a helpful research assistant."
+    key = cache_key("llm", model, system_content, prompt, temperature, seed, prompt_version)
+
+    def request() -> str:
+        def attempt() -> str:
+            return _request_completion(
+                prompt, model, openrouter_key, temperature, timeout, extra, system_content, seed
+            )
+
+        def send() -> str:
+            return hedger.call(attempt) if hedger is not None else attempt()
+
+        if breaker is None:
+            return send()
+        try:
+            return breaker.call(send, failures=(LLMError,))
+        except CircuitOpenError as exc:
+            raise LLMError(f"OpenRouter request skipped: {exc}") from exc
+
+    def fetch() -> str:
+        if cache is not None and temperature <= 0:
+            return cache.get_or_compute(key, request, ttl=cache_ttl)
+        return request()
+
+    return _FLIGHTS.do(key, fetch)
+
+
+async def acall_llm(
+    prompt: str,
+    *,
+    model: str,
+    openrouter_key: str,
+    temperature: float = 0.0,
+    timeout: float = 30.0,
+    extra: Mapping[str, Any] | None = None,
+    system_prompt: str | None = None,
+    seed: int | None = None,
+    prompt_version: str | None = None,
+    cache: ResponseCache | None = None,
+    cache_ttl: float | None = None,
+    breaker: CircuitBreaker | None = None,
+    hedger: Hedger | None = None,
+) -> str:
+    """Async variant of `call_llm`; identical in-flight requests are coalesced.
 
-    payload = {
+    With a `hedger`, a slow request is raced against one duplicate request.
+    """
+
+    if not openrouter_key:
+        raise ValueError("OpenRouter API key is required")
+
+    system_content = system_prompt or "You are a helpful research assistant."
+    key = cache_key("llm", model, system_content, prompt, temperature, seed, prompt_version)
+    use_cache = cache is not None and temperature <= 0
+
+    async def request() -> str:
+        def send() -> Awaitable[str]:
+            def attempt() -> Awaitable[str]:
+                return _arequest_completion(
+                    prompt, model, openrouter_key, temperature, timeout, extra, system_content, seed
+                )
+
+            return hedger.run(attempt) if hedger is not None else attempt()
+
+        if breaker is None:
+            return await send()
+        try:
+            return await breaker.acall(send, failures=(LLMError,))
+        except CircuitOpenError as exc:
+            raise LLMError(f"OpenRouter request skipped: {exc}") from exc
+
+    async def fetch() -> str:
+        if use_cache:
+            return await cache.aget_or_compute(key, request, ttl=cache_ttl)
+        return await request()
+
+    return await _FLIGHTS.ado(key, fetch)
+
+
+def _request_completion(
+    prompt: str,
+    model: str,
+    openrouter_key: str,
+    temperature: float,
+    timeout: float,
+    extra: Mapping[str, Any] | None,
+    system_content: str,
+    seed: int | None,
+) -> str:
+    payload, headers = _completion_request(
+        prompt, model, openrouter_key, temperature, timeout, extra, system_content, seed
+    )
+
+    import httpx
+
+    try:
+        with httpx.Client(timeout=timeout) as client:
+            response = client.post(_OPENROUTER_ENDPOINT, json=payload, headers=headers)
+            response.raise_for_status()
+    except httpx.HTTPError as exc:
+        raise LLMError(f"OpenRouter request failed: {exc}") from exc
+
+    return _parse_completion(response.json())
+
+
+async def _arequest_completion(
+    prompt: str,
+    model: str,
+    openrouter_key: str,
+    temperature: float,
+    timeout: float,
+    extra: Mapping[str, Any] | None,
+    system_content: str,
+    seed: int | None,
+) -> str:
+    payload, headers = _completion_request(
+        prompt, model, openrouter_key, temperature, timeout, extra, system_content, seed
+    )
+
+    import httpx
+
+    try:
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            response = await client.post(_OPENROUTER_ENDPOINT, json=payload, headers=headers)
+            response.raise_for_status()
+    except httpx.HTTPError as exc:
+        raise LLMError(f"OpenRouter request failed: {exc}") from exc
+
+    return _parse_completion(response.json())
+
+
+def _completion_request(
+    prompt: str,
+    model: str,
+    openrouter_key: str,
+    temperature: float,
+    timeout: float,
+    extra: Mapping[str, Any] | None,
+    system_content: str,
+    seed: int | None,
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    payload: Dict[str, Any] = {
         "model": model,
         "messages": [
             {"role": "system", "content": system_content},
@@ -41,6 +203,8 @@ def call_llm(
         ],
         "temperature": temperature,
     }
+    if seed is not None:
+        payload["seed"] = seed
 
     headers = {
         "Authorization": f"Bearer {openrouter_key}",
@@ -57,15 +221,10 @@ def call_llm(
             "meta": dict(extra or {}),
         },
     )
+    return payload, headers
 
-    try:
-        with httpx.Client(timeout=timeout) as client:
-            response = client.post(_OPENROUTER_ENDPOINT, json=payload, headers=headers)
-            response.raise_for_status()
-    except httpx.HTTPError as exc:
-        raise LLMError(f"OpenRouter request failed: {exc}") from exc
 
-    data = response.json()
+def _parse_completion(data: Mapping[str, Any]) -> str:
     choices = data.get("choices", [])
     if not choices:
         raise LLMError("OpenRouter response contains no choices")
@@ -0,0 +1,265 @@
+"""Local BM25 retrieval over previously gathered notes and crawled articles."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, List, Sequence
+
+from .dedup import canonicalize_url
+
+if TYPE_CHECKING:
+    from src.models.plan import ResearchNote
+    from src.tools.crawler import Article
+
+logger = logging.getLogger(__name__)
+
+_WORD_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+_CJK_PATTERN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]")
+# Bodies are truncated before indexing; long articles add little beyond the lead.
+_MAX_BODY_CHARS = 20_000
+_SNIPPET_CHARS = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    doc_key TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class LocalHit:
+    """Single document returned by a local index query."""
+
+    source: str
+    title: str
+    snippet: str
+    score: float
+
+    def as_result(self) -> dict:
+        """Return the hit in the canonical search result schema."""
+
+        return {"title": self.title, "url": self.source, "snippet": self.snippet}
+
+
+class LocalIndex:
+    """Inverted index with BM25 ranking, persisted in a SQLite file.
+
+    Postings live on disk and are updated incrementally; only the corpus
+    statistics (document count and total length) are kept in memory.
+    Documents are keyed by canonical source plus title, so re-ingesting the
+    same archive is a no-op.
+    """
+
+    def __init__(self, path: str | Path, *, k1: float = 1.2, b: float = 0.75) -> None:
+        self._path = Path(path)
+        if str(self._path) != ":memory:":
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._k1 = k1
+        self._b = b
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM documents").fetchone()
+        self._doc_count = int(row[0])
+        self._total_length = int(row[1])
+
+    def __enter__(self) -> LocalIndex:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._doc_count
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def add_document(self, source: str, title: str, body: str) -> bool:
+        """Index a document; returns False when it was already present."""
+
+        return self._add_many([(source, title, body)]) == 1
+
+    def add_notes(self, notes: Iterable[ResearchNote]) -> int:
+        """Index research notes (claim as title, evidence as body)."""
+
+        return self._add_many(
+            (note.source, note.claim, note.evidence or "") for note in notes if note.source
+        )
+
+    def add_articles(self, articles: Iterable[Article]) -> int:
+        """Index crawled article text."""
+
+        return self._add_many(
+            (article.url, article.title or "", article.content or "")
+            for article in articles
+            if article.url and article.content
+        )
+
+    def add_plan_records(self, log_path: str | Path) -> int:
+        """Ingest every note stored in a `plans.jsonl` archive, including rotated segments."""
+
+        from src.models.archive import archive_segments, iter_archive, loads_record
+
+        path = Path(log_path)
+        if not archive_segments(path):
+            return 0
+
+        added = 0
+        for segment, line_number, payload in iter_archive(path):
+            try:
+                record = loads_record(payload)
+            except ValueError:
+                logger.warning(
+                    "Skipping unreadable plan record",
+                    extra={"path": str(segment), "line": line_number},
+                )
+                continue
+            for step in record.plan.steps:
+                added += self.add_notes(step.notes)
+        return added
+
+    def search(self, query: str, *, limit: int = 5) -> List[LocalHit]:
+        """Return up to `limit` documents ranked by BM25 for `query`."""
+
+        terms = set(_tokenize(query))
+        if not terms or not self._doc_count or limit < 1:
+            return []
+
+        with self._lock:
+            placeholders = ",".join("?" for _ in terms)
+            rows = self._conn.execute(
+                f"""
+                SELECT p.term, p.doc_id, p.tf, d.length
+                FROM postings AS p JOIN documents AS d ON d.id = p.doc_id
+                WHERE p.term IN ({placeholders})
+                """,
+                tuple(terms),
+            ).fetchall()
+
+            doc_freq = Counter(term for term, _, _, _ in rows)
+            average_length = max(1.0, self._total_length / self._doc_count)
+            scores: dict[int, float] = {}
+            for term, doc_id, tf, length in rows:
+                df = doc_freq[term]
+                idf = math.log(1.0 + (self._doc_count - df + 0.5) / (df + 0.5))
+                norm = tf + self._k1 * (1.0 - self._b + self._b * length / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self._k1 + 1.0) / norm
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+            if not ranked:
+                return []
+            ids = [doc_id for doc_id, _ in ranked]
+            placeholders = ",".join("?" for _ in ids)
+            documents = {
+                doc_id: (source, title, body)
+                for doc_id, source, title, body in self._conn.execute(
+                    f"SELECT id, source, title, body FROM documents WHERE id IN ({placeholders})",
+                    ids,
+                )
+            }
+
+        hits: List[LocalHit] = []
+        for doc_id, score in ranked:
+            source, title, body = documents[doc_id]
+            hits.append(
+                LocalHit(source=source, title=title, snippet=body[:_SNIPPET_CHARS], score=score)
+            )
+        return hits
+
+    def _add_many(self, documents: Iterable[tuple[str, str, str]]) -> int:
+        added = 0
+        with self._lock, self._conn:
+            for source, title, body in documents:
+                source = source.strip()
+                title = title.strip()
+                body = body.strip()[:_MAX_BODY_CHARS]
+                doc_key = _document_key(source, title)
+                terms = Counter(_tokenize(f"{title} {body}"))
+                length = sum(terms.values())
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO documents (doc_key, source, title, body, length) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (doc_key, source, title, body, length),
+                )
+                if not cursor.rowcount:
+                    continue
+                doc_id = cursor.lastrowid
+                self._conn.executemany(
+                    "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                    [(term, doc_id, tf) for term, tf in terms.items()],
+                )
+                self._doc_count += 1
+                self._total_length += length
+                added += 1
+        return added
+
+
+def _document_key(source: str, title: str) -> str:
+    digest = hashlib.sha1(title.casefold().encode("utf-8")).hexdigest()[:16]
+    return f"{canonicalize_url(source)}#{digest}"
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens; CJK runs are split into character bigrams."""
+
+    tokens: List[str] = []
+    for word in _WORD_PATTERN.findall(text.lower()):
+        if not _CJK_PATTERN.search(word):
+            if len(word) > 1:
+                tokens.append(word)
+            continue
+        tokens.extend(_split_cjk(word))
+    return tokens
+
+
+def _split_cjk(word: str) -> Sequence[str]:
+    tokens: List[str] = []
+    buffer = ""
+    for char in word:
+        if _CJK_PATTERN.match(char):
+            if buffer:
+                if len(buffer) > 1:
+                    tokens.append(buffer)
+                buffer = ""
+            tokens.append(char)
+        else:
+            buffer += char
+    if buffer and len(buffer) > 1:
+        tokens.append(buffer)
+
+    # Replace runs of single CJK characters with overlapping bigrams.
+    result: List[str] = []
+    run: List[str] = []
+    for token in tokens + [""]:
+        if len(token) == 1 and _CJK_PATTERN.match(token):
+            run.append(token)
+            continue
+        if len(run) == 1:
+            result.append(run[0])
+        else:
+            result.extend(left + right for left, right in zip(run, run[1:]))
+        run = []
+        if token:
+            result.append(token)
+    return result
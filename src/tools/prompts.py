@@ -0,0 +1,132 @@
+"""Process-wide registry of compiled prompt templates from `src/prompts/`.
+
+Each file is read and compiled once. `*.jinja` files are Jinja templates
+rendered with `StrictUndefined`, so a variable the template needs but the
+caller did not pass raises `PromptError` instead of rendering empty; every
+other file is used verbatim.
+
+Templates are identified as `<name>@<version>`, where the version is a short
+hash of the file contents. The id is recorded in run telemetry and folded
+into LLM cache keys, so editing a prompt never serves answers produced by the
+old wording. Renders are memoized per id and variables.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Mapping
+
+import jinja2
+
+from .cache import LRUCache, cache_key
+
+PROMPTS_DIR = Path(__file__).resolve().parents[1] / "prompts"
+
+_ENVIRONMENT = jinja2.Environment(
+    undefined=jinja2.StrictUndefined, keep_trailing_newline=True, autoescape=False
+)
+
+Renderer = Callable[[Mapping[str, str]], str]
+
+
+class PromptError(RuntimeError):
+    """Raised for missing prompt files or variables a template needs."""
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A compiled prompt; `id` changes whenever the file contents change."""
+
+    name: str
+    version: str
+    source: str
+    renderer: Renderer
+
+    @property
+    def id(self) -> str:
+        return f"{self.name}@{self.version}"
+
+
+class PromptRegistry:
+    """Load, compile and render the prompt files in one directory."""
+
+    def __init__(self, directory: str | Path = PROMPTS_DIR, *, cache_size: int = 256) -> None:
+        self.directory = Path(directory)
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._lock = threading.Lock()
+        self._renders = LRUCache(cache_size)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str) -> PromptTemplate:
+        """Compiled template for `name` (the file name without its extension)."""
+
+        with self._lock:
+            template = self._templates.get(name)
+            if template is None:
+                template = self._templates[name] = self._load(name)
+            return template
+
+    def render(self, name: str, /, **variables: str) -> str:
+        """Render `name` with `variables`, reusing earlier output for identical inputs."""
+
+        template = self.get(name)
+        key = cache_key("prompt", template.id, sorted(variables.items()))
+        rendered = self._renders.get(key, 0.0)
+        if rendered is not None:
+            with self._lock:
+                self.hits += 1
+            return rendered
+        rendered = template.renderer(variables)
+        self._renders.set(key, rendered, None)
+        with self._lock:
+            self.misses += 1
+        return rendered
+
+    def _load(self, name: str) -> PromptTemplate:
+        matches = sorted(self.directory.glob(f"{name}.*"))
+        if not matches:
+            raise PromptError(f"Missing prompt {name!r} in {self.directory}")
+        path = matches[0]
+        source = path.read_text(encoding="utf-8")
+        version = hashlib.sha256(source.encode("utf-8")).hexdigest()[:8]
+        if path.suffix == ".jinja":
+            renderer = _compile(name, source)
+        else:
+            renderer = lambda variables, text=source: text  # noqa: E731 - static prompt
+        return PromptTemplate(name=name, version=version, source=source, renderer=renderer)
+
+
+def _compile(name: str, source: str) -> Renderer:
+    try:
+        template = _ENVIRONMENT.from_string(source)
+    except jinja2.TemplateSyntaxError as exc:
+        raise PromptError(f"Prompt {name!r}: {exc}") from exc
+
+    def render(variables: Mapping[str, str]) -> str:
+        try:
+            return template.render(**variables)
+        except jinja2.UndefinedError as exc:
+            raise PromptError(f"Prompt {name!r}: {exc}") from exc
+
+    return render
+
+
+_REGISTRY: PromptRegistry | None = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def prompt_registry() -> PromptRegistry:
+    """The process-wide registry over `src/prompts/`."""
+
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = PromptRegistry()
+        return _REGISTRY
+
+
+__all__ = ["PROMPTS_DIR", "PromptError", "PromptRegistry", "PromptTemplate", "prompt_registry"]
@@ -3,13 +3,24 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, Awaitable, Dict, Iterable, List, Mapping, Sequence
 
-import httpx
+from .cache import cache_key
+from .circuit import CircuitOpenError
+from .dedup import canonicalize_url
+from .singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from .cache import ResponseCache
+    from .circuit import CircuitBreaker
+    from .hedging import Hedger
 
 logger = logging.getLogger(__name__)
 
 _TAVILY_ENDPOINT = "https://api.tavily.com/search"
+# Damping constant for reciprocal rank fusion; 60 is the value from the original RRF paper.
+_RRF_K = 60
+_FLIGHTS = SingleFlight("search")
 
 
 class SearchError(RuntimeError):
@@ -23,12 +34,139 @@ def search_web(
     max_results: int = 5,
     timeout: float = 10.0,
     params: Mapping[str, Any] | None = None,
+    cache: ResponseCache | None = None,
+    cache_ttl: float | None = None,
+    breaker: CircuitBreaker | None = None,
+    hedger: Hedger | None = None,
 ) -> List[Dict[str, Any]]:
-    """Dispatch a search query to Tavily and return normalized results."""
+    """Dispatch a search query to Tavily and return normalized results.
+
+    Results are keyed on the query, `max_results` and `params` (never the
+    API key). Concurrent identical searches share one in-flight request, and
+    with a `cache` results are also reused across runs and processes. With
+    an open `breaker` the request fails immediately with `SearchError`;
+    cached results are still served. With a `hedger`, a slow request is
+    raced against one duplicate request.
+    """
 
     if not tavily_key:
         raise ValueError("Tavily API key is required")
 
+    key = cache_key("search", query, max_results, dict(params or {}))
+
+    def send() -> List[Dict[str, Any]]:
+        if hedger is not None:
+            return hedger.call(lambda: _request_search(query, tavily_key, max_results, timeout, params))
+        return _request_search(query, tavily_key, max_results, timeout, params)
+
+    def request() -> List[Dict[str, Any]]:
+        if breaker is None:
+            return send()
+        try:
+            return breaker.call(send, failures=(SearchError,))
+        except CircuitOpenError as exc:
+            raise SearchError(f"Tavily request skipped: {exc}") from exc
+
+    def fetch() -> List[Dict[str, Any]]:
+        if cache is not None:
+            return cache.get_or_compute(key, request, ttl=cache_ttl)
+        return request()
+
+    return _FLIGHTS.do(key, fetch)
+
+
+async def asearch_web(
+    query: str,
+    *,
+    tavily_key: str,
+    max_results: int = 5,
+    timeout: float = 10.0,
+    params: Mapping[str, Any] | None = None,
+    cache: ResponseCache | None = None,
+    cache_ttl: float | None = None,
+    breaker: CircuitBreaker | None = None,
+    hedger: Hedger | None = None,
+) -> List[Dict[str, Any]]:
+    """Async variant of `search_web`; identical in-flight searches are coalesced.
+
+    With a `hedger`, a slow request is raced against one duplicate request.
+    """
+
+    if not tavily_key:
+        raise ValueError("Tavily API key is required")
+
+    key = cache_key("search", query, max_results, dict(params or {}))
+
+    def send() -> Awaitable[List[Dict[str, Any]]]:
+        if hedger is not None:
+            return hedger.run(lambda: _arequest_search(query, tavily_key, max_results, timeout, params))
+        return _arequest_search(query, tavily_key, max_results, timeout, params)
+
+    async def request() -> List[Dict[str, Any]]:
+        if breaker is None:
+            return await send()
+        try:
+            return await breaker.acall(send, failures=(SearchError,))
+        except CircuitOpenError as exc:
+            raise SearchError(f"Tavily request skipped: {exc}") from exc
+
+    async def fetch() -> List[Dict[str, Any]]:
+        if cache is not None:
+            return await cache.aget_or_compute(key, request, ttl=cache_ttl)
+        return await request()
+
+    return await _FLIGHTS.ado(key, fetch)
+
+
+def _request_search(
+    query: str,
+    tavily_key: str,
+    max_results: int,
+    timeout: float,
+    params: Mapping[str, Any] | None,
+) -> List[Dict[str, Any]]:
+    payload = _search_payload(query, tavily_key, max_results, timeout, params)
+
+    import httpx
+
+    try:
+        with httpx.Client(timeout=timeout) as client:
+            response = client.post(_TAVILY_ENDPOINT, json=payload)
+            response.raise_for_status()
+    except httpx.HTTPError as exc:
+        raise SearchError(f"Tavily request failed: {exc}") from exc
+
+    return _parse_response(response.json())
+
+
+async def _arequest_search(
+    query: str,
+    tavily_key: str,
+    max_results: int,
+    timeout: float,
+    params: Mapping[str, Any] | None,
+) -> List[Dict[str, Any]]:
+    payload = _search_payload(query, tavily_key, max_results, timeout, params)
+
+    import httpx
+
+    try:
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            response = await client.post(_TAVILY_ENDPOINT, json=payload)
+            response.raise_for_status()
+    except httpx.HTTPError as exc:
+        raise SearchError(f"Tavily request failed: {exc}") from exc
+
+    return _parse_response(response.json())
+
+
+def _search_payload(
+    query: str,
+    tavily_key: str,
+    max_results: int,
+    timeout: float,
+    params: Mapping[str, Any] | None,
+) -> Dict[str, Any]:
     payload: Dict[str, Any] = {
         "api_key": tavily_key,
         "query": query,
@@ -45,32 +183,75 @@ def search_web(
             "timeout": timeout,
         },
     )
+    return payload
 
-    try:
-        with httpx.Client(timeout=timeout) as client:
-            response = client.post(_TAVILY_ENDPOINT, json=payload)
-            response.raise_for_status()
-    except httpx.HTTPError as exc:
-        raise SearchError(f"Tavily request failed: {exc}") from exc
 
-    data = response.json()
+def _parse_response(data: Mapping[str, Any]) -> List[Dict[str, Any]]:
     raw_results = data.get("results")
     if raw_results is None:
         raise SearchError("Tavily response missing 'results' field")
-
     return normalize_results(raw_results)
 
 
 def normalize_results(raw_results: Sequence[Mapping[str, Any]]) -> List[Dict[str, Any]]:
-    """Map Tavily fields to the canonical result schema."""
+    """Map Tavily fields to the canonical result schema.
+
+    Tavily returns the page extract as `content`; it becomes the `snippet`
+    that scoring and near-duplicate detection read.
+    """
 
     normalized: List[Dict[str, Any]] = []
     for item in raw_results:
-        normalized.append(
-            {
-                "title": str(item.get("title", "")),
-                "url": str(item.get("url", "")),
-                "snippet": str(item.get("snippet", "")),
-            }
-        )
+        entry = {
+            "title": str(item.get("title", "")),
+            "url": str(item.get("url", "")),
+            "snippet": str(item.get("snippet") or item.get("content") or ""),
+        }
+        # Optional fields consumed by pluggable scoring features.
+        if item.get("published_date"):
+            entry["published_date"] = str(item["published_date"])
+        normalized.append(entry)
     return normalized
+
+
+def fuse_results(
+    result_lists: Iterable[Sequence[Mapping[str, Any]]],
+    *,
+    rrf_k: int = _RRF_K,
+) -> List[Dict[str, Any]]:
+    """Merge ranked result lists with reciprocal rank fusion.
+
+    Results pointing at the same canonical URL are collapsed into one entry
+    whose score is the sum of `1 / (rrf_k + rank)` over every list it appears
+    in, so documents surfaced by several queries float to the top.
+    """
+
+    scores: Dict[str, float] = {}
+    merged: Dict[str, Dict[str, Any]] = {}
+    order: Dict[str, int] = {}
+
+    for results in result_lists:
+        for rank, item in enumerate(results, start=1):
+            url = str(item.get("url", "")).strip()
+            if not url:
+                continue
+            key = canonicalize_url(url)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            existing = merged.get(key)
+            if existing is None:
+                order[key] = len(order)
+                merged[key] = dict(item)
+                merged[key].update(
+                    title=str(item.get("title", "")),
+                    url=url,
+                    snippet=str(item.get("snippet", "")),
+                )
+                continue
+            # Keep the first-seen entry but backfill fields it was missing.
+            if not existing["title"] and item.get("title"):
+                existing["title"] = str(item["title"])
+            if not existing["snippet"] and item.get("snippet"):
+                existing["snippet"] = str(item["snippet"])
+
+    ranked = sorted(merged, key=lambda key: (-scores[key], order[key]))
+    return [merged[key] for key in ranked]
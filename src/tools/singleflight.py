@@ -0,0 +1,164 @@
+"""In-flight request coalescing for the search and LLM tools.
+
+A `SingleFlight` group lets exactly one caller per key run the upstream
+call while concurrent callers with the same key wait for, and share, its
+outcome (value or exception). Nothing is remembered once the call finishes;
+persistence is the response cache's job. Sync callers are coalesced across
+threads, async callers across tasks on the same event loop.
+
+Coalesced waits are counted on the group and, when a caller has opened a
+`coalescing_scope()`, on that scope so runs can report them in telemetry.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class CoalescedCounts:
+    """Coalesced waits per group name, collected by `coalescing_scope`."""
+
+    counts: Dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, group: str) -> None:
+        with self._lock:
+            self.counts[group] = self.counts.get(group, 0) + 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+_SCOPE: ContextVar[CoalescedCounts | None] = ContextVar("coalescing_scope", default=None)
+
+
+@contextmanager
+def coalescing_scope() -> Iterator[CoalescedCounts]:
+    """Collect coalesced waits made in this context (and contexts copied from it)."""
+
+    counts = CoalescedCounts()
+    token = _SCOPE.set(counts)
+    try:
+        yield counts
+    finally:
+        _SCOPE.reset(token)
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls that share a key into one execution."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _Call] = {}
+        self._async_inflight: Dict[Tuple[int, str], asyncio.Future] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run `fn` unless a call for `key` is in flight, then share its outcome."""
+
+        with self._lock:
+            self.calls += 1
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            self._record()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+        return call.value
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async counterpart of `do`; coalesces tasks on the running event loop.
+
+        If the leading task is cancelled, waiters that were not cancelled
+        themselves start a new flight instead of inheriting the cancellation.
+        """
+
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+        with self._lock:
+            self.calls += 1
+        while True:
+            with self._lock:
+                future = self._async_inflight.get(slot)
+                leader = future is None
+                if leader:
+                    future = self._async_inflight[slot] = loop.create_future()
+                else:
+                    self.coalesced += 1
+
+            if leader:
+                return await self._alead(slot, future, fn)
+            self._record()
+            try:
+                # Shield so a cancelled waiter does not cancel the shared result.
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if future.cancelled() and current is not None and not current.cancelling():
+                    continue
+                raise
+
+    async def _alead(
+        self, slot: Tuple[int, str], future: asyncio.Future, fn: Callable[[], Awaitable[T]]
+    ) -> T:
+        try:
+            value = await fn()
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                # Mark retrieved: waiters may not exist, which is fine.
+                future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._async_inflight[slot]
+
+    def _record(self) -> None:
+        scope = _SCOPE.get()
+        if scope is not None:
+            scope.add(self.name)
+
+
+__all__ = ["CoalescedCounts", "SingleFlight", "coalescing_scope"]
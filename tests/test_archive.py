@@ -0,0 +1,129 @@
+"""Tests for plan-run archive serialization."""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from src.models.archive import (
+    ArchiveWriter,
+    archive_segments,
+    dumps_record,
+    iter_archive,
+    iter_lines,
+    iter_records,
+    loads_record,
+    manifest_path,
+    read_manifest,
+)
+from src.models.persistence import PlanRunRecord
+
+SAMPLE_LOG = Path(__file__).resolve().parents[1] / "samples" / "plan_run_record.jsonl"
+
+
+def _sample() -> PlanRunRecord:
+    return PlanRunRecord.model_validate_json(SAMPLE_LOG.read_text(encoding="utf-8").strip())
+
+
+def test_dumps_record_matches_legacy_encoding() -> None:
+    record = _sample()
+    legacy = json.loads(json.dumps(record.model_dump(mode="json"), ensure_ascii=False))
+    assert json.loads(dumps_record(record)) == legacy
+    assert loads_record(dumps_record(record)) == record
+
+
+@pytest.mark.parametrize("name", ["plans.jsonl", "plans.jsonl.zst"])
+def test_buffered_writer_round_trip(tmp_path, name: str) -> None:
+    if name.endswith(".zst"):
+        pytest.importorskip("zstandard")
+    record = _sample()
+    path = tmp_path / name
+
+    with ArchiveWriter(path, buffer_records=2, max_bytes=None) as writer:
+        for _ in range(5):
+            writer.write(record)
+        assert writer.records_written == 4  # two full batches flushed, one pending
+    # Reopening appends a new segment rather than rewriting the file.
+    with ArchiveWriter(path, max_bytes=None) as writer:
+        writer.write(record)
+
+    assert [number for number, _ in iter_lines(path)] == [1, 2, 3, 4, 5, 6]
+    assert all(item == record for item in iter_records(path))
+
+
+def _hammer(path: str, worker: int, count: int) -> None:
+    record = _sample()
+    with ArchiveWriter(path, buffer_records=3, max_bytes=40_000) as writer:
+        for idx in range(count):
+            writer.write(record.model_copy(update={"context": f"worker-{worker}-{idx}"}))
+
+
+def test_archive_writer_is_safe_across_processes(tmp_path) -> None:
+    path = tmp_path / "plans.jsonl"
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_hammer, args=(str(path), worker, 25)) for worker in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    contexts = [loads_record(payload).context for _, _, payload in iter_archive(path)]
+    assert len(contexts) == 100
+    assert len(set(contexts)) == 100
+    manifest = read_manifest(path)
+    assert manifest["segments"], "size-based rotation should have closed segments"
+    assert sum(item["records"] for item in manifest["segments"]) + manifest["active_records"] == 100
+    assert archive_segments(path)[-1] == path
+
+
+def test_archive_writer_rotates_by_age(tmp_path) -> None:
+    path = tmp_path / "plans.jsonl"
+    record = _sample()
+    with ArchiveWriter(path, buffer_records=1, max_bytes=None, max_age_seconds=0) as writer:
+        writer.write(record)
+        writer.write(record)
+    assert [segment.name for segment in archive_segments(path)] == ["plans.00001.jsonl", "plans.jsonl"]
+
+
+def test_manifest_counts_records_in_legacy_active_file(tmp_path) -> None:
+    path = tmp_path / "plans.jsonl"
+    record = _sample()
+    # Written by the old plain-append `_store_plan`, before manifests existed.
+    path.write_bytes(dumps_record(record) + b"\n" + dumps_record(record) + b"\n")
+
+    with ArchiveWriter(path, buffer_records=1) as writer:
+        writer.write(record)
+    assert read_manifest(path)["active_records"] == 3
+
+    with ArchiveWriter(path, buffer_records=1) as writer:
+        segment = writer.rotate()
+    assert read_manifest(path)["segments"][0]["records"] == 3
+    assert sum(1 for _ in iter_lines(segment)) == 3
+
+
+def test_rotation_never_overwrites_segments_missing_from_manifest(tmp_path) -> None:
+    path = tmp_path / "plans.jsonl"
+    with ArchiveWriter(path, buffer_records=1) as writer:
+        for idx in range(2):
+            writer.write(_sample().model_copy(update={"context": f"before-{idx}"}))
+        writer.rotate()
+    manifest_path(path).unlink()  # lost, or a crash before it was rewritten
+
+    with ArchiveWriter(path, buffer_records=1) as writer:
+        for idx in range(2):
+            writer.write(_sample().model_copy(update={"context": f"after-{idx}"}))
+            writer.rotate()
+
+    assert [segment.name for segment in archive_segments(path)] == [
+        "plans.00001.jsonl",
+        "plans.00002.jsonl",
+        "plans.00003.jsonl",
+    ]
+    contexts = [loads_record(payload).context for _, _, payload in iter_archive(path)]
+    assert contexts == ["before-0", "before-1", "after-0", "after-1"]
+    manifest = read_manifest(path)
+    assert [item["records"] for item in manifest["segments"]] == [2, 1, 1]
@@ -0,0 +1,186 @@
+"""Tests for shipping researcher steps through brokers."""
+
+from __future__ import annotations
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from src.agents.researcher import ResearchContext, ResearcherError, ResearcherResult
+from src.config.configuration import AppConfig
+from src.graph.builder import build_graph, initial_state
+from src.jobs.broker import (
+    BrokerTimeout,
+    InProcessBroker,
+    SQLiteBroker,
+    context_from_payload,
+    context_to_payload,
+    create_broker,
+    result_to_payload,
+    sqlite_url_path,
+    task_key,
+)
+from src.jobs.supervisor import WorkerOptions, worker_loop
+from src.models.plan import Plan, PlanStep, ResearchNote, StepStatus
+
+
+class CountingResearcher:
+    def __init__(self, *, fail: bool = False) -> None:
+        self.calls: list[ResearchContext] = []
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def run_step(self, context: ResearchContext) -> ResearcherResult:
+        with self._lock:
+            self.calls.append(context)
+        if self.fail:
+            raise ResearcherError("search unavailable")
+        note = ResearchNote(source="https://example.com", claim=f"Insight for {context.step.title}")
+        return ResearcherResult(
+            query=f"{context.topic} | {context.step.title}",
+            notes=[note],
+            references=[note.source],
+            total_results=1,
+            applied_max_results=context.max_results,
+        )
+
+
+def _context(step_id: str = "step-1", title: str = "Run") -> ResearchContext:
+    return ResearchContext(
+        topic="Topic",
+        locale="en-US",
+        step=PlanStep(id=step_id, title=title, step_type="RESEARCH", expected_outcome="Done"),
+        max_results=3,
+        timeout_seconds=5.0,
+        prior_notes=[ResearchNote(source="https://prior.example", claim="Earlier")],
+    )
+
+
+class PayloadTests(unittest.TestCase):
+    def test_context_round_trip_and_stable_key(self) -> None:
+        context = _context()
+        payload = context_to_payload(context)
+        restored = context_from_payload(payload)
+        self.assertEqual(restored.step, context.step)
+        self.assertEqual(list(restored.prior_notes), list(context.prior_notes))
+        self.assertEqual(task_key(payload), task_key(context_to_payload(_context())))
+        self.assertNotEqual(task_key(payload), task_key(context_to_payload(_context(title="Other"))))
+
+
+class InProcessBrokerTests(unittest.TestCase):
+    def test_resubmitting_a_step_reuses_the_task(self) -> None:
+        researcher = CountingResearcher()
+        with InProcessBroker(researcher, max_workers=2) as broker:
+            first = broker.submit(_context())
+            self.assertEqual(broker.submit(_context()), first)
+            results = broker.run_many([_context(), _context("step-2", "Second")], timeout=5)
+        self.assertEqual([result.query for result in results], ["Topic | Run", "Topic | Second"])
+        self.assertEqual(len(researcher.calls), 2)
+
+    def test_failure_is_not_cached(self) -> None:
+        researcher = CountingResearcher(fail=True)
+        with create_broker("inprocess://", agent=researcher) as broker:
+            for _ in range(2):
+                with self.assertRaises(ResearcherError):
+                    broker.run(_context(), timeout=5)
+        self.assertEqual(len(researcher.calls), 2)
+
+
+class SQLiteBrokerTests(unittest.TestCase):
+    def test_worker_runs_shipped_step(self) -> None:
+        researcher = CountingResearcher()
+
+        def handler_factory():
+            return lambda job: result_to_payload(researcher.run_step(context_from_payload(job.payload)))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "queue.sqlite"
+            with create_broker(f"sqlite://{path}", poll_interval=0.01) as broker:
+                task_id = broker.submit(_context())
+                self.assertEqual(broker.submit(_context()), task_id)
+                worker = threading.Thread(
+                    target=worker_loop,
+                    args=(path, handler_factory, WorkerOptions(poll_interval=0.01, max_jobs=1)),
+                )
+                worker.start()
+                result = broker.wait(task_id, timeout=10)
+                worker.join()
+        self.assertEqual(result.notes[0].claim, "Insight for Run")
+        self.assertEqual(len(researcher.calls), 1)
+
+    def test_failed_step_is_retried_with_a_fresh_job(self) -> None:
+        researcher = CountingResearcher(fail=True)
+
+        def handler_factory():
+            return lambda job: result_to_payload(researcher.run_step(context_from_payload(job.payload)))
+
+        def drain(path: Path) -> None:
+            worker_loop(path, handler_factory, WorkerOptions(poll_interval=0.01, idle_exit_seconds=0.05))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "queue.sqlite"
+            with SQLiteBroker(str(path), max_attempts=1, poll_interval=0.01) as broker:
+                failed_id = broker.submit(_context())
+                drain(path)
+                with self.assertRaises(ResearcherError):
+                    broker.wait(failed_id, timeout=5)
+
+                researcher.fail = False
+                retry_id = broker.submit(_context())
+                self.assertNotEqual(retry_id, failed_id)
+                drain(path)
+                result = broker.wait(retry_id, timeout=5)
+        self.assertEqual(result.notes[0].claim, "Insight for Run")
+        self.assertEqual(len(researcher.calls), 2)
+
+    def test_wait_times_out_without_workers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with SQLiteBroker(str(Path(tmpdir) / "queue.sqlite"), poll_interval=0.01) as broker:
+                with self.assertRaises(BrokerTimeout):
+                    broker.run(_context(), timeout=0.05)
+
+
+    def test_relative_sqlite_url_matches_the_workers_default_queue(self) -> None:
+        from scripts.run_workers import DEFAULT_QUEUE_PATH, PROJECT_ROOT
+
+        self.assertEqual(sqlite_url_path("sqlite://output/jobs/queue.sqlite"), DEFAULT_QUEUE_PATH)
+        self.assertEqual(sqlite_url_path("sqlite:///tmp/queue.sqlite"), Path("/tmp/queue.sqlite"))
+        self.assertEqual(
+            sqlite_url_path("sqlite://output/jobs/steps.sqlite"),
+            PROJECT_ROOT / "output" / "jobs" / "steps.sqlite",
+        )
+
+
+class GraphBrokerTests(unittest.TestCase):
+    def test_graph_dispatches_steps_through_broker(self) -> None:
+        plan = Plan(
+            topic="Test",
+            goal="Check",
+            steps=[{"id": "step-1", "title": "Run", "step_type": "RESEARCH", "expected_outcome": "Complete"}],
+            assumptions=[],
+            risks=[],
+        )
+
+        class Planner:
+            def generate_plan(self, topic, *, locale, context=None, extra_meta=None):  # noqa: ANN001
+                return plan
+
+        researcher = CountingResearcher()
+        with InProcessBroker(researcher) as broker:
+            graph = build_graph(
+                AppConfig(),
+                planner_agent=Planner(),
+                researcher_agent=researcher,
+                review_handler=lambda state: ("ACCEPT_PLAN", ""),
+                broker=broker,
+            )
+            result = graph.invoke(initial_state("Test Topic", locale="en-US").model_dump())
+
+        self.assertEqual(result["plan"]["steps"][0]["status"], StepStatus.COMPLETED.value)
+        self.assertEqual(len(researcher.calls), 1)
+        self.assertEqual(result["metadata"]["researcher_metrics"]["total_notes"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
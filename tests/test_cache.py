@@ -0,0 +1,168 @@
+"""Tests for the shared response cache."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.tools.cache import LRUCache, ResponseCache, SQLiteCacheStore, cache_key
+from src.tools.search import search_web
+
+
+def _slow_shared_lookup(db_path: str, counter_path: str, results: "multiprocessing.Queue") -> None:
+    cache = ResponseCache(store=SQLiteCacheStore(db_path), poll_interval=0.01)
+
+    def compute():
+        with open(counter_path, "a", encoding="utf-8") as handle:
+            handle.write("x")
+        time.sleep(0.3)
+        return {"answer": 42}
+
+    results.put(cache.get_or_compute("llm:key", compute))
+    cache.close()
+
+
+class LRUCacheTests(unittest.TestCase):
+    def test_evicts_least_recently_used_and_expired(self) -> None:
+        lru = LRUCache(max_entries=2)
+        lru.set("a", "1", None)
+        lru.set("b", "2", None)
+        lru.get("a", 0.0)
+        lru.set("c", "3", None)
+        self.assertIsNone(lru.get("b", 0.0))
+        self.assertEqual(lru.get("a", 0.0), "1")
+        lru.set("d", "4", expires_at=10.0)
+        self.assertIsNone(lru.get("d", 10.0))
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def test_concurrent_threads_share_one_computation(self) -> None:
+        cache = ResponseCache()
+        calls = []
+        start = threading.Event()
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return [1, 2]
+
+        def worker(out):
+            start.wait()
+            out.append(cache.get_or_compute("k", compute))
+
+        out: list = []
+        threads = [threading.Thread(target=worker, args=(out,)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        start.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(out, [[1, 2]] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats.misses, 1)
+        self.assertEqual(cache.stats.hits, 4)
+
+    def test_errors_are_not_cached(self) -> None:
+        cache = ResponseCache()
+
+        def failing():
+            raise RuntimeError("upstream down")
+
+        with self.assertRaises(RuntimeError):
+            cache.get_or_compute("k", failing)
+        self.assertEqual(cache.get_or_compute("k", lambda: "ok"), "ok")
+
+    def test_shared_store_serves_other_instances(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "cache.sqlite"
+            first = ResponseCache(store=SQLiteCacheStore(path))
+            second = ResponseCache(store=SQLiteCacheStore(path))
+            first.get_or_compute("k", lambda: {"v": 1}, ttl=60)
+            self.assertEqual(second.get_or_compute("k", lambda: {"v": 2}), {"v": 1})
+            self.assertEqual(second.stats.hits, 1)
+            first.close()
+            second.close()
+
+    def test_processes_single_flight_through_store(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "cache.sqlite")
+            counter_path = str(Path(tmpdir) / "calls.txt")
+            SQLiteCacheStore(db_path).close()
+            context = multiprocessing.get_context("spawn")
+            results = context.Queue()
+            processes = [
+                context.Process(target=_slow_shared_lookup, args=(db_path, counter_path, results))
+                for _ in range(3)
+            ]
+            for process in processes:
+                process.start()
+            values = [results.get(timeout=30) for _ in processes]
+            for process in processes:
+                process.join(timeout=30)
+            self.assertEqual(values, [{"answer": 42}] * 3)
+            self.assertEqual(Path(counter_path).read_text(encoding="utf-8"), "x")
+
+    def test_async_miss_waits_for_another_owner_flight(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "cache.sqlite")
+            owner = ResponseCache(store=SQLiteCacheStore(db_path))
+            waiter = ResponseCache(store=SQLiteCacheStore(db_path), poll_interval=0.01)
+            calls = []
+
+            async def compute():
+                calls.append(1)
+                return "late"
+
+            async def scenario():
+                owner.store.claim("llm:key", "other-process", ttl=30)
+                task = asyncio.ensure_future(waiter.aget_or_compute("llm:key", compute))
+                await asyncio.sleep(0.05)
+                self.assertFalse(task.done())
+                owner.store.set("llm:key", '"answer"', None)
+                owner.store.release("llm:key", "other-process")
+                return await task
+
+            self.assertEqual(asyncio.run(scenario()), "answer")
+            self.assertEqual(calls, [])
+            self.assertEqual(waiter.stats.waits, 1)
+            self.assertEqual(waiter.stats.shared_hits, 1)
+            self.assertEqual(
+                asyncio.run(waiter.aget_or_compute("llm:other", compute)), "late"
+            )
+            self.assertEqual(len(calls), 1)
+            owner.close()
+            waiter.close()
+
+    def test_writes_purge_expired_rows(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = SQLiteCacheStore(str(Path(tmpdir) / "cache.sqlite"))
+            store.set("stale", '"old"', expires_at=time.time() - 10)
+            cache = ResponseCache(store=store, purge_interval=3600)
+            cache.get_or_compute("fresh", lambda: "new")
+            self.assertEqual(len(store), 1)
+            store.set("stale", '"old"', expires_at=time.time() - 10)
+            cache.get_or_compute("fresher", lambda: "newer")
+            self.assertEqual(len(store), 3)
+            cache.close()
+
+
+class SearchCacheTests(unittest.TestCase):
+    def test_search_web_key_ignores_api_key(self) -> None:
+        cache = ResponseCache()
+        with patch("src.tools.search._request_search", return_value=[{"url": "https://a"}]) as request:
+            first = search_web("q", tavily_key="k1", cache=cache)
+            second = search_web("q", tavily_key="k2", cache=cache)
+            search_web("q", tavily_key="k1", max_results=3, cache=cache)
+        self.assertEqual(first, second)
+        self.assertEqual(request.call_count, 2)
+        self.assertNotEqual(cache_key("search", "q", 5, {}), cache_key("search", "q", 3, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Tests for per-endpoint circuit breakers."""
+
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from src.agents.researcher import ResearchContext, ResearcherAgent, ResearcherError
+from src.config.configuration import ApiConfig, AppConfig
+from src.models.plan import PlanStep
+from src.tools.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from src.tools.llm import LLMError, call_llm
+from src.tools.search import SearchError
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _failing():
+    raise SearchError("timeout")
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            "tavily", failure_ratio=0.5, min_calls=4, window_seconds=10, reset_seconds=5, clock=self.clock
+        )
+
+    def _fail(self, count: int) -> None:
+        for _ in range(count):
+            with self.assertRaises(SearchError):
+                self.breaker.call(_failing, failures=(SearchError,))
+
+    def test_opens_after_failure_ratio_and_fails_fast(self) -> None:
+        self.breaker.call(lambda: "ok")
+        self._fail(1)
+        self.assertEqual(self.breaker.state, CLOSED)  # below min_calls
+        self._fail(2)
+        self.assertEqual(self.breaker.state, OPEN)
+        calls = []
+        with self.assertRaises(CircuitOpenError) as ctx:
+            self.breaker.call(lambda: calls.append(1))
+        self.assertEqual(calls, [])
+        self.assertAlmostEqual(ctx.exception.retry_after, 5.0)
+
+    def test_old_failures_leave_the_window(self) -> None:
+        self._fail(3)
+        self.clock.now = 11.0
+        self._fail(1)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_half_open_trial_closes_or_reopens(self) -> None:
+        self._fail(4)
+        self.clock.now = 5.0
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())  # only one trial at a time
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.clock.now = 10.0
+        self.assertEqual(self.breaker.call(lambda: "ok"), "ok")
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.trips, 2)
+
+    def test_call_llm_fails_fast_when_open(self) -> None:
+        breaker = CircuitBreaker("openrouter", min_calls=1, reset_seconds=60)
+        with patch("src.tools.llm._request_completion", side_effect=LLMError("503")) as request:
+            for _ in range(3):
+                with self.assertRaises(LLMError):
+                    call_llm("p", model="m", openrouter_key="k", breaker=breaker)
+        self.assertEqual(request.call_count, 1)
+
+
+class ResearcherBreakerTests(unittest.TestCase):
+    def _context(self) -> ResearchContext:
+        step = PlanStep(id="step-1", title="Run", step_type="RESEARCH", expected_outcome="Done")
+        return ResearchContext(topic="Topic", locale="en-US", step=step, max_results=3, timeout_seconds=5)
+
+    def test_open_breaker_blocks_step_without_searching(self) -> None:
+        breaker = CircuitBreaker("tavily", min_calls=1, reset_seconds=60)
+        breaker.record_failure()
+        searches = []
+
+        def search(*args):
+            searches.append(args)
+            return []
+
+        config = AppConfig(api=ApiConfig(tavily_key="tvly"))
+        agent = ResearcherAgent(config, search_callable=search, breaker=breaker)
+        with self.assertRaisesRegex(ResearcherError, "circuit open"):
+            agent.run_step(self._context())
+        self.assertEqual(searches, [])
+
+    def test_half_open_breaker_runs_conservatively(self) -> None:
+        clock = FakeClock()
+        breaker = CircuitBreaker("tavily", min_calls=1, reset_seconds=1, clock=clock)
+        breaker.record_failure()
+        clock.now = 2.0
+        queries = []
+
+        def search(query, *args):
+            queries.append(query)
+            return [{"title": "T", "url": f"https://example.com/{len(queries)}", "snippet": "s"}]
+
+        config = AppConfig(api=ApiConfig(tavily_key="tvly"))
+        agent = ResearcherAgent(config, search_callable=search, breaker=breaker)
+        context = self._context()
+        context.query_expansions = 3
+        result = agent.run_step(context)
+        self.assertEqual(result.degradation_mode, "conservative")
+        self.assertEqual(len(queries), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import subprocess
+import sys
 import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from src.graph.state import GraphState
 from src.models.plan import Plan
@@ -17,14 +19,15 @@ class CliTests(unittest.TestCase):
     @patch("scripts.run_cli._emit_summary")
     @patch("scripts.run_cli._display_plan")
     @patch("scripts.run_cli.build_graph")
-    @patch("scripts.run_cli.load_config")
-    def test_auto_accept_flow(self, mock_load_config, mock_build_graph, mock_display, mock_summary, mock_store) -> None:
+    @patch("scripts.run_cli.load_config_provider")
+    def test_auto_accept_flow(self, mock_load_provider, mock_build_graph, mock_display, mock_summary, mock_store) -> None:
         from src.config.configuration import AppConfig, ApiConfig, ModelConfig
 
         model_cfg = ModelConfig(planner="gpt-test", researcher="gpt-test", reporter="gpt-test")
         api_cfg = ApiConfig(openrouter_key="dummy", tavily_key="tvly")
         config = AppConfig(models=model_cfg, api=api_cfg)
-        mock_load_config.return_value = config
+        provider = Mock(current=config)
+        mock_load_provider.return_value = provider
 
         plan = Plan(
             topic="Test",
@@ -50,8 +53,10 @@ class CliTests(unittest.TestCase):
             planner_agent=None,
             review_handler=None,
             researcher_agent=None,
+            config_provider=None,
         ):
             captured_handler["handler"] = review_handler
+            captured_handler["provider"] = config_provider
 
             class Stub:
                 def invoke(self, state):
@@ -76,6 +81,9 @@ class CliTests(unittest.TestCase):
         mock_summary.assert_called_once()
         mock_store.assert_not_called()
         assert captured_handler["handler"] is not None
+        assert captured_handler["provider"] is provider
+        provider.start_watching.assert_called_once()
+        provider.stop_watching.assert_called_once()
 
     def test_store_plan_persists_record(self) -> None:
         from scripts import run_cli
@@ -125,6 +133,63 @@ class CliTests(unittest.TestCase):
             self.assertEqual(record.review_log[0].action, ReviewAction.ACCEPT_PLAN)
             self.assertIsNone(record.telemetry)
 
+    def test_telemetry_kept_without_researcher_metrics(self) -> None:
+        from scripts import run_cli
+
+        telemetry = run_cli._extract_telemetry({"planner_coalesced_calls": 2})
+
+        self.assertIsNone(telemetry.researcher)
+        self.assertEqual(telemetry.planner_coalesced_calls, 2)
+
+    def test_planner_prompt_ids_round_trip_through_stored_record(self) -> None:
+        from scripts import run_cli
+
+        prompt_ids = ["planner_system@0123abcd", "planner_user@4567ef01"]
+        telemetry = run_cli._extract_telemetry({"planner_prompts": prompt_ids})
+        plan = Plan(
+            topic="T",
+            goal="G",
+            steps=[{"id": "step-1", "title": "S", "step_type": "RESEARCH", "expected_outcome": "O"}],
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            original_dir = run_cli.PLANS_DIR
+            run_cli.PLANS_DIR = Path(tmpdir)
+            try:
+                run_cli._store_plan(
+                    question="Q",
+                    locale="en-US",
+                    context="",
+                    plan=plan,
+                    review_log=[],
+                    telemetry=telemetry,
+                )
+            finally:
+                run_cli.PLANS_DIR = original_dir
+            line = (Path(tmpdir) / "plans.jsonl").read_text(encoding="utf-8").strip()
+
+        record = PlanRunRecord.model_validate_json(line)
+        self.assertEqual(record.telemetry.planner_prompt_ids, prompt_ids)
+
+    def test_show_review_help_skips_heavy_imports(self) -> None:
+        project_root = Path(__file__).resolve().parents[1]
+        probe = (
+            "import sys\n"
+            "from scripts import run_cli\n"
+            "run_cli.main(['--show-review-help'])\n"
+            "heavy = [m for m in ('langgraph', 'pydantic', 'httpx') if m in sys.modules]\n"
+            "sys.stderr.write(','.join(heavy))\n"
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", probe],
+            cwd=project_root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertIn("Human Review", completed.stdout)
+        self.assertEqual(completed.stderr, "")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,12 +2,21 @@
 
 from __future__ import annotations
 
+import os
 import tempfile
 import textwrap
+import time
 import unittest
 from pathlib import Path
 
-from src.config.configuration import AppConfig, load_config
+from src.config.configuration import (
+    AppConfig,
+    ConfigProvider,
+    apply_overrides,
+    get_config,
+    load_config,
+    parse_overrides,
+)
 
 
 class LoadConfigTests(unittest.TestCase):
@@ -70,5 +79,127 @@ class LoadConfigTests(unittest.TestCase):
             self.assertEqual(cfg.observability.langsmith_api_key, "lsm-secret")
 
 
+class ConfigOverlayTests(unittest.TestCase):
+    """Verify env and CLI layers on top of YAML and secret."""
+
+    def test_layers_apply_in_order_with_type_coercion(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings_path = Path(tmpdir) / "settings.yaml"
+            settings_path.write_text(
+                "search:\n  max_queries: 2\n  timeout_seconds: 4.0\nruntime:\n  human_review: true\n",
+                encoding="utf-8",
+            )
+            cfg = load_config(
+                settings_path=settings_path,
+                secret_path=Path(tmpdir) / "secret",
+                environ={
+                    "DEEP_RESEARCH__SEARCH__MAX_QUERIES": "6",
+                    "DEEP_RESEARCH__SEARCH__TIMEOUT_SECONDS": "3",
+                    "DEEP_RESEARCH__MODELS__PLANNER": "env-model",
+                    "UNRELATED": "ignored",
+                },
+                overrides=parse_overrides(["search.max_queries=9", "runtime.human_review=off"]),
+            )
+
+        self.assertEqual(cfg.search.max_queries, 9)
+        self.assertEqual(cfg.search.timeout_seconds, 3.0)
+        self.assertIsInstance(cfg.search.timeout_seconds, float)
+        self.assertEqual(cfg.models.planner, "env-model")
+        self.assertFalse(cfg.runtime.human_review)
+
+    def test_invalid_overrides_fail_loudly(self) -> None:
+        base = AppConfig()
+        with self.assertRaises(ValueError):
+            apply_overrides(base, {"search.unknown": "1"})
+        with self.assertRaises(ValueError):
+            apply_overrides(base, {"nope.max_queries": "1"})
+        with self.assertRaises(ValueError):
+            apply_overrides(base, {"search.max_queries": "many"})
+        with self.assertRaises(ValueError):
+            parse_overrides(["max_queries=3"])
+
+    def test_optional_fields_accept_null_and_base_is_untouched(self) -> None:
+        base = AppConfig()
+        base.api.tavily_key = "tvly"
+        updated = apply_overrides(base, {"api.tavily_key": "null", "search.local_index_path": "idx.db"})
+        self.assertIsNone(updated.api.tavily_key)
+        self.assertEqual(updated.search.local_index_path, "idx.db")
+        self.assertEqual(base.api.tavily_key, "tvly")
+
+    def test_provider_overrides_do_not_reparse_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings_path = Path(tmpdir) / "settings.yaml"
+            settings_path.write_text("search:\n  max_queries: 2\n", encoding="utf-8")
+            provider = ConfigProvider(settings_path, Path(tmpdir) / "secret", environ={})
+            settings_path.unlink()
+
+            updated = provider.set_overrides({"search.max_queries": "8"})
+            self.assertEqual(updated.search.max_queries, 8)
+            self.assertIs(provider.current, updated)
+
+
+class ConfigProviderTests(unittest.TestCase):
+    """Verify memoized config access and hot reload."""
+
+    def _write_settings(self, path: Path, max_queries: int) -> None:
+        path.write_text(f"search:\n  max_queries: {max_queries}\n", encoding="utf-8")
+        # Force a distinct mtime even on filesystems with coarse timestamps.
+        stamp = time.time_ns() + max_queries * 1_000_000_000
+        os.utime(path, ns=(stamp, stamp))
+
+    def test_get_returns_cached_snapshot_until_files_change(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings_path = Path(tmpdir) / "settings.yaml"
+            self._write_settings(settings_path, 4)
+            provider = ConfigProvider(settings_path, Path(tmpdir) / "secret")
+
+            first = provider.get()
+            self.assertIs(provider.get(), first)
+            self.assertEqual(first.search.max_queries, 4)
+
+            received: list[AppConfig] = []
+            provider.subscribe(received.append)
+            self._write_settings(settings_path, 7)
+
+            reloaded = provider.get()
+            self.assertIsNot(reloaded, first)
+            self.assertEqual(reloaded.search.max_queries, 7)
+            self.assertEqual(received, [reloaded])
+            self.assertIs(provider.current, reloaded)
+
+    def test_invalid_reload_keeps_previous_snapshot(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings_path = Path(tmpdir) / "settings.yaml"
+            self._write_settings(settings_path, 4)
+            provider = ConfigProvider(settings_path, Path(tmpdir) / "secret")
+
+            settings_path.write_text("- not\n- a mapping\n", encoding="utf-8")
+            with self.assertLogs("src.config.configuration", level="ERROR"):
+                self.assertFalse(provider.refresh())
+            self.assertEqual(provider.current.search.max_queries, 4)
+
+    def test_watcher_swaps_in_new_config(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings_path = Path(tmpdir) / "settings.yaml"
+            self._write_settings(settings_path, 2)
+            provider = ConfigProvider(settings_path, Path(tmpdir) / "secret")
+            provider.start_watching(interval_seconds=0.01)
+            try:
+                self._write_settings(settings_path, 9)
+                deadline = time.monotonic() + 2.0
+                while provider.current.search.max_queries != 9 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            finally:
+                provider.stop_watching()
+            self.assertEqual(provider.current.search.max_queries, 9)
+
+    def test_get_config_shares_provider_per_path(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings_path = Path(tmpdir) / "settings.yaml"
+            self._write_settings(settings_path, 5)
+            secret_path = Path(tmpdir) / "secret"
+            self.assertIs(get_config(settings_path, secret_path), get_config(settings_path, secret_path))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,111 @@
+"""Tests for URL canonicalization and near-duplicate detection."""
+
+from __future__ import annotations
+
+import unittest
+
+from src.agents.researcher import ResearchContext, ResearcherAgent
+from src.config.configuration import ApiConfig, AppConfig
+from src.models.plan import PlanStep, ResearchNote
+from src.tools.dedup import NearDuplicateIndex, canonicalize_url, simhash
+from src.tools.search import fuse_results, normalize_results
+
+_SNIPPET = (
+    "LangGraph lets developers build stateful multi-agent applications "
+    "with cycles, persistence and human-in-the-loop checkpoints."
+)
+
+
+class CanonicalizeUrlTests(unittest.TestCase):
+    def test_collapses_common_variants(self) -> None:
+        variants = [
+            "https://example.com/docs/guide",
+            "http://example.com/docs/guide/",
+            "https://www.example.com/docs/guide#intro",
+            "https://EXAMPLE.com:443/docs//guide?utm_source=news&fbclid=abc",
+            "https://m.example.com/docs/guide",
+        ]
+        canonical = {canonicalize_url(url) for url in variants}
+        self.assertEqual(canonical, {"https://example.com/docs/guide"})
+
+    def test_keeps_meaningful_query_params_sorted(self) -> None:
+        self.assertEqual(
+            canonicalize_url("https://example.com/search?q=graph&page=2&utm_medium=x"),
+            "https://example.com/search?page=2&q=graph",
+        )
+
+    def test_mirror_mapping(self) -> None:
+        mirrors = {"docs-mirror.org": "docs.org"}
+        self.assertEqual(
+            canonicalize_url("https://docs-mirror.org/a", mirrors=mirrors),
+            canonicalize_url("https://docs.org/a"),
+        )
+
+    def test_malformed_ports_do_not_raise(self) -> None:
+        self.assertEqual(canonicalize_url("http://example.com:abc/x"), "https://example.com/x")
+        self.assertEqual(canonicalize_url("https://example.com:99999/x"), "https://example.com/x")
+        self.assertEqual(canonicalize_url("http://[::1/x"), "http://[::1/x")
+        fused = fuse_results([[{"title": "Bad", "url": "http://example.com:abc/x", "snippet": ""}]])
+        self.assertEqual(len(fused), 1)
+
+
+class NearDuplicateIndexTests(unittest.TestCase):
+    def test_simhash_is_stable_for_small_edits(self) -> None:
+        edited = _SNIPPET.replace("developers", "engineers")
+        distance = (simhash(_SNIPPET) ^ simhash(edited)).bit_count()
+        self.assertLess(distance, (simhash(_SNIPPET) ^ simhash("unrelated text about cooking pasta at home tonight")).bit_count())
+
+    def test_check_and_add_rejects_url_and_content_duplicates(self) -> None:
+        index = NearDuplicateIndex()
+        self.assertTrue(index.check_and_add("https://example.com/a", _SNIPPET))
+        self.assertFalse(index.check_and_add("http://www.example.com/a/", "different"))
+        self.assertFalse(index.check_and_add("https://mirror.net/copy", _SNIPPET))
+        self.assertTrue(index.check_and_add("https://example.com/b", "short text"))
+        self.assertTrue(index.check_and_add("https://example.com/c", "short text"))
+
+    def test_tavily_content_feeds_near_duplicate_check(self) -> None:
+        results = normalize_results(
+            [
+                {"title": "A", "url": "https://example.com/a", "content": _SNIPPET},
+                {"title": "B", "url": "https://mirror.net/b", "content": _SNIPPET},
+            ]
+        )
+        self.assertEqual(results[0]["snippet"], _SNIPPET)
+        index = NearDuplicateIndex()
+        self.assertTrue(index.check_and_add(results[0]["url"], results[0]["snippet"]))
+        self.assertFalse(index.check_and_add(results[1]["url"], results[1]["snippet"]))
+
+    def test_researcher_skips_notes_seen_in_prior_steps(self) -> None:
+        config = AppConfig(api=ApiConfig(openrouter_key="dummy", tavily_key="tvly"))
+
+        def fake_search(*args):
+            return [
+                {"title": "Copy", "url": "https://mirror.net/langgraph", "snippet": _SNIPPET},
+                {"title": "Fresh", "url": "https://example.com/fresh", "snippet": "New angle"},
+            ]
+
+        agent = ResearcherAgent(config, search_callable=fake_search)
+        step = PlanStep(
+            id="step-2",
+            title="Compare frameworks",
+            step_type="RESEARCH",
+            expected_outcome="Contrast options",
+        )
+        prior = ResearchNote(source="https://example.com/langgraph", claim="Seen", evidence=_SNIPPET)
+
+        result = agent.run_step(
+            ResearchContext(
+                topic="LangGraph",
+                locale="en-US",
+                step=step,
+                max_results=3,
+                timeout_seconds=5.0,
+                prior_notes=[prior],
+            )
+        )
+
+        self.assertEqual(result.references, ["https://example.com/fresh"])
+
+
+if __name__ == "__main__":
+    unittest.main()
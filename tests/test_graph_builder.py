@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import json
+import tempfile
 import unittest
+from pathlib import Path
 
 from src.agents.researcher import ResearchContext, ResearcherResult
 from src.config.configuration import AppConfig
 from src.graph.builder import build_graph, initial_state
+from src.graph.state import GraphState
 from src.models.plan import Plan, ResearchNote, StepStatus
+from src.tools.dedup import NearDuplicateIndex
 
 
 class DummyPlanner:
@@ -47,6 +52,34 @@ class DummyResearcher:
 
 
 class GraphBuilderTests(unittest.TestCase):
+    def test_unknown_report_format_fails_before_the_run(self) -> None:
+        cfg = AppConfig()
+        cfg.runtime.report_formats = "markdown,pdff"
+        with self.assertRaises(ValueError):
+            build_graph(cfg, planner_agent=DummyPlanner(Plan(topic="T", goal="G", steps=[])))
+
+    def test_runs_get_their_own_dedup_index_without_prior_notes(self) -> None:
+        plan = Plan(
+            topic="Dedup",
+            goal="Check",
+            steps=[{"id": "step-1", "title": "Step", "step_type": "RESEARCH", "expected_outcome": "Done"}],
+        )
+        researcher = DummyResearcher()
+        graph = build_graph(
+            AppConfig(),
+            planner_agent=DummyPlanner(plan),
+            review_handler=lambda state: ("ACCEPT_PLAN", ""),
+            researcher_agent=researcher,
+        )
+
+        graph.invoke(initial_state("Dedup", locale="en-US").model_dump())
+        graph.invoke(initial_state("Dedup", locale="en-US").model_dump())
+
+        first, second = researcher.calls
+        self.assertIsInstance(first.dedup_index, NearDuplicateIndex)
+        self.assertIsNot(first.dedup_index, second.dedup_index)
+        self.assertEqual(list(first.prior_notes), [])
+
     def test_graph_runs_through_reporter(self) -> None:
         cfg = AppConfig()
         plan = Plan(
@@ -100,6 +133,7 @@ class GraphBuilderTests(unittest.TestCase):
         summary = result["metadata"].get("reporter_summary")
         self.assertIsNotNone(summary)
         self.assertEqual(summary["total_notes"], 1)
+        self.assertEqual(result["scratchpad"], [{"step_id": "step-1", "index": 0}])
         markdown = result["metadata"].get("report_markdown")
         assert markdown is not None
         assert "# Research Report" in markdown
@@ -175,6 +209,62 @@ class GraphBuilderTests(unittest.TestCase):
         markdown = result["metadata"].get("report_markdown")
         assert markdown is not None
 
+    def test_reporter_streams_to_report_dir(self) -> None:
+        plan = Plan(
+            topic="Streamed Report",
+            goal="Check",
+            steps=[
+                {
+                    "id": "step-1",
+                    "title": "Run",
+                    "step_type": "RESEARCH",
+                    "expected_outcome": "Complete",
+                }
+            ],
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cfg = AppConfig()
+            cfg.runtime.report_dir = tmpdir
+            cfg.runtime.report_formats = "markdown, json"
+            graph = build_graph(
+                cfg,
+                planner_agent=DummyPlanner(plan),
+                review_handler=lambda state: ("ACCEPT_PLAN", ""),
+                researcher_agent=DummyResearcher(),
+            )
+            result = graph.invoke(initial_state("Streamed Report", locale="en-US").model_dump())
+
+            self.assertNotIn("report_markdown", result["metadata"])
+            report_path = Path(result["metadata"]["report_path"])
+            self.assertEqual(report_path.parent, Path(tmpdir))
+            self.assertIn("# Research Report: Streamed Report", report_path.read_text(encoding="utf-8"))
+            json_path = Path(result["metadata"]["report_paths"]["json"])
+            self.assertEqual(json_path.suffix, ".json")
+            self.assertEqual(json.loads(json_path.read_text(encoding="utf-8"))["topic"], "Streamed Report")
+
+
+class ScratchpadTests(unittest.TestCase):
+    def test_scratchpad_holds_bounded_references(self) -> None:
+        plan = Plan(
+            topic="T",
+            goal="G",
+            steps=[
+                {"id": "step-1", "title": "A", "step_type": "RESEARCH", "expected_outcome": "x"},
+                {"id": "step-2", "title": "B", "step_type": "RESEARCH", "expected_outcome": "y"},
+            ],
+        )
+        state = GraphState(topic="T", plan=plan)
+        for step_id, claims in (("step-1", ["a0", "a1"]), ("step-2", ["b0", "b1"])):
+            for claim in claims:
+                plan.append_note(step_id, ResearchNote(source=f"https://example.com/{claim}", claim=claim))
+                state.add_scratchpad_note(step_id, len(plan.get_step(step_id).notes) - 1, limit=3)
+
+        self.assertEqual([note.claim for note in state.scratchpad_notes()], ["a1", "b0", "b1"])
+        self.assertEqual(state.scratchpad_evicted, {"step-1": 1})
+        self.assertIs(state.resolve_note(state.scratchpad[0]), plan.steps[0].notes[1])
+        # Notes are serialized once, on their step; the scratchpad only carries refs.
+        self.assertEqual(state.model_dump()["scratchpad"][0], {"step_id": "step-1", "index": 1})
+
 
 if __name__ == "__main__":
     unittest.main()
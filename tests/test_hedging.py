@@ -0,0 +1,137 @@
+"""Tests for hedged async requests."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.tools.hedging import Hedger
+from src.tools.search import asearch_web, search_web
+
+
+class Attempts:
+    """Async callable whose n-th attempt sleeps `delays[n]` seconds (or raises)."""
+
+    def __init__(self, *delays) -> None:
+        self.delays = list(delays)
+        self.started = 0
+        self.cancelled = 0
+
+    async def __call__(self) -> int:
+        index = self.started
+        self.started += 1
+        delay = self.delays[index]
+        if isinstance(delay, Exception):
+            raise delay
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return index
+
+
+class HedgerTests(unittest.TestCase):
+    def test_fast_primary_is_not_hedged(self) -> None:
+        hedger = Hedger("test", initial_delay=0.05, max_extra_ratio=1.0)
+        attempts = Attempts(0.0)
+        self.assertEqual(asyncio.run(hedger.run(attempts)), 0)
+        self.assertEqual((attempts.started, hedger.hedged), (1, 0))
+
+    def test_slow_primary_loses_to_hedge_and_is_cancelled(self) -> None:
+        hedger = Hedger("test", initial_delay=0.02, max_extra_ratio=1.0)
+        attempts = Attempts(1.0, 0.0)
+        self.assertEqual(asyncio.run(hedger.run(attempts)), 1)
+        self.assertEqual((hedger.hedged, hedger.hedge_wins, attempts.cancelled), (1, 1, 1))
+
+    def test_failed_attempt_falls_back_to_the_other(self) -> None:
+        hedger = Hedger("test", initial_delay=0.02, max_extra_ratio=1.0)
+        attempts = Attempts(0.05, RuntimeError("boom"))
+        self.assertEqual(asyncio.run(hedger.run(attempts)), 0)
+
+    def test_extra_calls_are_capped(self) -> None:
+        hedger = Hedger("test", initial_delay=0.01, max_extra_ratio=0.25)
+
+        async def main():
+            for _ in range(8):
+                await hedger.run(Attempts(0.03, 0.03))
+
+        asyncio.run(main())
+        self.assertEqual(hedger.hedged, 2)
+
+    def test_cancelled_caller_cancels_pending_attempts(self) -> None:
+        hedger = Hedger("test", initial_delay=0.5, max_extra_ratio=1.0)
+        attempts = Attempts(5.0)
+
+        async def main():
+            task = asyncio.ensure_future(hedger.run(attempts))
+            await asyncio.sleep(0.02)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            await asyncio.sleep(0)
+
+        asyncio.run(main())
+        self.assertEqual((attempts.started, attempts.cancelled), (1, 1))
+
+    def test_failure_latency_is_observed(self) -> None:
+        hedger = Hedger("test", initial_delay=1.0, min_samples=1, min_delay=0.0)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(hedger.run(Attempts(RuntimeError("boom"))))
+        with self.assertRaises(RuntimeError):
+            hedger.call(lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+        self.assertEqual(len(hedger._latencies), 2)
+
+    def test_sync_call_hedges_slow_attempt(self) -> None:
+        hedger = Hedger("test", initial_delay=0.02, max_extra_ratio=1.0)
+        delays = iter([0.5, 0.0])
+        lock = threading.Lock()
+
+        def attempt() -> float:
+            with lock:
+                delay = next(delays)
+            time.sleep(delay)
+            return delay
+
+        self.assertEqual(hedger.call(attempt), 0.0)
+        self.assertEqual((hedger.hedged, hedger.hedge_wins), (1, 1))
+
+    def test_search_web_hedges_slow_request(self) -> None:
+        hedger = Hedger("tavily", initial_delay=0.02, max_extra_ratio=1.0)
+        calls = iter([0.5, 0.0])
+        lock = threading.Lock()
+
+        def fake_request(*args):
+            with lock:
+                delay = next(calls)
+            time.sleep(delay)
+            return [{"url": f"https://example.com/{delay}"}]
+
+        with patch("src.tools.search._request_search", side_effect=fake_request):
+            results = search_web("q-sync", tavily_key="k", hedger=hedger)
+        self.assertEqual(results, [{"url": "https://example.com/0.0"}])
+
+    def test_delay_tracks_latency_percentile(self) -> None:
+        hedger = Hedger("test", percentile=0.9, min_samples=10, min_delay=0.0)
+        for latency in range(1, 11):
+            hedger._finish(latency / 100, hedge_won=False)
+        self.assertAlmostEqual(hedger.delay, 0.09)
+
+    def test_asearch_web_hedges_slow_request(self) -> None:
+        hedger = Hedger("tavily", initial_delay=0.02, max_extra_ratio=1.0)
+        attempts = Attempts(1.0, 0.0)
+
+        async def fake_request(*args):
+            index = await attempts()
+            return [{"url": f"https://example.com/{index}"}]
+
+        with patch("src.tools.search._arequest_search", side_effect=fake_request):
+            results = asyncio.run(asearch_web("q", tavily_key="k", hedger=hedger))
+        self.assertEqual(results, [{"url": "https://example.com/1"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""Tests for the SQLite job queue and the multi-process worker supervisor."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.jobs.queue import DONE, FAILED, QUEUED, JobQueue, LeaseLostError
+from src.jobs.supervisor import WorkerCrashLoopError, WorkerOptions, WorkerSupervisor, worker_loop
+
+
+def square_handler_factory():
+    def handle(job):
+        return {"square": job.payload["n"] ** 2, "pid": os.getpid()}
+
+    return handle
+
+
+def crash_once_handler_factory():
+    def handle(job):
+        marker = Path(job.payload["marker"])
+        if not marker.exists():
+            marker.write_text("crashed", encoding="utf-8")
+            os._exit(1)  # simulate a worker dying mid-job
+        return "recovered"
+
+    return handle
+
+
+class JobQueueTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmpdir.name) / "queue.sqlite"
+        self.queue = JobQueue(self.path)
+
+    def tearDown(self) -> None:
+        self.queue.close()
+        self._tmpdir.cleanup()
+
+    def test_lease_ack_in_fifo_order(self) -> None:
+        first = self.queue.enqueue("research", {"question": "a"})
+        self.queue.enqueue("research", {"question": "b"})
+        job = self.queue.lease("w1")
+        self.assertEqual((job.id, job.payload, job.attempts), (first, {"question": "a"}, 1))
+        self.queue.ack(job.id, "w1", {"ok": True})
+        self.assertEqual(self.queue.get(first).result, {"ok": True})
+        self.assertEqual(self.queue.stats()[DONE], 1)
+        with self.assertRaises(LeaseLostError):
+            self.queue.ack(job.id, "w1")
+
+    def test_idempotency_key_deduplicates(self) -> None:
+        first = self.queue.enqueue("research", {"question": "a"}, idempotency_key="q-a")
+        self.assertEqual(self.queue.enqueue("research", {"question": "a"}, idempotency_key="q-a"), first)
+        self.assertEqual(self.queue.pending(), 1)
+
+    def test_expired_lease_is_recovered_until_attempts_exhausted(self) -> None:
+        job_id = self.queue.enqueue("research", {}, max_attempts=2)
+        self.queue.lease("crashed", lease_seconds=0.01)
+        time.sleep(0.02)
+        retry = self.queue.lease("w2", lease_seconds=0.01)
+        self.assertEqual((retry.id, retry.attempts), (job_id, 2))
+        with self.assertRaises(LeaseLostError):
+            self.queue.heartbeat(job_id, "crashed")
+        time.sleep(0.02)
+        self.assertIsNone(self.queue.lease("w3"))
+        self.assertEqual(self.queue.get(job_id).status, FAILED)
+
+    def test_fail_requeues_then_gives_up(self) -> None:
+        job_id = self.queue.enqueue("research", {}, max_attempts=2)
+        self.assertEqual(self.queue.fail(self.queue.lease("w").id, "w", "boom"), QUEUED)
+        self.assertEqual(self.queue.fail(self.queue.lease("w").id, "w", "boom"), FAILED)
+        self.assertEqual(self.queue.get(job_id).error, "boom")
+
+
+def broken_handler_factory():
+    raise RuntimeError("broken settings")
+
+
+class WorkerSupervisorTests(unittest.TestCase):
+    def test_workers_drain_queue(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "queue.sqlite"
+            with JobQueue(path) as queue:
+                ids = [queue.enqueue("square", {"n": n}) for n in range(12)]
+            supervisor = WorkerSupervisor(
+                path,
+                square_handler_factory,
+                processes=2,
+                options=WorkerOptions(poll_interval=0.05, idle_exit_seconds=1.0),
+            )
+            counts = supervisor.run(check_interval=0.05)
+            self.assertEqual(counts[DONE], 12)
+            with JobQueue(path) as queue:
+                self.assertEqual([queue.get(job_id).result["square"] for job_id in ids], [n * n for n in range(12)])
+
+    def test_worker_flushes_when_idle_and_closes_on_exit(self) -> None:
+        events = []
+
+        def handle(job):
+            events.append(("job", job.payload["n"]))
+
+        handle.flush = lambda: events.append("flush")
+        handle.close = lambda: events.append("close")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "queue.sqlite"
+            with JobQueue(path) as queue:
+                for n in range(2):
+                    queue.enqueue("square", {"n": n})
+            worker_loop(path, lambda: handle, WorkerOptions(poll_interval=0.01, idle_exit_seconds=0.05))
+
+        self.assertEqual(events, [("job", 0), ("job", 1), "flush", "close"])
+
+    def test_crashed_worker_job_is_recovered_via_lease_expiry(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "queue.sqlite"
+            with JobQueue(path) as queue:
+                job_id = queue.enqueue("flaky", {"marker": str(Path(tmpdir) / "marker")})
+            supervisor = WorkerSupervisor(
+                path,
+                crash_once_handler_factory,
+                processes=1,
+                options=WorkerOptions(lease_seconds=0.5, poll_interval=0.05),
+            )
+            supervisor.run(check_interval=0.05)
+            self.assertGreaterEqual(supervisor.restarts, 1)
+            with JobQueue(path) as queue:
+                job = queue.get(job_id)
+            self.assertEqual((job.status, job.result, job.attempts), (DONE, "recovered", 2))
+
+    def test_worker_crashing_on_startup_gives_up_after_backoff(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "queue.sqlite"
+            with JobQueue(path) as queue:
+                queue.enqueue("square", {"n": 2})
+            supervisor = WorkerSupervisor(
+                path,
+                broken_handler_factory,
+                processes=1,
+                options=WorkerOptions(poll_interval=0.05),
+                max_restarts=2,
+                restart_backoff=0.1,
+            )
+            started_at = time.monotonic()
+            with self.assertRaises(WorkerCrashLoopError):
+                supervisor.run(check_interval=0.02)
+            # Two restarts after 0.1s and 0.2s of backoff, then the third crash gives up.
+            self.assertEqual(supervisor.restarts, 2)
+            self.assertGreaterEqual(time.monotonic() - started_at, 0.3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Tests for the local BM25 index and its Researcher integration."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.agents.researcher import ResearchContext, ResearcherAgent
+from src.config.configuration import ApiConfig, AppConfig
+from src.models.plan import PlanStep, ResearchNote
+from src.tools.local_index import LocalIndex
+
+
+def _notes() -> list[ResearchNote]:
+    return [
+        ResearchNote(
+            source="https://example.com/checkpoint",
+            claim="LangGraph checkpointing persists graph state",
+            evidence="Checkpointers store LangGraph state between runs for resumable workflows.",
+        ),
+        ResearchNote(
+            source="https://example.com/pasta",
+            claim="Cooking pasta",
+            evidence="Boil water and add salt before the pasta.",
+        ),
+        ResearchNote(
+            source="https://example.com/human",
+            claim="LangGraph human-in-the-loop interrupts",
+            evidence="Interrupts pause a LangGraph run until a reviewer responds.",
+        ),
+    ]
+
+
+class LocalIndexTests(unittest.TestCase):
+    def test_bm25_ranks_relevant_documents_and_persists(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "index.sqlite"
+            with LocalIndex(path) as index:
+                self.assertEqual(index.add_notes(_notes()), 3)
+                # Re-ingesting the same notes is a no-op.
+                self.assertEqual(index.add_notes(_notes()), 0)
+
+            with LocalIndex(path) as reopened:
+                self.assertEqual(len(reopened), 3)
+                hits = reopened.search("LangGraph checkpointing state", limit=2)
+                self.assertEqual(hits[0].source, "https://example.com/checkpoint")
+                self.assertTrue(all("pasta" not in hit.source for hit in hits))
+                self.assertEqual(reopened.search("quantum chromodynamics"), [])
+
+    def test_incremental_updates_are_searchable(self) -> None:
+        with LocalIndex(":memory:") as index:
+            index.add_notes(_notes()[:1])
+            self.assertTrue(index.add_document("https://example.com/new", "Streaming tokens", "LangGraph streams tokens"))
+            self.assertEqual(index.search("streams tokens")[0].source, "https://example.com/new")
+
+    def test_cjk_text_is_searchable(self) -> None:
+        with LocalIndex(":memory:") as index:
+            index.add_document("https://example.cn/a", "深度调研代理", "使用 LangGraph 构建调研流程")
+            self.assertEqual(len(index.search("调研代理")), 1)
+
+
+class ResearcherLocalIndexTests(unittest.TestCase):
+    def _step(self) -> PlanStep:
+        return PlanStep(
+            id="step-1",
+            title="LangGraph checkpointing",
+            step_type="RESEARCH",
+            expected_outcome="Explain state persistence",
+        )
+
+    def test_local_recall_skips_tavily(self) -> None:
+        config = AppConfig(api=ApiConfig(openrouter_key="dummy", tavily_key=None))
+        config.search.local_min_score = 0.1
+
+        def fail_search(*args):
+            raise AssertionError("Tavily should not be called")
+
+        with LocalIndex(":memory:") as index:
+            index.add_notes(_notes())
+            agent = ResearcherAgent(config, search_callable=fail_search, local_index=index)
+            result = agent.run_step(
+                ResearchContext(
+                    topic="LangGraph",
+                    locale="en-US",
+                    step=self._step(),
+                    max_results=3,
+                    timeout_seconds=5.0,
+                    max_notes=1,
+                )
+            )
+
+        self.assertEqual(result.references, ["https://example.com/checkpoint"])
+        self.assertGreaterEqual(result.local_hits, 1)
+
+    def test_insufficient_recall_falls_back_and_indexes_web_notes(self) -> None:
+        config = AppConfig(api=ApiConfig(openrouter_key="dummy", tavily_key="tvly"))
+        config.search.local_min_score = 0.1
+
+        def fake_search(*args):
+            return [{"title": "Web result", "url": "https://web.example/a", "snippet": "LangGraph web"}]
+
+        with LocalIndex(":memory:") as index:
+            agent = ResearcherAgent(config, search_callable=fake_search, local_index=index)
+            result = agent.run_step(
+                ResearchContext(
+                    topic="LangGraph",
+                    locale="en-US",
+                    step=self._step(),
+                    max_results=3,
+                    timeout_seconds=5.0,
+                    max_notes=1,
+                )
+            )
+            self.assertEqual(result.local_hits, 0)
+            self.assertEqual(result.references, ["https://web.example/a"])
+            self.assertEqual(len(index), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
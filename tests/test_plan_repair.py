@@ -0,0 +1,88 @@
+"""Tests for the local planner-output repair pipeline."""
+
+from __future__ import annotations
+
+import unittest
+
+from pydantic import ValidationError
+
+from src.agents.plan_repair import parse_plan, repair_stats, reset_repair_stats
+
+_CLEAN = (
+    '{"topic": "Solar storage", "goal": "Compare options", "assumptions": [], "risks": [],'
+    ' "steps": [{"id": "step-1", "title": "Survey", "step_type": "RESEARCH",'
+    ' "expected_outcome": "Vendor list"}]}'
+)
+
+
+class PlanRepairTests(unittest.TestCase):
+    def setUp(self) -> None:
+        reset_repair_stats()
+
+    def test_clean_payload_takes_fast_path(self) -> None:
+        result = parse_plan(_CLEAN)
+
+        self.assertEqual(result.repairs, [])
+        self.assertEqual(result.plan.goal, "Compare options")
+        self.assertEqual(repair_stats(), {"clean": 1})
+
+    def test_fenced_payload_with_prose_and_trailing_comma(self) -> None:
+        raw = (
+            "Here is the plan:\n```json\n"
+            '{"topic": "Solar storage", "goal": "Compare {options}", // comment\n'
+            ' "steps": [{"id": "step-1", "title": "Survey", "step_type": "RESEARCH",'
+            ' "expected_outcome": "Vendor list",},], "metadata": {"reviewer": None}}\n```'
+        )
+
+        result = parse_plan(raw)
+
+        self.assertEqual(result.repairs, ["json_extracted", "lenient_json"])
+        self.assertEqual(result.plan.goal, "Compare {options}")
+        self.assertIsNone(result.plan.metadata.reviewer)
+
+    def test_fence_only_payload(self) -> None:
+        result = parse_plan(f"```json\n{_CLEAN}\n```")
+
+        self.assertEqual(result.repairs, ["fence_stripped"])
+        self.assertEqual(len(result.plan.steps), 1)
+
+    def test_fills_defaults_and_renumbers_steps(self) -> None:
+        raw = (
+            '{"steps": ['
+            '{"id": "a", "title": "Survey vendors", "step_type": "research"},'
+            '{"id": "b", "expected_outcome": "Cost table", "step_type": "compare"}],'
+            ' "risks": "Prices move quickly", "assumptions": null}'
+        )
+
+        result = parse_plan(raw, topic="Solar storage", locale="en-US")
+
+        self.assertEqual(result.repairs, ["defaults_filled", "steps_renumbered"])
+        plan = result.plan
+        self.assertEqual((plan.topic, plan.goal), ("Solar storage", "Solar storage"))
+        self.assertEqual(plan.risks, ["Prices move quickly"])
+        self.assertEqual(plan.assumptions, [])
+        self.assertEqual([step.id for step in plan.steps], ["step-1", "step-2"])
+        self.assertEqual(plan.steps[0].expected_outcome, "Survey vendors")
+        self.assertEqual(plan.steps[1].title, "Cost table")
+        self.assertEqual([step.step_type.value for step in plan.steps], ["RESEARCH", "RESEARCH"])
+        self.assertEqual(plan.metadata.locale, "en-US")
+        self.assertEqual(repair_stats()["repaired"], 1)
+        self.assertEqual(repair_stats()["steps_renumbered"], 1)
+
+    def test_unparseable_text_raises_strict_error(self) -> None:
+        with self.assertRaises(ValidationError):
+            parse_plan("not-json")
+
+        self.assertEqual(repair_stats(), {"failed": 1})
+
+    def test_repaired_payload_still_invalid_raises(self) -> None:
+        with self.assertRaises(ValidationError):
+            parse_plan('```\n{"topic": "Solar storage", "steps": "none"}\n```')
+
+        stats = repair_stats()
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(stats["fence_stripped"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -41,6 +41,24 @@ class PlannerAgentTests(unittest.TestCase):
         self.assertEqual(plan.topic, "Sample")
         mock_call_llm.assert_called_once()
 
+    @patch("src.agents.planner.call_llm")
+    def test_generate_plan_renders_user_template(self, mock_call_llm) -> None:
+        mock_call_llm.return_value = Plan(
+            topic="Sample",
+            goal="Goal",
+            steps=[{"id": "step-1", "title": "T", "step_type": "RESEARCH", "expected_outcome": "R"}],
+        ).model_dump_json()
+
+        self.agent.generate_plan("Sample", locale="en-US")
+
+        prompt = mock_call_llm.call_args.args[0]
+        kwargs = mock_call_llm.call_args.kwargs
+        self.assertIn("User Question: Sample", prompt)
+        self.assertIn("Context Hints: (none)", prompt)
+        self.assertNotIn("{", prompt)
+        self.assertEqual(kwargs["prompt_version"], ",".join(self.agent.prompt_ids))
+        self.assertTrue(self.agent.prompt_ids[1].startswith("planner_user@"))
+
     @patch("src.agents.planner.call_llm")
     def test_generate_plan_invalid_json(self, mock_call_llm) -> None:
         # Intentionally feed malformed payload to exercise the validation failure path.
@@ -49,6 +67,62 @@ class PlannerAgentTests(unittest.TestCase):
         with self.assertRaises(ValidationError):
             self.agent.generate_plan("Sample", locale="en-US")
 
+    @patch("src.agents.planner.call_llm")
+    def test_generate_plan_repairs_fenced_output_without_retry(self, mock_call_llm) -> None:
+        mock_call_llm.return_value = (
+            '```json\n{"goal": "Goal", "steps": [{"id": "s1", "title": "Test",'
+            ' "step_type": "research", "expected_outcome": "Result",}]}\n```'
+        )
+
+        plan = self.agent.generate_plan("Sample", locale="en-US")
+
+        mock_call_llm.assert_called_once()
+        self.assertEqual(plan.topic, "Sample")
+        self.assertEqual(plan.steps[0].id, "step-1")
+        self.assertEqual(plan.metadata.locale, "en-US")
+
+    @patch("src.agents.planner.call_llm")
+    def test_candidates_keep_best_valid_plan(self, mock_call_llm) -> None:
+        def plan_json(steps: int, title: str) -> str:
+            return Plan(
+                topic="Solar storage",
+                goal=f"Assess {title}",
+                steps=[
+                    {
+                        "id": f"step-{idx}",
+                        "title": f"{title} {idx}",
+                        "step_type": "RESEARCH",
+                        "expected_outcome": "Findings",
+                    }
+                    for idx in range(1, steps + 1)
+                ],
+            ).model_dump_json()
+
+        responses = {
+            0: "not-json",
+            1: plan_json(1, "Unrelated"),
+            2: plan_json(4, "Solar storage economics"),
+        }
+        mock_call_llm.side_effect = lambda prompt, **kwargs: responses[kwargs["seed"]]
+        self.app_cfg.models.planner_candidates = 3
+        self.app_cfg.models.planner_candidate_models = "alt-model"
+
+        plan = self.agent.generate_plan("Solar storage", locale="en-US")
+
+        self.assertEqual(len(plan.steps), 4)
+        self.assertEqual(mock_call_llm.call_count, 3)
+        models = sorted(call.kwargs["model"] for call in mock_call_llm.call_args_list)
+        self.assertEqual(models, ["alt-model", "gpt-test", "gpt-test"])
+
+    @patch("src.agents.planner.call_llm")
+    def test_candidates_all_invalid_raises(self, mock_call_llm) -> None:
+        mock_call_llm.return_value = "not-json"
+        self.app_cfg.models.planner_candidates = 2
+
+        with self.assertRaises(ValidationError):
+            self.agent.generate_plan("Sample", locale="en-US")
+        self.assertEqual(mock_call_llm.call_count, 2)
+
     def test_missing_api_key_raises(self) -> None:
         cfg = AppConfig()
         agent = PlannerAgent(cfg)
@@ -0,0 +1,82 @@
+"""Tests for the compiled prompt registry."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.tools.prompts import PromptError, PromptRegistry, prompt_registry
+
+
+class PromptRegistryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self._tmp.name)
+        (self.directory / "greeting.jinja").write_text(
+            "Hello {{ name }}! Notes: {{ notes | default('(none)') }}", encoding="utf-8"
+        )
+        (self.directory / "system.txt").write_text("Literal {{ braces }} stay.", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_renders_variables_and_defaults(self) -> None:
+        registry = PromptRegistry(self.directory)
+
+        self.assertEqual(registry.render("greeting", name="Ada"), "Hello Ada! Notes: (none)")
+        self.assertEqual(
+            registry.render("greeting", name="Ada", notes="brief"), "Hello Ada! Notes: brief"
+        )
+        self.assertEqual(registry.render("system"), "Literal {{ braces }} stay.")
+
+    def test_missing_variable_and_prompt_raise(self) -> None:
+        registry = PromptRegistry(self.directory)
+
+        with self.assertRaises(PromptError):
+            registry.render("greeting", notes="brief")
+        with self.assertRaises(PromptError):
+            registry.get("absent")
+
+    def test_full_jinja_syntax_and_syntax_errors(self) -> None:
+        (self.directory / "steps.jinja").write_text(
+            "{% for item in items %}{{ loop.index }}. {{ item | upper }}\n{% endfor %}", encoding="utf-8"
+        )
+        (self.directory / "broken.jinja").write_text("{% if %}", encoding="utf-8")
+        registry = PromptRegistry(self.directory)
+
+        self.assertEqual(registry.render("steps", items=["a", "b"]), "1. A\n2. B\n")
+        with self.assertRaises(PromptError):
+            registry.get("broken")
+
+    def test_identical_renders_are_memoized(self) -> None:
+        registry = PromptRegistry(self.directory)
+
+        first = registry.render("greeting", name="Ada")
+        second = registry.render("greeting", name="Ada")
+        registry.render("greeting", name="Grace")
+
+        self.assertEqual(first, second)
+        self.assertEqual((registry.hits, registry.misses), (1, 2))
+
+    def test_version_follows_file_contents(self) -> None:
+        before = PromptRegistry(self.directory).get("greeting")
+        (self.directory / "greeting.jinja").write_text("Hi {{ name }}", encoding="utf-8")
+        after = PromptRegistry(self.directory).get("greeting")
+
+        self.assertTrue(before.id.startswith("greeting@"))
+        self.assertNotEqual(before.id, after.id)
+
+    def test_bundled_planner_prompts_load(self) -> None:
+        registry = prompt_registry()
+
+        rendered = registry.render("planner_user", topic="Solar storage", locale="en-US")
+
+        self.assertIs(registry, prompt_registry())
+        self.assertIn("User Question: Solar storage", rendered)
+        self.assertIn("Context Hints: (none)", rendered)
+        self.assertIn("step_type", registry.get("planner_system").source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from src.models.plan import Plan
-from src.report.markdown import render_report
+import io
+
+from src.models.plan import Plan, ResearchNote
+from src.report.markdown import ReportRenderCache, iter_report, render_report, write_report
 
 
 def _build_sample_plan() -> Plan:
@@ -90,3 +92,69 @@ def test_render_report_low_confidence_section() -> None:
     markdown = render_report(plan, summary=summary)
     assert "## Low Confidence Notes" in markdown
     assert "confidence: 0.50" in markdown
+
+
+def test_render_report_merges_equivalent_citations() -> None:
+    plan = _build_sample_plan()
+    plan.steps[1].notes.append(
+        ResearchNote(
+            source="http://www.example.com/doc/?utm_source=feed",
+            claim="Same document via tracking link",
+        )
+    )
+
+    markdown = render_report(plan)
+    citation_rows = [line for line in markdown.splitlines() if line.startswith("| 1 ") or line.startswith("| 2 ")]
+    assert citation_rows == ["| 1 | https://example.com/doc |"]
+
+
+def test_write_report_streams_same_content(tmp_path) -> None:
+    plan = _build_sample_plan()
+    expected = render_report(plan, locale="en-US")
+
+    buffer = io.StringIO()
+    written = write_report(plan, buffer, locale="en-US")
+    assert buffer.getvalue() == expected
+    assert written == len(expected)
+
+    target = tmp_path / "reports" / "report.md"
+    write_report(plan, target, locale="en-US")
+    assert target.read_text(encoding="utf-8") == expected
+    assert list(target.parent.iterdir()) == [target]
+
+
+def test_iter_report_yields_lines_lazily() -> None:
+    plan = _build_sample_plan()
+    chunks = iter_report(plan)
+    assert next(chunks).startswith("# Research Report")
+    assert all(chunk.endswith("\n") for chunk in chunks)
+
+
+def test_render_cache_reuses_unchanged_sections() -> None:
+    plan = _build_sample_plan()
+    summary = {"researcher_calls": 1}
+    cache = ReportRenderCache()
+
+    first = render_report(plan, summary=summary, cache=cache)
+    assert first == render_report(plan, summary=summary)
+    assert cache.hits == 0
+
+    assert render_report(plan, summary=summary, cache=cache) == first
+    assert cache.hits == 3  # telemetry + two steps
+    misses = cache.misses
+
+    plan.steps[1].notes.append(
+        ResearchNote(source="https://example.com/other", claim="New finding", confidence=0.9)
+    )
+    updated = render_report(plan, summary=summary, cache=cache)
+    assert updated == render_report(plan, summary=summary)
+    assert cache.misses == misses + 1
+    assert "| 2 | https://example.com/other |" in updated
+
+
+def test_render_cache_evicts_oldest_entries() -> None:
+    cache = ReportRenderCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.get_or_render(key, lambda key=key: key.upper())
+    assert len(cache) == 2
+    assert cache.get_or_render("a", lambda: "fresh") == "fresh"
@@ -0,0 +1,114 @@
+"""Tests for the shared report document and the renderer registry."""
+
+from __future__ import annotations
+
+import json
+import tarfile
+
+import pytest
+
+from src.models.plan import Plan, ResearchNote
+from src.report.document import aggregate_plan, build_document
+from src.report.markdown import ReportRenderCache, render_report
+from src.report.renderers import available_formats, parse_formats, render_document, write_document
+
+
+def _plan() -> Plan:
+    plan = Plan(
+        topic="Renderers <demo>",
+        goal="Compare outputs",
+        steps=[
+            {"id": "step-1", "title": "Collect", "step_type": "RESEARCH", "expected_outcome": "Docs"},
+            {"id": "step-2", "title": "Summarize", "step_type": "SYNTHESIZE", "expected_outcome": "Brief"},
+        ],
+    )
+    plan.steps[0].notes.append(ResearchNote(source="https://example.com/a", claim="A & B", confidence=0.9))
+    plan.steps[1].notes.append(ResearchNote(source="https://example.com/a?utm_source=x", claim="Same"))
+    plan.steps[1].notes.append(ResearchNote(source="https://example.com/b", claim="Other"))
+    return plan
+
+
+def test_document_numbers_citations_once() -> None:
+    document = build_document(_plan(), summary={"low_confidence": []}, locale="en-US")
+    assert document.citations == ((1, "https://example.com/a"), (2, "https://example.com/b"))
+    assert [item.citation for item in document.steps[1].notes] == [1, 2]
+
+
+def test_markdown_renderer_matches_render_report() -> None:
+    plan = _plan()
+    document = build_document(plan, locale="en-US")
+    assert render_document(document, "markdown") == render_report(plan, locale="en-US")
+
+
+def test_json_and_html_renderers() -> None:
+    document = build_document(_plan())
+    payload = json.loads(render_document(document, "json"))
+    assert payload["citations"][1] == {"index": 2, "source": "https://example.com/b"}
+    assert payload["steps"][0]["notes"][0]["citation"] == 1
+
+    page = render_document(document, "html")
+    assert "Renderers &lt;demo&gt;" in page
+    assert '<li id="cite-2"><a href="https://example.com/b">' in page
+
+
+def test_html_links_only_web_citations() -> None:
+    plan = _plan()
+    plan.steps[0].notes.append(ResearchNote(source="javascript:alert(1)", claim="Evil"))
+    page = render_document(build_document(plan), "html")
+    assert 'href="javascript' not in page
+    assert '">javascript:alert(1)</li>' in page
+
+
+def test_markdown_cache_is_caller_scoped() -> None:
+    document = build_document(_plan())
+    cache = ReportRenderCache()
+    first = render_document(document, "markdown", cache=cache)
+    assert render_document(document, "markdown", cache=cache) == first
+    assert cache.hits > 0
+    assert render_document(document, "markdown") == first
+
+
+def test_bundle_reuses_markdown_sections_from_the_same_report() -> None:
+    document = build_document(_plan())
+    cache = ReportRenderCache()
+    render_document(document, "markdown", cache=cache)
+    misses = cache.misses
+    render_document(document, "bundle", cache=cache)
+    assert cache.misses == misses
+    assert cache.hits > 0
+
+
+def test_bundle_is_deterministic_and_complete(tmp_path) -> None:
+    document = build_document(_plan())
+    first = render_document(document, "bundle")
+    assert first == render_document(document, "bundle")
+
+    target = write_document(document, tmp_path / "report.tar.gz", "bundle")
+    with tarfile.open(target, mode="r:gz") as archive:
+        assert archive.getnames() == ["report.md", "report.json", "citations.json", "notes.jsonl"]
+        notes = archive.extractfile("notes.jsonl").read().decode("utf-8").splitlines()
+    assert len(notes) == 3
+
+
+def test_parse_formats_rejects_unknown() -> None:
+    assert parse_formats("Markdown, json,markdown") == ["markdown", "json"]
+    assert set(available_formats()) >= {"markdown", "json", "html", "bundle"}
+    with pytest.raises(ValueError):
+        parse_formats("pdf")
+
+
+def test_aggregate_plan_single_pass_summary() -> None:
+    plan = _plan()
+    plan.steps[1].notes[1].confidence = 0.3
+    aggregate = aggregate_plan(plan)
+
+    summary = aggregate.summary({"total_calls": 2})
+    assert summary["total_notes"] == 3
+    assert summary["average_confidence"] == pytest.approx(0.6)
+    assert summary["low_confidence"] == [{"step_id": "step-2", "claim": "Other", "confidence": 0.3}]
+    assert summary["step_note_counts"] == {"step-1": 1, "step-2": 2}
+    assert summary["researcher_metrics"] == {"total_calls": 2}
+
+    document = build_document(plan, summary=summary, aggregate=aggregate)
+    assert document.citations is aggregate.citations
+    assert aggregate_plan(None).summary()["average_confidence"] is None
@@ -8,8 +8,10 @@ from src.report.validation import (
     LowConfidenceFlag,
     ValidationIssue,
     normalize_notes,
+    validate_note_batch,
     validate_notes,
 )
+from src.models.plan import ResearchNote
 
 
 class ReportValidationTests(unittest.TestCase):
@@ -60,6 +62,26 @@ class ReportValidationTests(unittest.TestCase):
         self.assertIsInstance(flags[0], LowConfidenceFlag)
         self.assertEqual(flags[0].confidence, 0.4)
 
+    def test_batch_falls_back_only_for_invalid_entries(self) -> None:
+        existing = ResearchNote(source="https://example.com/0", claim="Model", confidence=0.2)
+        report = validate_note_batch(
+            [
+                existing,
+                {"source": "https://example.com/1", "claim": "Valid"},
+                {"source": "", "claim": " ", "confidence": 0.9},
+                {"claim": "No source field"},
+            ]
+        )
+        self.assertIs(report.notes[0], existing)
+        self.assertIsInstance(report.notes[1], ResearchNote)
+        self.assertEqual(list(report.invalid), [2, 3])
+        self.assertEqual(list(report.missing_source), [2, 3])
+        self.assertEqual(list(report.missing_claim), [2])
+        self.assertEqual(list(report.low_confidence), [0])
+        self.assertTrue(report.has_blocking_issues)
+        self.assertEqual([issue.kind for issue in report.issues()][:2], ["missing_source", "missing_claim"])
+        self.assertEqual(len(normalize_notes({"source": f"s{i}", "claim": "c"} for i in range(5))), 5)
+
 
 if __name__ == "__main__":
     unittest.main()
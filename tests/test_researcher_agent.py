@@ -230,6 +230,108 @@ class ResearcherAgentTests(unittest.TestCase):
         self.assertIn("conservative", result.degradation_mode or "")
         self.assertGreaterEqual(len(result.notes), 1)
 
+    def test_query_expansion_dispatches_and_fuses_results(self) -> None:
+        config = self._make_config(tavily_key="tvly")
+        seen_queries: list[str] = []
+
+        def fake_search(query: str, api_key: str, max_results: int, timeout: float):
+            seen_queries.append(query)
+            if "Summarize" in query:
+                return [
+                    {"title": "Shared", "url": "https://example.com/shared/", "snippet": "Both"},
+                    {"title": "Outcome only", "url": "https://example.com/outcome", "snippet": "B"},
+                ]
+            return [
+                {"title": "Primary only", "url": "https://example.com/primary", "snippet": "A"},
+                {"title": "Shared", "url": "https://EXAMPLE.com/shared#top", "snippet": "Both"},
+            ]
+
+        agent = ResearcherAgent(config, search_callable=fake_search)
+        step = PlanStep(
+            id="step-5",
+            title="Discover LangGraph",
+            step_type="RESEARCH",
+            expected_outcome="Summarize LangGraph capabilities",
+        )
+
+        result = agent.run_step(
+            ResearchContext(
+                topic="LangGraph",
+                locale="en-US",
+                step=step,
+                max_results=3,
+                timeout_seconds=5.0,
+                max_notes=3,
+                query_expansions=3,
+            )
+        )
+
+        self.assertEqual(len(result.queries), 3)
+        self.assertEqual(result.query, "LangGraph | Discover LangGraph | en-US")
+        self.assertCountEqual(seen_queries, result.queries)
+        self.assertEqual(result.total_results, 3)
+        # The result returned by every query ranks first after fusion.
+        self.assertEqual(result.notes[0].claim, "Shared")
+
+    def test_query_expansion_tolerates_partial_failures(self) -> None:
+        from src.tools.search import SearchError
+
+        config = self._make_config(tavily_key="tvly")
+
+        def fake_search(query: str, *args):
+            if "Summarize" in query:
+                raise SearchError("boom")
+            return [{"title": "Ok", "url": f"https://example.com/{len(query)}", "snippet": "x"}]
+
+        agent = ResearcherAgent(config, search_callable=fake_search)
+        step = PlanStep(
+            id="step-6",
+            title="Discover LangGraph",
+            step_type="RESEARCH",
+            expected_outcome="Summarize LangGraph capabilities",
+        )
+
+        result = agent.run_step(
+            ResearchContext(
+                topic="LangGraph",
+                locale="en-US",
+                step=step,
+                max_results=3,
+                timeout_seconds=5.0,
+                query_expansions=3,
+            )
+        )
+        self.assertGreaterEqual(len(result.notes), 1)
+
+    def test_degradation_disables_query_expansion(self) -> None:
+        config = self._make_config(tavily_key="tvly")
+        calls: list[str] = []
+
+        def fake_search(query: str, *args):
+            calls.append(query)
+            return [{"title": "Ok", "url": "https://example.com/a", "snippet": "x"}]
+
+        agent = ResearcherAgent(config, search_callable=fake_search)
+        step = PlanStep(
+            id="step-7",
+            title="Discover LangGraph",
+            step_type="RESEARCH",
+            expected_outcome="Summarize LangGraph capabilities",
+        )
+
+        agent.run_step(
+            ResearchContext(
+                topic="LangGraph",
+                locale="en-US",
+                step=step,
+                max_results=3,
+                timeout_seconds=5.0,
+                query_expansions=3,
+                degradation_hint="conservative",
+            )
+        )
+        self.assertEqual(len(calls), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
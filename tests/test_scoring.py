@@ -0,0 +1,107 @@
+"""Tests for batch confidence scoring."""
+
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from src.agents.scoring import (
+    ConfidenceScorer,
+    domain_authority_feature,
+    keyword_pattern,
+    recency_feature,
+    score_plan,
+)
+from src.models.plan import Plan, PlanStep
+
+
+def _step() -> PlanStep:
+    return PlanStep(
+        id="step-1",
+        title="Discover LangGraph",
+        step_type="RESEARCH",
+        expected_outcome="Summarize checkpointing capabilities",
+    )
+
+
+class ConfidenceScorerTests(unittest.TestCase):
+    def test_matches_legacy_scoring_rules(self) -> None:
+        scorer = ConfidenceScorer()
+        scores = scorer.score(
+            _step(),
+            [
+                {"title": "", "snippet": ""},
+                {"title": "Unrelated", "snippet": "short"},
+                {"title": "LangGraph checkpointing", "snippet": "x" * 130},
+            ],
+        )
+        self.assertEqual(scores[0], 0.6)
+        self.assertAlmostEqual(scores[1], 0.75)
+        self.assertAlmostEqual(scores[2], 0.85)
+
+    def test_keyword_pattern_is_cached_per_step_text(self) -> None:
+        first = keyword_pattern("Discover LangGraph", "Summarize")
+        second = keyword_pattern("Discover LangGraph", "Summarize")
+        self.assertIs(first, second)
+        self.assertIsNone(keyword_pattern("a b", ""))
+
+    def test_pluggable_features_and_clamping(self) -> None:
+        now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        scorer = ConfidenceScorer(
+            [
+                domain_authority_feature({"python.org": 0.1, "spam.example": -0.5}),
+                recency_feature(weight=0.04, half_life_days=30, now=now),
+            ]
+        )
+        scores = scorer.score(
+            _step(),
+            [
+                {"title": "", "url": "https://docs.python.org/3/", "snippet": "doc"},
+                {"title": "", "url": "https://spam.example/a", "snippet": "ad"},
+                {
+                    "title": "",
+                    "url": "https://news.example/b",
+                    "snippet": "fresh",
+                    "published_date": (now - timedelta(days=30)).isoformat(),
+                },
+            ],
+        )
+        self.assertAlmostEqual(scores[0], 0.85)
+        self.assertEqual(scores[1], 0.5)
+        self.assertAlmostEqual(scores[2], 0.77)
+
+    def test_score_many_handles_multiple_steps(self) -> None:
+        scorer = ConfidenceScorer()
+        batches = [(_step(), [{"title": "t", "snippet": "s"}] * 200), (_step(), [])]
+        results = scorer.score_many(batches)
+        self.assertEqual(len(results[0]), 200)
+        self.assertEqual(results[1], [])
+
+
+class PlanScoreTests(unittest.TestCase):
+    def _plan(self, titles, *, step_type: str = "RESEARCH") -> Plan:
+        return Plan(
+            topic="t",
+            goal="Understand the market",
+            steps=[
+                {"id": f"step-{idx}", "title": title, "step_type": step_type, "expected_outcome": "Notes"}
+                for idx, title in enumerate(titles, start=1)
+            ],
+        )
+
+    def test_rewards_topic_coverage_and_step_band(self) -> None:
+        topic = "battery storage policy"
+        covered = score_plan(self._plan(["Battery storage costs", "Grid policy", "Vendors"]), topic)
+        sparse = score_plan(self._plan(["Overview"]), topic)
+        self.assertEqual((covered.coverage, covered.step_count, covered.completeness), (1.0, 1.0, 1.0))
+        self.assertGreater(covered.total, sparse.total)
+        self.assertAlmostEqual(sparse.step_count, 1 / 3, places=3)
+
+    def test_penalizes_missing_research_steps_and_handles_cjk(self) -> None:
+        score = score_plan(self._plan(["储能成本", "政策", "厂商"], step_type="SYNTHESIZE"), "储能政策")
+        self.assertEqual(score.coverage, 1.0)
+        self.assertEqual(score.completeness, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""Tests for in-flight request coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.tools.llm import acall_llm
+from src.tools.search import search_web
+from src.tools.singleflight import SingleFlight, coalescing_scope
+
+
+def _run_concurrently(count: int, target) -> list:
+    barrier = threading.Barrier(count)
+    results: list = [None] * count
+
+    def worker(index: int) -> None:
+        barrier.wait()
+        try:
+            results[index] = target()
+        except Exception as exc:  # noqa: BLE001 - surfaced to the assertion
+            results[index] = exc
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class SingleFlightTests(unittest.TestCase):
+    def test_concurrent_callers_share_one_call(self) -> None:
+        group = SingleFlight("test")
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return "value"
+
+        self.assertEqual(_run_concurrently(4, lambda: group.do("k", slow)), ["value"] * 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((group.calls, group.coalesced), (4, 3))
+        # Nothing is remembered once the call finished.
+        group.do("k", slow)
+        self.assertEqual(len(calls), 2)
+
+    def test_errors_are_shared_with_waiters(self) -> None:
+        group = SingleFlight("test")
+
+        def failing():
+            time.sleep(0.1)
+            raise RuntimeError("upstream down")
+
+        results = _run_concurrently(3, lambda: group.do("k", failing))
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+    def test_async_callers_share_one_call_and_scope_counts(self) -> None:
+        group = SingleFlight("llm")
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 7
+
+        async def main():
+            with coalescing_scope() as counts:
+                values = await asyncio.gather(*(group.ado("k", fetch) for _ in range(3)))
+            return values, counts
+
+        values, counts = asyncio.run(main())
+        self.assertEqual(values, [7, 7, 7])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(counts.counts, {"llm": 2})
+
+
+    def test_cancelled_leader_hands_off_to_waiters(self) -> None:
+        group = SingleFlight("test")
+        started = []
+
+        async def fetch() -> str:
+            started.append(len(started))
+            await asyncio.sleep(0.05)
+            return f"run-{len(started)}"
+
+        async def main():
+            leader = asyncio.ensure_future(group.ado("k", fetch))
+            await asyncio.sleep(0)
+            waiters = [asyncio.ensure_future(group.ado("k", fetch)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            results = await asyncio.gather(*waiters)
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            return results
+
+        self.assertEqual(asyncio.run(main()), ["run-2", "run-2"])
+        self.assertEqual(len(started), 2)
+
+
+class ToolCoalescingTests(unittest.TestCase):
+    def test_search_web_coalesces_identical_queries(self) -> None:
+        def slow_request(*args):
+            time.sleep(0.1)
+            return [{"url": "https://example.com"}]
+
+        with patch("src.tools.search._request_search", side_effect=slow_request) as request:
+            with coalescing_scope() as counts:
+                results = _run_concurrently(3, lambda: search_web("same", tavily_key="k"))
+        self.assertEqual(results, [[{"url": "https://example.com"}]] * 3)
+        self.assertEqual(request.call_count, 1)
+        # Worker threads do not inherit the scope unless the context is copied.
+        self.assertEqual(counts.total, 0)
+
+    def test_acall_llm_coalesces_identical_prompts(self) -> None:
+        async def slow_completion(*args):
+            await asyncio.sleep(0.05)
+            return "plan"
+
+        async def main():
+            return await asyncio.gather(
+                *(acall_llm("prompt", model="m", openrouter_key="k") for _ in range(3)),
+                acall_llm("other", model="m", openrouter_key="k"),
+            )
+
+        with patch("src.tools.llm._arequest_completion", side_effect=slow_completion) as request:
+            self.assertEqual(asyncio.run(main()), ["plan"] * 4)
+        self.assertEqual(request.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()